@@ -0,0 +1,2 @@
+# benchmarks/__init__.py
+# Offline performance benchmarks; see benchmarks/run.py.
@@ -0,0 +1,176 @@
+# benchmarks/fake_meteostat.py
+# Offline stand-in for meteostat.Point / meteostat.Daily producing synthetic frames.
+from __future__ import annotations
+
+import random
+import threading
+import time
+import zlib
+from collections import deque
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from src.store import DAILY_COLUMNS
+
+
+class FakePoint:
+    """Minimal ``meteostat.Point`` replacement: just remembers the coordinates."""
+
+    def __init__(self, lat: float, lon: float, alt: float | None = None):
+        self._lat = lat
+        self._lon = lon
+        self._alt = alt
+
+
+def _weather_values(
+    rng: np.random.Generator, doy: np.ndarray, na_rate: float
+) -> dict[str, np.ndarray]:
+    """Seasonal daily values (Meteostat columns) for the given days of year."""
+    n = len(doy)
+    season = np.cos(2 * np.pi * (doy - 200) / 365.25)
+    tavg = 9 + 7 * season + rng.normal(0, 2.5, n)
+    spread = rng.gamma(4, 1.5, n)
+    cols = {
+        "tavg": tavg,
+        "tmin": tavg - spread / 2,
+        "tmax": tavg + spread / 2,
+        "prcp": rng.gamma(0.6, 4, n) * (rng.random(n) < 0.55),
+        "snow": np.where(tavg < 1, rng.gamma(0.5, 20, n), 0.0),
+        "wdir": rng.uniform(0, 360, n),
+        "wspd": rng.gamma(3, 5, n),
+        "wpgt": rng.gamma(4, 9, n),
+        "pres": 1013 + rng.normal(0, 11, n),
+        "tsun": np.clip(300 + 200 * season + rng.normal(0, 120, n), 0, 960),
+    }
+    for c, v in cols.items():
+        v = np.round(v, 1)
+        if na_rate > 0:
+            v[rng.random(n) < na_rate] = np.nan
+        cols[c] = v
+    return cols
+
+
+def synthetic_daily(
+    lat: float, lon: float, start: datetime, end: datetime, na_rate: float = 0.05
+) -> pd.DataFrame:
+    """
+    Build a Meteostat-shaped daily frame (``time`` index) for [start, end].
+
+    Values follow a seasonal cycle with noise and are generated one calendar
+    year at a time from a (location, year) seed, so overlapping windows agree
+    on the days they share. Roughly ``na_rate`` of the cells are NaN.
+    """
+    seed = zlib.crc32(f"{lat:.4f},{lon:.4f}".encode())
+    parts = []
+    for year in range(start.year, end.year + 1):
+        idx = pd.date_range(f"{year}-01-01", f"{year}-12-31", freq="D", name="time")
+        rng = np.random.default_rng([seed, year])
+        parts.append(
+            pd.DataFrame(_weather_values(rng, idx.dayofyear.to_numpy(), na_rate), idx)
+        )
+    if not parts:
+        return pd.DataFrame(
+            columns=list(DAILY_COLUMNS), index=pd.DatetimeIndex([], name="time")
+        )
+    return pd.concat(parts).loc[start:end]
+
+
+def synthetic_rows(n: int, na_rate: float = 0.05, seed: int = 0) -> pd.DataFrame:
+    """
+    ``n`` daily rows with a ``time`` column, as ``_load_data`` hands them on.
+
+    Dates cycle through 1970-2019 so sizes beyond pandas' date range (e.g.
+    10^6 rows, like many stations stacked together) are still valid.
+    """
+    days = pd.date_range("1970-01-01", "2019-12-31", freq="D")
+    time_col = days[np.arange(n) % len(days)]
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(_weather_values(rng, time_col.dayofyear.to_numpy(), na_rate))
+    df.insert(0, "time", time_col)
+    return df
+
+
+def make_daily(
+    latency: float = 0.0,
+    na_rate: float = 0.05,
+    error_rate: float = 0.0,
+    slow_rate: float = 0.0,
+    slow_latency: float = 1.0,
+    faults: Iterable[str] = (),
+    seed: int = 0,
+) -> type:
+    """Return a ``meteostat.Daily`` replacement class with the given behaviour.
+
+    Args:
+        latency: Seconds each ``fetch()`` sleeps, simulating the network.
+        na_rate: Fraction of cells set to NaN.
+        error_rate: Fraction of calls raising ``ConnectionError``.
+        slow_rate: Fraction of calls taking ``slow_latency`` instead.
+        slow_latency: Seconds a slow call takes.
+        faults: Scripted behaviour of the first calls, in call order: "ok",
+            "slow", "error" (``ConnectionError``) or "timeout"
+            (``TimeoutError``); random rates apply once it is used up.
+        seed: Seed for the random faults.
+    """
+    script = deque(faults)
+    rng = random.Random(seed)
+    lock = threading.Lock()
+
+    class FakeDaily:
+        calls: list[tuple[datetime, datetime]] = []
+
+        def __init__(self, loc: FakePoint, start: datetime, end: datetime):
+            self._loc = loc
+            self._start = start
+            self._end = end
+
+        def fetch(self) -> pd.DataFrame:
+            with lock:
+                FakeDaily.calls.append((self._start, self._end))
+                if script:
+                    fault = script.popleft()
+                elif rng.random() < error_rate:
+                    fault = "error"
+                elif rng.random() < slow_rate:
+                    fault = "slow"
+                else:
+                    fault = "ok"
+            delay = slow_latency if fault == "slow" else latency
+            if delay:
+                time.sleep(delay)
+            if fault == "error":
+                raise ConnectionError("injected upstream error")
+            if fault == "timeout":
+                raise TimeoutError("injected upstream timeout")
+            return synthetic_daily(
+                self._loc._lat, self._loc._lon, self._start, self._end, na_rate
+            )
+
+    return FakeDaily
+
+
+@contextmanager
+def patched_meteostat(
+    latency: float = 0.0, na_rate: float = 0.05, **faults: Any
+) -> Iterator[type]:
+    """Swap ``src.fetch``'s Meteostat classes for the stand-ins; yield ``Daily``.
+
+    Extra keyword arguments (``error_rate``, ``faults``, ...) go to
+    :func:`make_daily`.
+    """
+    import src.fetch as fetch
+
+    daily = make_daily(latency, na_rate, **faults)
+    saved = fetch.Daily, fetch.Point
+    fetch.Daily, fetch.Point = daily, FakePoint  # type: ignore[misc]
+    fetch.get_historical_weather.cache_clear()  # type: ignore[attr-defined]
+    try:
+        yield daily
+    finally:
+        fetch.Daily, fetch.Point = saved
+        fetch.get_historical_weather.cache_clear()  # type: ignore[attr-defined]
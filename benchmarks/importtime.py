@@ -0,0 +1,137 @@
+# benchmarks/importtime.py
+# Import-time benchmark: python -m benchmarks.importtime [module ...] [--top N]
+from __future__ import annotations
+
+import argparse
+import re
+import statistics
+import subprocess
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Modules measured by default, and what each must NOT pull in at import time:
+# those are loaded on first use, so a regression shows up as a violation here
+DEFERRED: dict[str, tuple[str, ...]] = {
+    "src.locations": ("pandas", "numpy"),
+    "src.metrics": ("pandas", "http.server"),
+    "src.fetch": ("meteostat", "asyncio", "http.server"),
+    "src.formatters": ("meteostat",),
+    "src.export": ("meteostat", "asyncio"),
+    "src.service": ("meteostat", "http.server"),
+}
+
+_LINE = re.compile(r"^import time:\s+(\d+)\s*\|\s*(\d+)\s*\|(\s*)(\S+)\s*$")
+
+
+@dataclass(frozen=True)
+class ImportEntry:
+    """One line of ``-X importtime`` output (times in microseconds)."""
+
+    name: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(text: str) -> list[ImportEntry]:
+    """Parse ``python -X importtime`` stderr; other lines are ignored."""
+    out = []
+    for line in text.splitlines():
+        m = _LINE.match(line)
+        if m:
+            self_us, cum_us, indent, name = m.groups()
+            out.append(ImportEntry(name, int(self_us), int(cum_us), len(indent) // 2))
+    return out
+
+
+def import_trace(module: str) -> list[ImportEntry]:
+    """Import ``module`` in a fresh interpreter and return its import trace."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr[-2000:]}")
+    return parse_importtime(proc.stderr)
+
+
+def import_seconds(module: str, repeat: int) -> tuple[list[float], list[ImportEntry]]:
+    """Cumulative import time of ``module`` per run, plus the last run's trace."""
+    samples, trace = [], []
+    for _ in range(repeat):
+        trace = import_trace(module)
+        total = next((e for e in trace if e.name == module), None)
+        if total is None:
+            raise RuntimeError(f"{module} missing from the import trace")
+        samples.append(total.cumulative_us / 1e6)
+    return samples, trace
+
+
+def subtree(module: str, trace: list[ImportEntry]) -> list[ImportEntry]:
+    """
+    Imports triggered by ``module``, without interpreter start-up imports.
+
+    Children are reported before their parent, so they are the nested lines
+    directly above the module's own top-level line.
+    """
+    end = next((i for i, e in enumerate(trace) if e.name == module), None)
+    if end is None:
+        return []
+    start = end
+    while start > 0 and trace[start - 1].depth > trace[end].depth:
+        start -= 1
+    return trace[start:end]
+
+
+def violations(module: str, trace: list[ImportEntry]) -> list[str]:
+    """Deferred modules (see :data:`DEFERRED`) that ``module`` imported eagerly."""
+    loaded = {e.name for e in subtree(module, trace)}
+    return [m for m in DEFERRED.get(module, ()) if m in loaded]
+
+
+def bench_imports(repeat: int, modules: list[str] | None = None) -> list[dict]:
+    """Records for ``benchmarks.run``: cumulative import time per module."""
+    from benchmarks.run import _record
+
+    results = []
+    for module in modules or list(DEFERRED):
+        samples, _ = import_seconds(module, repeat)
+        results.append(_record("import", {"module": module}, samples))
+    return results
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Measure module import times and check deferred imports."
+    )
+    parser.add_argument("modules", nargs="*", help=f"default: {', '.join(DEFERRED)}")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=5, help="heaviest imports shown")
+    args = parser.parse_args(argv)
+
+    failed = False
+    for module in args.modules or list(DEFERRED):
+        samples, trace = import_seconds(module, args.repeat)
+        print(f"{module:<20} {statistics.median(samples) * 1e3:>8.1f} ms")
+        # Direct children of the measured module only (depth 1), heaviest first
+        top = sorted(
+            (e for e in subtree(module, trace) if e.depth == 1),
+            key=lambda e: e.cumulative_us,
+            reverse=True,
+        )[: args.top]
+        for e in top:
+            print(f"    {e.name:<28} {e.cumulative_us / 1e3:>8.1f} ms")
+        bad = violations(module, trace)
+        if bad:
+            failed = True
+            print(f"    eagerly imports {', '.join(bad)}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
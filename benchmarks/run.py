@@ -0,0 +1,234 @@
+# benchmarks/run.py
+# Standalone benchmark runner: python -m benchmarks.run [--quick] [--out FILE]
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+from functools import partial
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+import src.fetch as fetch
+from benchmarks.fake_meteostat import patched_meteostat, synthetic_rows
+from benchmarks.importtime import bench_imports
+from src.downsample import CHART_WIDTH_PX, downsample
+from src.formatters import build_chart_frame, build_display_frame, build_user_view
+from src.store import RangeStore
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+# A point that is never one of the app presets, to avoid confusion in reports
+BENCH_POINT = (50.0, -1.0)
+FETCH_START = datetime(1990, 1, 1)
+FETCH_END = datetime(2019, 12, 31)
+
+
+def _time(
+    fn: Callable[[], Any], repeat: int, setup: Callable[[], Any] | None = None
+) -> list[float]:
+    """Run ``fn`` ``repeat`` times (``setup`` before each, untimed); return seconds."""
+    samples = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    return samples
+
+
+def _record(name: str, params: dict[str, Any], samples: list[float]) -> dict[str, Any]:
+    return {
+        "name": name,
+        "params": params,
+        "repeat": len(samples),
+        "min": min(samples),
+        "median": statistics.median(samples),
+        "mean": statistics.fmean(samples),
+        "stdev": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+    }
+
+
+def bench_fetch(repeat: int, latency: float, na_rate: float) -> list[dict[str, Any]]:
+    """get_historical_weather: cold, warm (in-process hit), overlapping window."""
+    lat, lon = BENCH_POINT
+    params = {"days": (FETCH_END - FETCH_START).days + 1, "latency": latency}
+    shifted = (FETCH_START + timedelta(days=1), FETCH_END + timedelta(days=1))
+    results = []
+    with patched_meteostat(latency=latency, na_rate=na_rate):
+        clear = fetch.get_historical_weather.cache_clear  # type: ignore[attr-defined]
+
+        def cold() -> None:
+            fetch.get_historical_weather(lat, lon, FETCH_START, FETCH_END)
+
+        results.append(_record("fetch_cold", params, _time(cold, repeat, clear)))
+        cold()
+        results.append(_record("fetch_warm", params, _time(cold, repeat)))
+
+        def overlap() -> None:
+            fetch.get_historical_weather(lat, lon, *shifted)
+
+        # Without a range store an overlapping window is a full upstream fetch
+        def prime() -> None:
+            clear()
+            cold()
+
+        results.append(
+            _record(
+                "fetch_overlap",
+                {**params, "store": False},
+                _time(overlap, repeat, prime),
+            )
+        )
+
+        with tempfile.TemporaryDirectory() as tmp:
+            store = RangeStore(Path(tmp) / "bench.sqlite")
+            fetch.set_range_store(store)
+            try:
+                cold()
+                results.append(
+                    _record(
+                        "fetch_overlap",
+                        {**params, "store": True},
+                        _time(overlap, repeat, prime),
+                    )
+                )
+            finally:
+                fetch.set_range_store(None)
+                store.close()
+    return results
+
+
+def bench_formatters(
+    repeat: int, sizes: list[int], na_rate: float
+) -> list[dict[str, Any]]:
+    """build_user_view plus the Streamlit display, chart and downsampling prep."""
+    results = []
+    for n in sizes:
+        raw = synthetic_rows(n, na_rate)
+        reps = max(1, repeat if n <= 100_000 else repeat // 3)
+        results.append(
+            _record(
+                "build_user_view",
+                {"rows": n},
+                _time(partial(build_user_view, raw), reps),
+            )
+        )
+        results.append(
+            _record(
+                "display_frame",
+                {"rows": n},
+                _time(partial(build_display_frame, raw), reps),
+            )
+        )
+        results.append(
+            _record(
+                "chart_frame",
+                {"rows": n},
+                _time(partial(build_chart_frame, raw), reps),
+            )
+        )
+        chart = build_chart_frame(raw)
+        temps = ["Average Temperature (°C)", "Lowest Temperature (°C)"]
+        for kind, cols in (("line", temps), ("bar", ["Rainfall (mm)"])):
+            results.append(
+                _record(
+                    "chart_downsample",
+                    {"rows": n, "kind": kind, "points": CHART_WIDTH_PX},
+                    _time(partial(downsample, chart, "Date", cols, kind), reps),
+                )
+            )
+    return results
+
+
+def _git_commit() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _key(r: dict[str, Any]) -> str:
+    return r["name"] + json.dumps(r["params"], sort_keys=True)
+
+
+def compare(baseline: dict[str, Any], current: dict[str, Any]) -> str:
+    """Render a median-time comparison table between two result files."""
+    base = {_key(r): r for r in baseline["results"]}
+    lines = [f"{'benchmark':<60} {'base (ms)':>10} {'now (ms)':>10} {'ratio':>7}"]
+    for r in current["results"]:
+        b = base.get(_key(r))
+        if b is None:
+            continue
+        ratio = r["median"] / b["median"] if b["median"] else float("nan")
+        label = f"{r['name']} {json.dumps(r['params'], sort_keys=True)}"
+        lines.append(
+            f"{label:<60} {b['median'] * 1e3:>10.2f} {r['median'] * 1e3:>10.2f} "
+            f"{ratio:>7.2f}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Run the offline benchmarks.")
+    parser.add_argument("--quick", action="store_true", help="small sizes only")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--latency", type=float, default=0.05, help="fake fetch delay (s)"
+    )
+    parser.add_argument("--na-rate", type=float, default=0.05)
+    parser.add_argument("--out", type=Path, help="JSON output path")
+    parser.add_argument("--compare", type=Path, help="earlier JSON to compare against")
+    args = parser.parse_args(argv)
+
+    sizes = [10**2, 10**3, 10**4] if args.quick else [10**k for k in range(2, 7)]
+    commit = _git_commit()
+    report: dict[str, Any] = {
+        "meta": {
+            "commit": commit,
+            "timestamp": datetime.now(UTC).isoformat(),
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "quick": args.quick,
+        },
+        "results": [
+            *bench_fetch(args.repeat, args.latency, args.na_rate),
+            *bench_formatters(args.repeat, sizes, args.na_rate),
+            *bench_imports(args.repeat),
+        ],
+    }
+
+    out = args.out or RESULTS_DIR / f"{commit or 'local'}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(report, indent=2))
+    for r in report["results"]:
+        print(
+            f"{r['name']:<16} {json.dumps(r['params']):<50} {r['median'] * 1e3:>10.2f} ms"
+        )
+    print(f"wrote {out}")
+    if args.compare:
+        print(compare(json.loads(args.compare.read_text()), report))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
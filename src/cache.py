@@ -0,0 +1,193 @@
+# src/cache.py
+# In-process LRU cache for fetched frames, with per-entry introspection.
+from __future__ import annotations
+
+import hashlib
+import math
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import NamedTuple
+
+import pandas as pd
+
+CacheKey = tuple[Hashable, ...]
+
+
+class CacheInfo(NamedTuple):
+    """Same shape as ``functools.lru_cache().cache_info()``."""
+
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class _Entry(NamedTuple):
+    df: pd.DataFrame
+    nbytes: int
+    expires: float | None  # clock() deadline, None = never
+
+
+class FrameCache:
+    """
+    Thread-safe LRU mapping of cache keys to DataFrames.
+
+    Entries are evicted least-recently-used first once either ``maxsize``
+    entries or ``max_bytes`` of frame memory is exceeded, and an entry put
+    with a ``ttl`` expires after that many seconds. An expired entry stays
+    readable through :meth:`get_stale` for ``stale_for`` further seconds (or
+    until evicted for size), as a fallback while upstream is failing. Unlike
+    ``functools.lru_cache`` the entries can be listed, e.g. for per-entry
+    memory reports.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 128,
+        on_evict: Callable[[CacheKey, str], None] | None = None,
+        max_bytes: int | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        stale_for: float = 0.0,
+    ):
+        self.maxsize = maxsize
+        self.stale_for = stale_for
+        self.max_bytes = max_bytes
+        self.on_evict = on_evict
+        self._clock = clock
+        self._data: OrderedDict[CacheKey, _Entry] = OrderedDict()
+        self._nbytes = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key: CacheKey) -> pd.DataFrame | None:
+        expired = False
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and self._is_expired(entry):
+                if self._is_expired(entry, grace=self.stale_for):
+                    self._drop(key)
+                    expired = True
+                entry = None
+            if entry is None:
+                self._misses += 1
+            else:
+                self._data.move_to_end(key)
+                self._hits += 1
+        if expired and self.on_evict is not None:
+            self.on_evict(key, "expired")
+        return entry.df if entry is not None else None
+
+    def peek(self, key: CacheKey) -> pd.DataFrame | None:
+        """Look up ``key`` without touching LRU order or hit/miss counters."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or self._is_expired(entry):
+                return None
+            return entry.df
+
+    def ttl_left(self, key: CacheKey) -> float | None:
+        """Seconds until ``key`` expires (inf if never), None if absent or expired."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or self._is_expired(entry):
+                return None
+            if entry.expires is None:
+                return math.inf
+            return entry.expires - self._clock()
+
+    def get_stale(self, key: CacheKey) -> pd.DataFrame | None:
+        """Like :meth:`peek`, but also return entries within their stale grace."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or self._is_expired(entry, grace=self.stale_for):
+                return None
+            return entry.df
+
+    def put(self, key: CacheKey, df: pd.DataFrame, ttl: float | None = None) -> None:
+        """Store ``df`` under ``key``; ``ttl`` seconds until it expires (None: never)."""
+        entry = _Entry(
+            df, frame_nbytes(df), None if ttl is None else self._clock() + ttl
+        )
+        evicted = []
+        with self._lock:
+            if key in self._data:
+                self._drop(key)
+            self._data[key] = entry
+            self._nbytes += entry.nbytes
+            while len(self._data) > 1 and (
+                len(self._data) > self.maxsize
+                or (self.max_bytes is not None and self._nbytes > self.max_bytes)
+            ):
+                old = next(iter(self._data))
+                self._drop(old)
+                evicted.append(old)
+        if self.on_evict is not None:
+            for old in evicted:
+                self.on_evict(old, "size")
+
+    def discard(self, key: CacheKey) -> None:
+        """Remove ``key`` if present, without reporting it to ``on_evict``."""
+        with self._lock:
+            if key in self._data:
+                self._drop(key)
+
+    def _is_expired(self, entry: _Entry, grace: float = 0.0) -> bool:
+        return entry.expires is not None and self._clock() >= entry.expires + grace
+
+    def _drop(self, key: CacheKey) -> None:
+        self._nbytes -= self._data.pop(key).nbytes
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+    @property
+    def nbytes(self) -> int:
+        """Total memory of the cached frames, as accounted at ``put`` time."""
+        with self._lock:
+            return self._nbytes
+
+    def items(self) -> list[tuple[CacheKey, pd.DataFrame]]:
+        """Snapshot of (key, frame) pairs, least recently used first."""
+        with self._lock:
+            return [(k, e.df) for k, e in self._data.items()]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._nbytes = 0
+            self._hits = 0
+            self._misses = 0
+
+    def info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self.maxsize, len(self._data))
+
+
+def frame_nbytes(df: pd.DataFrame) -> int:
+    """Deep memory footprint of ``df`` in bytes, index included."""
+    try:
+        return int(df.memory_usage(index=True, deep=True).sum())
+    except ValueError:
+        # pandas cannot deep-size read-only object arrays (frozen frames);
+        # size writable copies of just those columns' pointer arrays instead
+        objects = {
+            c: df[c].to_numpy(copy=True) for c in df.columns if df[c].dtype == object
+        }
+        return int(df.assign(**objects).memory_usage(index=True, deep=True).sum())
+
+
+def float64_nbytes(df: pd.DataFrame) -> int:
+    """Footprint ``df`` would have with every column stored as float64."""
+    return int(df.index.memory_usage(deep=True)) + 8 * len(df) * len(df.columns)
+
+
+def frame_fingerprint(df: pd.DataFrame) -> str:
+    """Content hash of ``df`` (values, index, column names and dtypes)."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(repr((list(df.columns), [str(t) for t in df.dtypes])).encode())
+    h.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    return h.hexdigest()
@@ -0,0 +1,170 @@
+# src/compare.py
+# Multi-location comparison: aligned (location x date x variable) cube with
+# vectorised differences, ranks and summary statistics.
+from __future__ import annotations
+
+import warnings
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+try:
+    from src.fetch import DateLike, get_historical_weather_many
+except Exception:
+    from fetch import DateLike, get_historical_weather_many  # type: ignore
+
+# Variables that make sense to compare across places by default
+DEFAULT_VARIABLES: tuple[str, ...] = ("tavg", "tmin", "tmax", "prcp", "tsun", "pres")
+
+
+@dataclass(frozen=True)
+class ComparisonCube:
+    """
+    Daily observations for N locations on one shared daily index.
+
+    ``values`` has shape ``(len(locations), len(dates), len(variables))`` and
+    holds NaN wherever a location has no observation for a day.
+    """
+
+    locations: list[str]
+    dates: pd.DatetimeIndex
+    variables: list[str]
+    values: np.ndarray
+    errors: dict[str, BaseException] = field(default_factory=dict)
+
+    def _var(self, variable: str) -> np.ndarray:
+        """(location, date) slice for ``variable``."""
+        return self.values[:, :, self.variables.index(variable)]
+
+    def wide(self, variable: str) -> pd.DataFrame:
+        """``variable`` as a date x location frame (a view, no copy)."""
+        return pd.DataFrame(
+            self._var(variable).T, index=self.dates, columns=self.locations, copy=False
+        )
+
+    def differences(self, variable: str, baseline: str) -> pd.DataFrame:
+        """Each location minus ``baseline`` for ``variable``, date x location."""
+        arr = self._var(variable)
+        diff = arr - arr[self.locations.index(baseline)]
+        return pd.DataFrame(diff.T, index=self.dates, columns=self.locations)
+
+    def ranks(self, variable: str, ascending: bool = False) -> pd.DataFrame:
+        """Per-day rank of each location for ``variable`` (1 = highest by default).
+
+        Ties are broken by location order; a missing value leaves its rank NaN.
+        """
+        arr = self._var(variable)
+        keyed = arr if ascending else -arr
+        # NaN sorts last, so ranks among present values are unaffected
+        order = np.argsort(keyed, axis=0, kind="stable")
+        ranks = np.empty_like(order, dtype=float)
+        np.put_along_axis(
+            ranks, order, np.arange(1, arr.shape[0] + 1, dtype=float)[:, None], axis=0
+        )
+        ranks[np.isnan(arr)] = np.nan
+        return pd.DataFrame(ranks.T, index=self.dates, columns=self.locations)
+
+    def summary(self) -> pd.DataFrame:
+        """Mean/min/max/std/count per (location, variable) over all dates."""
+        v = self.values
+        with np.errstate(all="ignore"), warnings.catch_warnings():
+            # "Mean of empty slice" for locations with no data at all
+            warnings.simplefilter("ignore", RuntimeWarning)
+            stats = {
+                "mean": np.nanmean(v, axis=1),
+                "min": np.nanmin(v, axis=1),
+                "max": np.nanmax(v, axis=1),
+                "std": np.nanstd(v, axis=1),
+                "count": np.sum(~np.isnan(v), axis=1).astype(float),
+            }
+        index = pd.MultiIndex.from_product(
+            [self.locations, self.variables], names=["location", "variable"]
+        )
+        return pd.DataFrame({k: s.reshape(-1) for k, s in stats.items()}, index=index)
+
+    def totals(self, variable: str) -> pd.Series:
+        """Sum of ``variable`` per location (e.g. rainfall over the period)."""
+        return pd.Series(
+            np.nansum(self._var(variable), axis=1), index=self.locations, name=variable
+        )
+
+
+def build_cube(
+    frames: Mapping[str, pd.DataFrame | None],
+    start: DateLike | None = None,
+    end: DateLike | None = None,
+    variables: Sequence[str] = DEFAULT_VARIABLES,
+) -> ComparisonCube:
+    """
+    Align per-location daily frames (``time`` index or column) into a cube.
+
+    All frames are stacked once and scattered into the cube with a single
+    fancy-index assignment, so cost does not grow with a Python loop per day.
+    The daily index spans ``start``..``end`` if given, otherwise the union of
+    the frames' dates.
+    """
+    names = list(frames)
+    variables = list(variables)
+    prepared = [_time_indexed(frames[n]) for n in names]
+    lengths = np.array([len(f) for f in prepared], dtype=np.intp)
+
+    if prepared and lengths.sum():
+        long = pd.concat(prepared, ignore_index=False, sort=False)
+        stamps = long.index.normalize()
+    else:
+        long = pd.DataFrame(columns=variables)
+        stamps = pd.DatetimeIndex([])
+
+    lo = pd.Timestamp(start) if start is not None else stamps.min()
+    hi = pd.Timestamp(end) if end is not None else stamps.max()
+    dates = (
+        pd.date_range(lo, hi, freq="D", name="time")
+        if len(stamps) or (start is not None and end is not None)
+        else pd.DatetimeIndex([], name="time")
+    )
+
+    values = np.full((len(names), len(dates), len(variables)), np.nan)
+    if len(stamps):
+        loc_idx = np.repeat(np.arange(len(names)), lengths)
+        date_idx = dates.get_indexer(stamps)
+        keep = date_idx >= 0
+        block = long.reindex(columns=variables).to_numpy(dtype=float, na_value=np.nan)
+        values[loc_idx[keep], date_idx[keep]] = block[keep]
+    # Cubes are shared through caches; make accidental writes fail loudly
+    values.flags.writeable = False
+    return ComparisonCube(names, dates, list(variables), values)
+
+
+def _time_indexed(df: pd.DataFrame | None) -> pd.DataFrame:
+    if df is None:
+        return pd.DataFrame()
+    if "time" in df.columns:
+        return df.set_index(pd.DatetimeIndex(df["time"])).drop(columns=["time"])
+    return df
+
+
+def compare_locations(
+    points: Mapping[str, tuple[float, float]],
+    start: DateLike,
+    end: DateLike,
+    variables: Sequence[str] = DEFAULT_VARIABLES,
+    max_workers: int = 8,
+) -> ComparisonCube:
+    """
+    Fetch ``{label: (lat, lon)}`` concurrently and align them into a cube.
+
+    Locations whose fetch failed are kept as all-NaN rows and their exception
+    is reported in ``cube.errors``.
+    """
+    labels = list(points)
+    results = get_historical_weather_many(
+        [points[n] for n in labels], start, end, max_workers=max_workers
+    )
+    frames = {n: r.data for n, r in zip(labels, results, strict=True)}
+    cube = build_cube(frames, start, end, variables)
+    cube.errors.update(
+        {n: r.error for n, r in zip(labels, results, strict=True) if r.error}
+    )
+    return cube
@@ -0,0 +1,157 @@
+# src/downsample.py
+# Shape-preserving chart downsampling: LTTB for lines, min/max envelopes for bars.
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+try:
+    from src.cache import FrameCache, frame_fingerprint
+    from src.fetch import freeze_frame
+    from src.metrics import REGISTRY
+except Exception:
+    from cache import FrameCache, frame_fingerprint  # type: ignore
+    from fetch import freeze_frame  # type: ignore
+    from metrics import REGISTRY  # type: ignore
+
+# Roughly the plot width of a wide-layout Streamlit chart, in pixels; more
+# points than this per series cannot be told apart on screen
+CHART_WIDTH_PX = 1000
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets: positions of ``n_out`` points of (x, y).
+
+    The first and last points are always kept; every bucket in between keeps
+    the point forming the largest triangle with the point kept for the
+    previous bucket and the mean of the next bucket. ``y`` must not contain
+    NaN and ``x`` must be sorted.
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=float)
+    x = x - x[0]  # keeps the cumulative sums below precise for epoch-ns x
+    y = np.asarray(y, dtype=float)
+    # n_out - 2 buckets over the points between the fixed first and last
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    # Mean of the bucket after each bucket (the last one's is the final point),
+    # from cumulative sums so the sequential loop below stays cheap
+    nxt_lo = edges[1:]
+    nxt_hi = np.r_[edges[2:], n]
+    cx = np.r_[0.0, np.cumsum(x)]
+    cy = np.r_[0.0, np.cumsum(y)]
+    count = nxt_hi - nxt_lo
+    avg_x = (cx[nxt_hi] - cx[nxt_lo]) / count
+    avg_y = (cy[nxt_hi] - cy[nxt_lo]) / count
+
+    out = np.empty(n_out, dtype=np.int64)
+    out[0], out[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        xa, ya = x[a], y[a]
+        area = np.abs(
+            (xa - avg_x[i]) * (y[lo:hi] - ya) - (xa - x[lo:hi]) * (avg_y[i] - ya)
+        )
+        a = lo + int(area.argmax())
+        out[i + 1] = a
+    return out
+
+
+def minmax_indices(y: np.ndarray, n_buckets: int) -> np.ndarray:
+    """
+    Positions of the minimum and maximum of ``y`` in each of ``n_buckets``.
+
+    NaN values are skipped. The result is sorted and holds at most
+    ``2 * n_buckets`` positions, so spikes (e.g. a day of heavy rain)
+    survive the reduction.
+    """
+    valid = np.flatnonzero(~np.isnan(np.asarray(y, dtype=float)))
+    if len(valid) <= 2 * n_buckets:
+        return valid
+    bucket = np.arange(len(valid)) * n_buckets // len(valid)
+    # Sorted by bucket, then value: each bucket's first is its min, last its max
+    order = np.lexsort((np.asarray(y, dtype=float)[valid], bucket))
+    starts = np.searchsorted(bucket[order], np.arange(n_buckets))
+    ends = np.r_[starts[1:], len(order)] - 1
+    return valid[np.unique(np.r_[order[starts], order[ends]])]
+
+
+def downsample(
+    df: pd.DataFrame,
+    x: str,
+    columns: list[str],
+    kind: str = "line",
+    max_points: int = CHART_WIDTH_PX,
+) -> pd.DataFrame:
+    """
+    Reduce ``df`` to about ``max_points`` rows per series for charting.
+
+    Args:
+        df: Frame sorted by ``x``.
+        x: Column plotted on the x axis; becomes the index of the result.
+        columns: Series to plot.
+        kind: "line" (LTTB per series) or "bar" (min/max per bucket).
+        max_points: Point budget per series, typically the chart pixel width.
+
+    Returns:
+        pd.DataFrame: ``columns`` indexed by ``x`` on the union of the rows
+        kept for each series, in ``x`` order.
+    """
+    if kind not in ("line", "bar"):
+        raise ValueError(f"unknown chart kind {kind!r}")
+    if len(df) <= max_points:
+        return df.set_index(x)[columns]
+    xs = df[x]
+    xv = (
+        xs.to_numpy(dtype="datetime64[ns]").astype(np.int64)
+        if pd.api.types.is_datetime64_any_dtype(xs)
+        else xs.to_numpy(dtype=float)
+    )
+    keep: list[np.ndarray] = []
+    for c in columns:
+        y = pd.to_numeric(df[c], errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+        if kind == "bar":
+            keep.append(minmax_indices(y, max(1, max_points // 2)))
+        else:
+            valid = np.flatnonzero(~np.isnan(y))
+            keep.append(valid[lttb_indices(xv[valid], y[valid], max_points)])
+    rows = np.unique(np.concatenate(keep)) if keep else np.arange(0)
+    return df.iloc[rows].set_index(x)[columns]
+
+
+_chart_cache = FrameCache(maxsize=64)
+
+
+def chart_frame(
+    df: pd.DataFrame,
+    x: str,
+    columns: list[str],
+    kind: str = "line",
+    max_points: int | None = CHART_WIDTH_PX,
+    fingerprint: str | None = None,
+) -> pd.DataFrame:
+    """
+    Cached :func:`downsample`, keyed by the content fingerprint of ``df``.
+
+    ``max_points=None`` returns the full-resolution series (also cached).
+    Pass ``fingerprint`` when the caller already has one for ``df`` (or for
+    the frame it was derived from). The result is read-only and shared.
+    """
+    fp = fingerprint or frame_fingerprint(df)
+    key = (fp, x, tuple(columns), kind, max_points)
+    cached = _chart_cache.get(key)
+    if cached is not None:
+        REGISTRY.inc("chart_cache_requests_total", result="hit")
+        return cached
+    REGISTRY.inc("chart_cache_requests_total", result="miss")
+    with REGISTRY.timer("chart_downsample_seconds", kind=kind):
+        if max_points is None:
+            out = df.set_index(x)[columns]
+        else:
+            out = downsample(df, x, columns, kind, max_points)
+    out = freeze_frame(out)
+    _chart_cache.put(key, out)
+    return out
@@ -0,0 +1,410 @@
+# src/export.py
+# Headless batch export: python -m src.export locations.csv --start ... --end ...
+from __future__ import annotations
+
+import argparse
+import csv
+import importlib.util
+import json
+import logging
+import multiprocessing
+import re
+import sys
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from dataclasses import dataclass, field, replace
+from datetime import date, datetime
+from pathlib import Path
+
+import pandas as pd
+
+try:
+    from src.fetch import get_historical_weather, get_upstream
+    from src.formatters import build_user_view
+    from src.locations import parse_locations
+    from src.resilience import CircuitBreaker
+except Exception:
+    from fetch import get_historical_weather, get_upstream  # type: ignore
+    from formatters import build_user_view  # type: ignore
+    from locations import parse_locations  # type: ignore
+    from resilience import CircuitBreaker  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+FORMATS = {"csv": ".csv", "parquet": ".parquet"}
+VIEWS = ("raw", "user")
+MANIFEST_NAME = "_manifest.jsonl"
+# Times one location waits out an open circuit breaker before it is failed
+BREAKER_WAITS = 2
+
+
+@dataclass(frozen=True)
+class ExportLocation:
+    """One row of the locations CSV."""
+
+    name: str
+    lat: float
+    lon: float
+    partition: str = ""  # set when the derived slug clashes with another row
+
+    @property
+    def slug(self) -> str:
+        """File-system safe partition name."""
+        if self.partition:
+            return self.partition
+        base = self.name or f"{self.lat:.4f}_{self.lon:.4f}"
+        return re.sub(r"[^A-Za-z0-9._-]+", "_", base).strip("_") or "location"
+
+
+def read_locations(path: str | Path) -> list[ExportLocation]:
+    """
+    Read locations from a CSV with ``lat``/``lon`` columns or a ``location``
+    column (a preset name or "lat,lon"); an optional ``name`` column labels
+    the partitions. Partition names are made unique with a ``_<n>`` suffix;
+    the ``name`` itself is kept as given.
+    """
+    out: list[ExportLocation] = []
+    seen: set[str] = set()
+    with open(path, newline="", encoding="utf-8") as fh:
+        for row in csv.DictReader(fh):
+            row = {k.strip().lower(): (v or "").strip() for k, v in row.items() if k}
+            name = row.get("name", "")
+            if row.get("lat") and row.get("lon"):
+                lat, lon = float(row["lat"]), float(row["lon"])
+            elif row.get("location"):
+                # Strict parsing: no silent fallback to the default preset
+                parsed = parse_locations([row["location"]])
+                if not parsed:
+                    raise ValueError(f"cannot parse location {row['location']!r}")
+                ((_, (lat, lon)),) = parsed.items()
+                name = name or row["location"]
+            else:
+                raise ValueError(f"row needs lat/lon or location: {row}")
+            loc = ExportLocation(name, lat, lon)
+            slug, n = loc.slug, 1
+            while slug in seen:
+                n += 1
+                slug = f"{loc.slug}_{n}"
+            seen.add(slug)
+            out.append(loc if slug == loc.slug else replace(loc, partition=slug))
+    return out
+
+
+def write_partition(
+    df: pd.DataFrame, loc: ExportLocation, out_dir: str, fmt: str, view: str
+) -> tuple[str, int]:
+    """
+    Format and write one location's frame; runs in a worker process.
+
+    The file is written under a temporary name and renamed into place, so
+    an interrupted run never leaves a partial partition behind.
+    """
+    frame = df.reset_index() if isinstance(df.index, pd.DatetimeIndex) else df
+    if "time" in frame.columns:
+        frame = frame.sort_values("time", kind="stable")
+    if view == "user":
+        frame, _ = build_user_view(frame)
+    frame = frame.copy(deep=False)
+    frame.insert(0, "location", loc.name or loc.slug)
+    frame.insert(1, "lat", loc.lat)
+    frame.insert(2, "lon", loc.lon)
+
+    path = Path(out_dir) / f"location={loc.slug}" / f"part{FORMATS[fmt]}"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    if fmt == "parquet":
+        frame.to_parquet(tmp, index=False)
+    else:
+        frame.to_csv(tmp, index=False)
+    tmp.replace(path)
+    return str(path), len(frame)
+
+
+class Manifest:
+    """
+    Append-only JSON-lines record of finished partitions, for ``--resume``.
+
+    Partition paths are stored relative to ``out_dir``, so a run can be
+    resumed from another working directory or after moving the output. Each
+    record also carries the run's window, format and view; a partition only
+    counts as done for a run with the same ones.
+    """
+
+    def __init__(self, out_dir: Path):
+        self.out_dir = out_dir
+        self.path = out_dir / MANIFEST_NAME
+
+    def done(self, run: dict[str, str]) -> set[str]:
+        """Slugs already exported (or known to be empty) by an earlier ``run``."""
+        latest: dict[str, dict] = {}
+        if self.path.exists():
+            with open(self.path, encoding="utf-8") as fh:
+                for line in fh:
+                    try:
+                        rec = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # torn last line of a killed run
+                    latest[rec["location"]] = rec
+        return {
+            slug
+            for slug, rec in latest.items()
+            if all(rec.get(k) == v for k, v in run.items())
+            and (
+                rec["status"] == "empty"
+                or (rec["status"] == "ok" and (self.out_dir / rec["path"]).exists())
+            )
+        }
+
+    def append(self, record: dict) -> None:
+        with open(self.path, "a", encoding="utf-8") as fh:
+            fh.write(json.dumps(record) + "\n")
+
+
+def _fetch(loc: ExportLocation, start: date, end: date) -> pd.DataFrame | None:
+    """
+    One location's frame, fetched without storing it in the fetch cache.
+
+    Export shares the process-wide circuit breaker with every other fetch,
+    so a burst of upstream errors opens it for all remaining locations. A
+    fetch refused that way waits out the breaker's reset timeout and tries
+    again, up to :data:`BREAKER_WAITS` times, instead of failing at once.
+    """
+    for _ in range(BREAKER_WAITS):
+        df = get_historical_weather(loc.lat, loc.lon, start, end, cache_result=False)
+        breaker = get_upstream().breaker
+        if df is not None or breaker.state == CircuitBreaker.CLOSED:
+            return df
+        logger.info("Upstream circuit open; %s waits before retrying", loc.slug)
+        time.sleep(breaker.reset_timeout)
+    return get_historical_weather(loc.lat, loc.lon, start, end, cache_result=False)
+
+
+def _day(d: date | datetime) -> str:
+    return (d.date() if isinstance(d, datetime) else d).isoformat()
+
+
+@dataclass
+class ExportProgress:
+    """Running totals, passed to the progress callback after every location."""
+
+    total: int
+    skipped: int = 0
+    ok: int = 0
+    empty: int = 0
+    failed: int = 0
+    rows: int = 0
+    started: float = field(default_factory=time.monotonic)
+
+    @property
+    def done(self) -> int:
+        return self.skipped + self.ok + self.empty + self.failed
+
+    def line(self) -> str:
+        elapsed = time.monotonic() - self.started
+        rate = (self.done - self.skipped) / elapsed if elapsed else 0.0
+        return (
+            f"[{self.done}/{self.total}] ok={self.ok} empty={self.empty} "
+            f"failed={self.failed} skipped={self.skipped} rows={self.rows} "
+            f"({rate:.1f} locations/s)"
+        )
+
+
+def export(
+    locations: Iterable[ExportLocation],
+    start: date | datetime,
+    end: date | datetime,
+    out_dir: str | Path,
+    fmt: str = "csv",
+    view: str = "raw",
+    max_in_flight: int = 8,
+    processes: int | None = None,
+    resume: bool = False,
+    progress: Callable[[ExportProgress], None] | None = None,
+) -> ExportProgress:
+    """
+    Export every location's daily data for [start, end] as one partition each.
+
+    At most ``max_in_flight`` locations are being fetched or written at any
+    time, which bounds both upstream concurrency and the frames held in
+    memory. Fetches go through :func:`get_historical_weather` without storing
+    into its cache, so a frame is dropped once written, and wait out an open
+    circuit breaker (see :func:`_fetch`); formatting and writing run on
+    ``processes`` worker processes (0: in this process).
+
+    Args:
+        locations: Locations to export.
+        start: Start date.
+        end: End date.
+        out_dir: Output directory; gets ``location=<slug>/part.<ext>`` files
+            and a ``_manifest.jsonl``.
+        fmt: "csv" or "parquet" (needs pyarrow).
+        view: "raw" Meteostat columns or the "user" friendly view.
+        max_in_flight: Locations fetched or written concurrently.
+        processes: Worker processes (None: one per core, 0: none).
+        resume: Skip locations an earlier run with the same window, format
+            and view already finished.
+        progress: Called with the running totals after each location.
+
+    Returns:
+        ExportProgress: Final totals.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"unknown format {fmt!r}")
+    if view not in VIEWS:
+        raise ValueError(f"unknown view {view!r}")
+    if fmt == "parquet" and importlib.util.find_spec("pyarrow") is None:
+        raise RuntimeError("parquet output needs pyarrow (pip install pyarrow)")
+
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    manifest = Manifest(out)
+    run = {"start": _day(start), "end": _day(end), "format": fmt, "view": view}
+    done = manifest.done(run) if resume else set()
+    locations = list(locations)
+    todo = [loc for loc in locations if loc.slug not in done]
+    totals = ExportProgress(total=len(locations), skipped=len(locations) - len(todo))
+
+    def record(loc: ExportLocation, status: str, path: str = "", rows: int = 0) -> None:
+        manifest.append(
+            {
+                **run,
+                "location": loc.slug,
+                "lat": loc.lat,
+                "lon": loc.lon,
+                "status": status,
+                "path": Path(path).relative_to(out).as_posix() if path else "",
+                "rows": rows,
+            }
+        )
+        setattr(totals, status, getattr(totals, status) + 1)
+        totals.rows += rows
+        if progress is not None:
+            progress(totals)
+
+    fetchers = ThreadPoolExecutor(
+        max_workers=max(1, max_in_flight), thread_name_prefix="export-fetch"
+    )
+    writers: Executor
+    if processes == 0:
+        writers = ThreadPoolExecutor(max_workers=1, thread_name_prefix="export-write")
+    else:
+        # spawn: fetch threads are running, so forking the parent is unsafe
+        writers = ProcessPoolExecutor(
+            max_workers=processes, mp_context=multiprocessing.get_context("spawn")
+        )
+
+    pending: dict[Future, tuple[str, ExportLocation]] = {}
+    queue = iter(todo)
+    try:
+        while True:
+            while len(pending) < max(1, max_in_flight):
+                loc = next(queue, None)
+                if loc is None:
+                    break
+                fut = fetchers.submit(_fetch, loc, start, end)
+                pending[fut] = ("fetch", loc)
+            if not pending:
+                break
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in finished:
+                stage, loc = pending.pop(fut)
+                if stage == "fetch":
+                    df = fut.result()  # _fetch never raises
+                    if df is None:
+                        record(loc, "failed")
+                    elif df.empty:
+                        record(loc, "empty")
+                    else:
+                        job = writers.submit(
+                            write_partition, df, loc, str(out), fmt, view
+                        )
+                        pending[job] = ("write", loc)
+                else:
+                    try:
+                        path, rows = fut.result()
+                    except Exception:
+                        logger.exception("Failed to write %s", loc.slug)
+                        record(loc, "failed")
+                    else:
+                        record(loc, "ok", path, rows)
+    finally:
+        fetchers.shutdown(wait=True, cancel_futures=True)
+        writers.shutdown(wait=True, cancel_futures=True)
+    return totals
+
+
+def _parse_date(text: str) -> date:
+    return date.fromisoformat(text)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.export",
+        description="Export daily weather for many locations to partitioned files.",
+    )
+    parser.add_argument("locations", type=Path, help="CSV with lat,lon or location")
+    parser.add_argument("--start", type=_parse_date, required=True)
+    parser.add_argument("--end", type=_parse_date, required=True)
+    parser.add_argument("--out", type=Path, default=Path("export"))
+    parser.add_argument("--format", choices=list(FORMATS), default="csv")
+    parser.add_argument("--view", choices=VIEWS, default="raw")
+    parser.add_argument(
+        "--max-in-flight",
+        type=int,
+        default=8,
+        help="locations fetched or written at once",
+    )
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=None,
+        help="worker processes for formatting/writing (default: all cores)",
+    )
+    parser.add_argument(
+        "--resume", action="store_true", help="skip locations already exported"
+    )
+    parser.add_argument("--quiet", action="store_true", help="no progress output")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    start, end = sorted((args.start, args.end))
+    last_report = [0.0]
+
+    def report(p: ExportProgress) -> None:
+        now = time.monotonic()
+        if args.quiet or (now - last_report[0] < 1.0 and p.done < p.total):
+            return
+        last_report[0] = now
+        print(p.line(), file=sys.stderr, flush=True)
+
+    try:
+        totals = export(
+            read_locations(args.locations),
+            start,
+            end,
+            args.out,
+            fmt=args.format,
+            view=args.view,
+            max_in_flight=args.max_in_flight,
+            processes=args.processes,
+            resume=args.resume,
+            progress=report,
+        )
+    except (OSError, ValueError, RuntimeError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    if not args.quiet:
+        print(totals.line(), file=sys.stderr)
+    return 1 if totals.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,19 +1,472 @@
 from __future__ import annotations
 
 import logging
-from datetime import date, datetime
-from functools import lru_cache
+import os
+import tempfile
+import threading
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import TYPE_CHECKING, Any
 
+import numpy as np
 import pandas as pd
-from meteostat import Daily, Point
+
+try:
+    from src.cache import CacheKey, FrameCache, float64_nbytes, frame_nbytes
+    from src.hourly_store import HourlyStore, daily_from_hourly
+    from src.metrics import REGISTRY
+    from src.resilience import CircuitOpenError, Upstream
+    from src.stations import Station, default_index
+    from src.store import DAILY_COLUMNS, RangeStore, location_key, missing_intervals
+except Exception:
+    from cache import CacheKey, FrameCache, float64_nbytes, frame_nbytes  # type: ignore
+    from hourly_store import HourlyStore, daily_from_hourly  # type: ignore
+    from metrics import REGISTRY  # type: ignore
+    from resilience import CircuitOpenError, Upstream  # type: ignore
+    from stations import Station, default_index  # type: ignore
+    from store import (  # type: ignore
+        DAILY_COLUMNS,
+        RangeStore,
+        location_key,
+        missing_intervals,
+    )
+
+if TYPE_CHECKING:
+    import asyncio
+
+    from meteostat import Point
 
 logger = logging.getLogger(__name__)
 DateLike = date | datetime
 
 
-@lru_cache(maxsize=128)
+def __getattr__(name: str) -> Any:
+    # meteostat is imported on first use rather than at import time, keeping
+    # cold starts fast; tests and benchmarks replace these as attributes
+    if name in ("Daily", "Hourly", "Point"):
+        import meteostat
+
+        globals().setdefault("Daily", meteostat.Daily)
+        globals().setdefault("Hourly", meteostat.Hourly)
+        globals().setdefault("Point", meteostat.Point)
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _meteostat(name: str) -> Any:
+    """``Daily``, ``Hourly`` or ``Point`` (or stand-ins), importing meteostat once."""
+    return globals().get(name) or __getattr__(name)
+
+
+# Optional persistent range cache; enabled by pointing this at a SQLite file
+STORE_ENV_VAR = "CLIMATE_COMPARE_STORE"
+_range_store: RangeStore | None = (
+    RangeStore(os.environ[STORE_ENV_VAR]) if os.environ.get(STORE_ENV_VAR) else None
+)
+
+
+# Freshness policy: Meteostat keeps revising the most recent days, so windows
+# reaching into the last RECENT_DAYS are cached briefly; older days are final
+RECENT_DAYS = 7
+RECENT_TTL_SECONDS = 15 * 60
+# Memory budget for the in-process cache (CLIMATE_COMPARE_CACHE_MB, default 512)
+CACHE_MAX_BYTES = int(float(os.environ.get("CLIMATE_COMPARE_CACHE_MB", "512")) * 2**20)
+# Expired windows are kept this long as a fallback while upstream is failing
+STALE_GRACE_SECONDS = 24 * 60 * 60
+
+
+def _on_upstream_event(event: str) -> None:
+    REGISTRY.inc("fetch_upstream_events_total", event=event)
+
+
+# Retries, optional hedging and the circuit breaker around every Daily.fetch()
+_upstream = Upstream(on_event=_on_upstream_event)
+
+
+def set_upstream(upstream: Upstream) -> None:
+    """Replace the resilience policy (retries, hedging, breaker) for upstream calls."""
+    global _upstream
+    if upstream.on_event is None:
+        upstream.on_event = _on_upstream_event
+    _upstream = upstream
+
+
+def get_upstream() -> Upstream:
+    """The resilience policy (retries, hedging, breaker) upstream calls run under."""
+    return _upstream
+
+
+def last_final_day(today: date | None = None) -> date:
+    """Most recent day whose observations are treated as final."""
+    return (today or date.today()) - timedelta(days=RECENT_DAYS)
+
+
+def cache_ttl(end: DateLike, today: date | None = None) -> float | None:
+    """TTL in seconds for a window ending on ``end`` (None: keep indefinitely)."""
+    end_day = end.date() if isinstance(end, datetime) else end
+    return RECENT_TTL_SECONDS if end_day > last_final_day(today) else None
+
+
+def _as_datetime(d: DateLike) -> datetime:
+    # Meteostat expects datetimes; normalise dates to midnight datetimes
+    if isinstance(d, date) and not isinstance(d, datetime):
+        return datetime(d.year, d.month, d.day)
+    return d  # already datetime
+
+
+def resolve_station(lat: float, lon: float) -> Station | None:
+    """
+    The weather station (lat, lon) is served from, if any.
+
+    Only set when a station index is configured (see :mod:`src.stations`)
+    and a station lies within its snapping radius; otherwise Meteostat picks
+    stations around the raw point itself.
+    """
+    index = default_index()
+    return index.snap(lat, lon) if index is not None else None
+
+
+def snap_point(lat: float, lon: float) -> tuple[float, float]:
+    """
+    Coordinates (lat, lon) is fetched and cached under.
+
+    Nearby points resolving to the same station snap to its coordinates, so
+    they share cache entries, in-flight fetches and range-store rows.
+    """
+    lat, lon, _ = _resolve(lat, lon)
+    return lat, lon
+
+
+def _resolve(lat: float, lon: float) -> tuple[float, float, str | None]:
+    """Snapped (lat, lon) and the station ID to fetch by (None: the raw point)."""
+    station = resolve_station(lat, lon)
+    if station is None:
+        return lat, lon, None
+    return station.lat, station.lon, station.id
+
+
+def _location(lat: float, lon: float, station: str | None) -> Point | str:
+    """What Meteostat is asked for: a known station by ID, else the raw point."""
+    return station if station is not None else _meteostat("Point")(lat, lon)
+
+
+def _daily_fetch(location: Point | str, start: datetime, end: datetime) -> pd.DataFrame:
+    """The single upstream call site for daily rows."""
+    return _timed_fetch("Daily", "fetch", location, start, end)
+
+
+def _hourly_fetch(
+    location: Point | str, start: datetime, end: datetime
+) -> pd.DataFrame:
+    """The single upstream call site for hourly rows (UTC)."""
+    return _timed_fetch("Hourly", "hourly", location, start, end)
+
+
+def _timed_fetch(
+    kind: str, metric: str, location: Point | str, start: datetime, end: datetime
+) -> pd.DataFrame:
+    """Upstream ``kind`` fetch, timed and counted as ``<metric>_*`` series."""
+    t0 = time.perf_counter()
+    outcome = "error"
+    try:
+        df = _upstream.call(lambda: _meteostat(kind)(location, start, end).fetch())
+        outcome = "ok"
+        REGISTRY.inc(f"{metric}_rows_total", len(df))
+        return df
+    except TimeoutError:
+        outcome = "timeout"
+        raise
+    except CircuitOpenError:
+        outcome = "rejected"
+        raise
+    finally:
+        REGISTRY.observe(
+            f"{metric}_upstream_seconds", time.perf_counter() - t0, outcome=outcome
+        )
+
+
+def set_range_store(store: RangeStore | None) -> None:
+    """Install (or remove with ``None``) the persistent range store."""
+    global _range_store
+    _range_store = store
+    _frame_cache.clear()
+
+
+def _fetch_via_store(
+    store: RangeStore,
+    location: Point | str,
+    lat: float,
+    lon: float,
+    start_dt: datetime,
+    end_dt: datetime,
+) -> pd.DataFrame:
+    """Fetch only the sub-ranges the store lacks, then serve the window from disk."""
+    key = location_key(lat, lon)
+    # Recent days may still change upstream; never mark them covered
+    last_final = last_final_day()
+    for gap_start, gap_end in store.missing(key, start_dt, end_dt):
+        part = _daily_fetch(location, _as_datetime(gap_start), _as_datetime(gap_end))
+        # Meteostat answers a failed download with an empty frame rather than
+        # an error, so an empty gap is not recorded as covered: it is asked
+        # for again next time instead of staying blank for good
+        covered_to = min(gap_end, last_final) if not part.empty else None
+        store.put(key, part, gap_start, covered_to)
+    return store.get(key, start_dt, end_dt)
+
+
+def freeze_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Return ``df`` rebuilt on read-only NumPy buffers, without copying data.
+
+    In-place writes (``.loc``/``.iloc`` assignment, ``+=``) on the result or
+    on any shallow copy of it raise ``ValueError``, so a cached frame can be
+    handed out safely without a defensive copy. Only NumPy-backed columns are
+    frozen; extension-array columns are passed through as they are.
+    """
+    cols: dict[str, object] = {}
+    for c in df.columns:
+        if not isinstance(df[c].dtype, np.dtype):
+            cols[c] = df[c].array
+            continue
+        arr = df[c].to_numpy(copy=False)
+        if arr.flags.writeable:
+            arr = arr.view()
+            arr.flags.writeable = False
+        cols[c] = arr
+    return pd.DataFrame(cols, index=df.index, columns=df.columns, copy=False)
+
+
+def share_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Hand out a cached frozen frame: a new header over the same buffers."""
+    # Column adds/renames land on the caller's header, never on the cache entry
+    return df.copy(deep=False)
+
+
+def compact_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Downcast a daily frame: float32 measurements and nullable Int16 ``wdir``.
+
+    The ``wdir`` column is built from fresh read-only buffers so it keeps the
+    :func:`freeze_frame` guarantees even though it is an extension array.
+    """
+    cols: dict[str, object] = {}
+    for c in df.columns:
+        if c == "wdir":
+            deg = pd.to_numeric(df[c], errors="coerce").to_numpy(
+                dtype=float, na_value=np.nan
+            )
+            mask = np.isnan(deg)
+            values = np.where(mask, 0, np.round(deg)).astype(np.int16)
+            values.flags.writeable = False
+            mask.flags.writeable = False
+            cols[c] = pd.arrays.IntegerArray(values, mask, copy=False)
+        elif c in DAILY_COLUMNS:
+            cols[c] = pd.to_numeric(df[c], errors="coerce").astype(np.float32)
+        else:
+            cols[c] = df[c]
+    return freeze_frame(
+        pd.DataFrame(cols, index=df.index, columns=df.columns, copy=False)
+    )
+
+
+def _on_evict(_key: CacheKey, reason: str) -> None:
+    REGISTRY.inc("fetch_cache_evictions_total", reason=reason)
+
+
+# The one process-wide cache of frozen frames, shared by every Streamlit
+# session; keyed by (lat, lon, start, end, compact)
+_frame_cache = FrameCache(
+    maxsize=128,
+    on_evict=_on_evict,
+    max_bytes=CACHE_MAX_BYTES,
+    stale_for=STALE_GRACE_SECONDS,
+)
+
+
+def _cache_key(
+    lat: float, lon: float, start: DateLike, end: DateLike, compact: bool
+) -> CacheKey:
+    """
+    Frame-cache key of a window; dates and midnight datetimes share one.
+
+    ``lat``/``lon`` must already be snapped (:func:`_resolve`), which each
+    public entry point does once.
+    """
+    return (lat, lon, _as_datetime(start), _as_datetime(end), compact)
+
+
+def _fetch_cached(
+    lat: float,
+    lon: float,
+    start: DateLike,
+    end: DateLike,
+    compact: bool = False,
+    cache_result: bool = True,
+) -> pd.DataFrame:
+    """
+    Cached upstream fetch that raises on failure (errors are not cached).
+
+    If upstream fails, or the circuit breaker refuses the call, a recently
+    expired entry for the window is served instead of raising. With
+    ``cache_result`` False a miss is fetched but not stored.
+    """
+    lat, lon, station = _resolve(lat, lon)
+    key = _cache_key(lat, lon, start, end, compact)
+    cached = _frame_cache.get(key)
+    if cached is not None:
+        REGISTRY.inc("fetch_cache_requests_total", result="hit")
+        return cached
+    if compact:
+        # Derive from a full-precision entry rather than fetching and caching
+        # the same window a second time
+        full = _frame_cache.get(_cache_key(lat, lon, start, end, False))
+        if full is not None:
+            REGISTRY.inc("fetch_cache_requests_total", result="derived")
+            return compact_frame(full)
+    REGISTRY.inc("fetch_cache_requests_total", result="miss")
+    try:
+        df = _fetch_coalesced(lat, lon, station, start, end)
+    except Exception as err:
+        stale = _frame_cache.get_stale(key)
+        if stale is None:
+            raise
+        logger.warning("Serving stale weather for lat=%s lon=%s: %r", lat, lon, err)
+        REGISTRY.inc("fetch_cache_requests_total", result="stale")
+        return stale
+    if compact:
+        df = compact_frame(df)
+    if cache_result:
+        _cache_put(key, df, end)
+    return df
+
+
+def _cache_put(key: CacheKey, df: pd.DataFrame, end: DateLike) -> None:
+    _frame_cache.put(key, df, ttl=cache_ttl(end))
+    REGISTRY.set("fetch_cache_entries", len(_frame_cache))
+    REGISTRY.set("fetch_cache_bytes", _frame_cache.nbytes)
+
+
+class _Flight:
+    """One in-progress upstream fetch that other callers can wait on."""
+
+    def __init__(self, start: date, end: date):
+        self.start = start
+        self.end = end
+        self.done = threading.Event()
+        self.result: pd.DataFrame | None = None
+        self.error: BaseException | None = None
+
+    def wait(self, start: date, end: date) -> pd.DataFrame:
+        """Block until the fetch finishes; return its [start, end] slice."""
+        self.done.wait()
+        if self.error is not None:
+            raise self.error
+        assert self.result is not None
+        if (start, end) == (self.start, self.end):
+            return self.result
+        return _slice_days(self.result, start, end)
+
+
+# In-flight upstream fetches per (lat, lon), guarded by _inflight_lock
+_inflight: dict[tuple[float, float], list[_Flight]] = {}
+_inflight_lock = threading.Lock()
+
+
+def _slice_days(df: pd.DataFrame, start: date, end: date) -> pd.DataFrame:
+    if not isinstance(df.index, pd.DatetimeIndex):
+        return df.iloc[0:0] if df.empty else df
+    days = df.index.normalize()
+    mask = (days >= pd.Timestamp(start)) & (days <= pd.Timestamp(end))
+    return freeze_frame(df[mask])
+
+
+def _fetch_coalesced(
+    lat: float, lon: float, station: str | None, start: DateLike, end: DateLike
+) -> pd.DataFrame:
+    """
+    Single-flight wrapper around :func:`_fetch_upstream`.
+
+    Days of [start, end] already being fetched for the same point by another
+    thread are waited on and sliced from that call's result; only the
+    remaining gaps go upstream, and are themselves registered so later
+    callers can join them. An upstream error is raised to every waiter.
+    """
+    start_day, end_day = _as_datetime(start).date(), _as_datetime(end).date()
+    point = (lat, lon)
+    with _inflight_lock:
+        flights = _inflight.setdefault(point, [])
+        joined = [f for f in flights if f.start <= end_day and f.end >= start_day]
+        gaps = missing_intervals([(f.start, f.end) for f in joined], start_day, end_day)
+        own = [_Flight(s, e) for s, e in gaps]
+        flights.extend(own)
+    if joined:
+        REGISTRY.inc("fetch_coalesced_total", len(joined))
+
+    try:
+        for flight in own:
+            try:
+                flight.result = _fetch_upstream(
+                    lat, lon, station, flight.start, flight.end
+                )
+            except BaseException as e:
+                flight.error = e
+                raise
+            finally:
+                _land(point, flight)
+    finally:
+        # If an earlier gap failed, later ones never started; release waiters
+        for flight in own:
+            if not flight.done.is_set():
+                flight.error = RuntimeError("upstream fetch abandoned")
+                _land(point, flight)
+
+    pieces = [
+        f.wait(max(f.start, start_day), min(f.end, end_day))
+        for f in sorted(joined + own, key=lambda f: f.start)
+    ]
+    non_empty = [p for p in pieces if not p.empty]
+    if len(non_empty) <= 1:
+        return non_empty[0] if non_empty else pieces[0]
+    return freeze_frame(pd.concat(non_empty))
+
+
+def _land(point: tuple[float, float], flight: _Flight) -> None:
+    with _inflight_lock:
+        flights = _inflight.get(point, [])
+        if flight in flights:
+            flights.remove(flight)
+        if not flights:
+            _inflight.pop(point, None)
+    flight.done.set()
+
+
+def _fetch_upstream(
+    lat: float, lon: float, station: str | None, start: DateLike, end: DateLike
+) -> pd.DataFrame:
+    """Fetch one window from the range store or Meteostat as a frozen frame."""
+    start_dt, end_dt = _as_datetime(start), _as_datetime(end)
+    # A known station is fetched by ID: no nearby-station search upstream
+    location = _location(lat, lon, station)
+    if _range_store is not None:
+        return freeze_frame(
+            _fetch_via_store(_range_store, location, lat, lon, start_dt, end_dt)
+        )
+    df = _daily_fetch(location, start_dt, end_dt)
+    # Cache entries are read-only so hits can share buffers instead of copying
+    return freeze_frame(df)
+
+
 def get_historical_weather(
-    lat: float, lon: float, start: DateLike, end: DateLike
+    lat: float,
+    lon: float,
+    start: DateLike,
+    end: DateLike,
+    compact: bool = False,
+    cache_result: bool = True,
 ) -> pd.DataFrame | None:
     """
     Fetch historical daily weather data for a given location and date range.
@@ -23,27 +476,328 @@ def get_historical_weather(
         lon: Longitude in decimal degrees.
         start: Start date (date or datetime).
         end: End date (date or datetime).
+        compact: Store and return float32 measurements and Int16 ``wdir``
+            (see :func:`compact_frame`) to roughly halve cache memory.
+        cache_result: Store a fetched window in the in-process cache. Pass
+            False for one-off bulk reads (an already cached window is still
+            served from the cache).
 
     Returns:
         pd.DataFrame | None: A DataFrame with daily observations or None on error.
+        The frame shares read-only buffers with the cache; derive new frames
+        (``.copy()``, ``.assign()``, ...) rather than writing values in place.
     """
     try:
-        # Meteostat expects datetimes; normalise dates to midnight datetimes
-        if isinstance(start, date) and not isinstance(start, datetime):
-            start_dt = datetime(start.year, start.month, start.day)
-        else:
-            start_dt = start  # already datetime
+        return share_frame(_fetch_cached(lat, lon, start, end, compact, cache_result))
+    except TimeoutError:
+        logger.exception("Timeout while fetching weather for lat=%s lon=%s", lat, lon)
+        return None
+    except Exception:
+        logger.exception(
+            "Unexpected error fetching weather for lat=%s lon=%s", lat, lon
+        )
+        return None
 
-        if isinstance(end, date) and not isinstance(end, datetime):
-            end_dt = datetime(end.year, end.month, end.day)
-        else:
-            end_dt = end  # already datetime
 
-        location = Point(lat, lon)
-        df = Daily(location, start_dt, end_dt).fetch()
-        # Defensive copy to keep cache returns immutable for callers
-        return df.copy(deep=True)
+# Keep the familiar lru_cache-style controls on the public entry point
+get_historical_weather.cache_clear = _frame_cache.clear  # type: ignore[attr-defined]
+get_historical_weather.cache_info = _frame_cache.info  # type: ignore[attr-defined]
+
+
+# --- Hourly data ---
+# Hourly windows are 24 times larger than daily ones, so they bypass the frame
+# cache and live in a memory-mapped HourlyStore (CLIMATE_COMPARE_HOURLY, or a
+# temporary directory for the life of the process)
+HOURLY_ENV_VAR = "CLIMATE_COMPARE_HOURLY"
+_hourly_store: HourlyStore | None = None
+_hourly_tmp: tempfile.TemporaryDirectory | None = None
+_hourly_lock = threading.Lock()
+_hourly_key_locks: dict[str, threading.Lock] = {}
+
+
+def set_hourly_store(store: HourlyStore | None) -> None:
+    """Install a hourly store (``None``: back to the configured default)."""
+    global _hourly_store
+    with _hourly_lock:
+        _hourly_store = store
+
 
+def _get_hourly_store() -> HourlyStore:
+    global _hourly_store, _hourly_tmp
+    with _hourly_lock:
+        if _hourly_store is None:
+            root = os.environ.get(HOURLY_ENV_VAR)
+            if not root:
+                _hourly_tmp = tempfile.TemporaryDirectory(prefix="climate-hourly-")
+                root = _hourly_tmp.name
+            _hourly_store = HourlyStore(root)
+        return _hourly_store
+
+
+def _fetch_hourly(
+    lat: float, lon: float, start: DateLike, end: DateLike
+) -> pd.DataFrame:
+    """Fetch the days the hourly store lacks, then slice the window from it."""
+    lat, lon, station = _resolve(lat, lon)
+    key = location_key(lat, lon)
+    store = _get_hourly_store()
+    with _hourly_lock:
+        key_lock = _hourly_key_locks.setdefault(key, threading.Lock())
+    # One upstream fetch per location at a time; waiters then find it stored
+    with key_lock:
+        gaps = store.missing(key, start, end)
+        REGISTRY.inc("hourly_store_requests_total", result="miss" if gaps else "hit")
+        # Recent days may still change upstream; never mark them covered
+        last_final = last_final_day()
+        for gap_start, gap_end in gaps:
+            part = _hourly_fetch(
+                _location(lat, lon, station),
+                _as_datetime(gap_start),
+                _as_datetime(gap_end) + timedelta(hours=23),
+            )
+            # As for daily rows, an empty answer may be a failed download
+            covered_to = min(gap_end, last_final) if not part.empty else None
+            store.put(key, part, gap_start, covered_to)
+    return store.get(key, start, end)
+
+
+def get_hourly_weather(
+    lat: float, lon: float, start: DateLike, end: DateLike
+) -> pd.DataFrame | None:
+    """
+    Fetch hourly observations (UTC) for a location and the days [start, end].
+
+    Args:
+        lat: Latitude in decimal degrees.
+        lon: Longitude in decimal degrees.
+        start: First day (date or datetime).
+        end: Last day (date or datetime), inclusive.
+
+    Returns:
+        pd.DataFrame | None: One float32 row per hour with Meteostat's hourly
+        columns, or None on error. Columns are read-only slices of the
+        memory-mapped store, not copies.
+    """
+    try:
+        return _fetch_hourly(lat, lon, start, end)
+    except TimeoutError:
+        logger.exception(
+            "Timeout while fetching hourly weather for lat=%s lon=%s", lat, lon
+        )
+        return None
+    except Exception:
+        logger.exception(
+            "Unexpected error fetching hourly weather for lat=%s lon=%s", lat, lon
+        )
+        return None
+
+
+def get_daily_from_hourly(
+    lat: float, lon: float, start: DateLike, end: DateLike
+) -> pd.DataFrame | None:
+    """
+    Daily rows derived from the hourly store (see :func:`daily_from_hourly`).
+
+    Days already held hourly need no upstream call; the result has the
+    same columns as :func:`get_historical_weather`, on UTC days.
+    """
+    hourly = get_hourly_weather(lat, lon, start, end)
+    return None if hourly is None else daily_from_hourly(hourly)
+
+
+def cache_memory_report() -> pd.DataFrame:
+    """
+    Per-entry memory usage of the fetch cache.
+
+    Returns:
+        pd.DataFrame: One row per cached window with its ``rows``, actual
+        ``bytes``, the ``float64_bytes`` it would take uncompacted and the
+        resulting ``saving`` fraction.
+    """
+    records = []
+    for (lat, lon, start, end, compact), df in _frame_cache.items():
+        nbytes = frame_nbytes(df)
+        full = float64_nbytes(df)
+        records.append(
+            {
+                "lat": lat,
+                "lon": lon,
+                "start": start,
+                "end": end,
+                "compact": compact,
+                "rows": len(df),
+                "bytes": nbytes,
+                "float64_bytes": full,
+                "saving": 1 - nbytes / full if full else 0.0,
+            }
+        )
+    return pd.DataFrame(
+        records,
+        columns=[
+            "lat",
+            "lon",
+            "start",
+            "end",
+            "compact",
+            "rows",
+            "bytes",
+            "float64_bytes",
+            "saving",
+        ],
+    )
+
+
+@dataclass(frozen=True)
+class PointResult:
+    """Outcome of fetching one location in a batch."""
+
+    lat: float
+    lon: float
+    data: pd.DataFrame | None = None
+    error: BaseException | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def iter_historical_weather(
+    points: Iterable[tuple[float, float]],
+    start: DateLike,
+    end: DateLike,
+    max_workers: int = 8,
+) -> Iterator[PointResult]:
+    """
+    Fetch many locations concurrently, yielding results as they complete.
+
+    Repeated points are fetched once and every fetch goes through the same
+    cache as :func:`get_historical_weather`. Results arrive in completion
+    order, one per distinct point.
+
+    Args:
+        points: Iterable of (lat, lon) pairs.
+        start: Start date (date or datetime).
+        end: End date (date or datetime).
+        max_workers: Upper bound on concurrent upstream requests.
+
+    Yields:
+        PointResult: The frame, or the exception raised for that point.
+    """
+    unique = list(dict.fromkeys((float(lat), float(lon)) for lat, lon in points))
+    pool = ThreadPoolExecutor(
+        max_workers=max(1, min(max_workers, len(unique) or 1)),
+        thread_name_prefix="weather-fetch",
+    )
+    try:
+        futures = {
+            pool.submit(_fetch_cached, lat, lon, start, end): (lat, lon)
+            for lat, lon in unique
+        }
+        for fut in as_completed(futures):
+            lat, lon = futures[fut]
+            err = fut.exception()
+            if err is not None:
+                logger.warning(
+                    "Error fetching weather for lat=%s lon=%s: %r", lat, lon, err
+                )
+                yield PointResult(lat, lon, error=err)
+            else:
+                yield PointResult(lat, lon, data=share_frame(fut.result()))
+    finally:
+        # Don't start queued fetches if the consumer stopped iterating early
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def get_historical_weather_many(
+    points: Iterable[tuple[float, float]],
+    start: DateLike,
+    end: DateLike,
+    max_workers: int = 8,
+) -> list[PointResult]:
+    """
+    Fetch many locations concurrently and return results in input order.
+
+    Args:
+        points: Sequence of (lat, lon) pairs; duplicates share one fetch.
+        start: Start date (date or datetime).
+        end: End date (date or datetime).
+        max_workers: Upper bound on concurrent upstream requests.
+
+    Returns:
+        list[PointResult]: One entry per input point, errors kept per point.
+    """
+    keys = [(float(lat), float(lon)) for lat, lon in points]
+    by_point = {
+        (r.lat, r.lon): r
+        for r in iter_historical_weather(keys, start, end, max_workers)
+    }
+    return [by_point[k] for k in keys]
+
+
+# --- asyncio API ------------------------------------------------------------
+# Meteostat is blocking, so upstream work runs on the event loop's default
+# executor; cache hits are answered inline without a thread hop. asyncio is
+# imported inside the functions so sync-only users don't pay for it.
+
+
+async def _afetch_cached(
+    lat: float,
+    lon: float,
+    start: DateLike,
+    end: DateLike,
+    compact: bool = False,
+    timeout: float | None = None,
+    semaphore: asyncio.Semaphore | None = None,
+) -> pd.DataFrame:
+    """Async :func:`_fetch_cached`; raises ``TimeoutError`` after ``timeout`` s."""
+    import asyncio
+
+    if is_cached(lat, lon, start, end, compact):
+        return _fetch_cached(lat, lon, start, end, compact)
+    if semaphore is None:
+        return await asyncio.wait_for(
+            asyncio.to_thread(_fetch_cached, lat, lon, start, end, compact), timeout
+        )
+    async with semaphore:
+        return await asyncio.wait_for(
+            asyncio.to_thread(_fetch_cached, lat, lon, start, end, compact), timeout
+        )
+
+
+async def aget_historical_weather(
+    lat: float,
+    lon: float,
+    start: DateLike,
+    end: DateLike,
+    compact: bool = False,
+    timeout: float | None = None,
+    semaphore: asyncio.Semaphore | None = None,
+) -> pd.DataFrame | None:
+    """
+    Async counterpart of :func:`get_historical_weather`.
+
+    Shares its cache, single-flight coalescing and error handling: errors are
+    logged and ``None`` is returned, a timeout included. Cancelling the
+    awaiting task raises ``CancelledError`` as usual; a fetch already running
+    in its worker thread finishes in the background and still fills the
+    cache.
+
+    Args:
+        lat: Latitude in decimal degrees.
+        lon: Longitude in decimal degrees.
+        start: Start date (date or datetime).
+        end: End date (date or datetime).
+        compact: See :func:`get_historical_weather`.
+        timeout: Seconds to wait for the fetch (not counting the time spent
+            waiting for ``semaphore``); None waits indefinitely.
+        semaphore: Optional limit on concurrent fetches shared between calls.
+
+    Returns:
+        pd.DataFrame | None: Read-only daily observations, or None on error.
+    """
+    try:
+        df = await _afetch_cached(lat, lon, start, end, compact, timeout, semaphore)
+        return share_frame(df)
     except TimeoutError:
         logger.exception("Timeout while fetching weather for lat=%s lon=%s", lat, lon)
         return None
@@ -52,3 +806,207 @@ def get_historical_weather(
             "Unexpected error fetching weather for lat=%s lon=%s", lat, lon
         )
         return None
+
+
+async def aiter_historical_weather(
+    points: Iterable[tuple[float, float]],
+    start: DateLike,
+    end: DateLike,
+    max_concurrency: int = 8,
+    timeout: float | None = None,
+) -> AsyncIterator[PointResult]:
+    """
+    Async counterpart of :func:`iter_historical_weather`.
+
+    At most ``max_concurrency`` fetches are awaited at once and each is
+    bounded by ``timeout`` seconds (a timed-out upstream call still runs to
+    completion in its worker thread). Results arrive in completion order,
+    one per distinct point; closing the generator early cancels the rest.
+    """
+    import asyncio
+
+    unique = list(dict.fromkeys((float(lat), float(lon)) for lat, lon in points))
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def one(lat: float, lon: float) -> PointResult:
+        try:
+            df = await _afetch_cached(
+                lat, lon, start, end, timeout=timeout, semaphore=semaphore
+            )
+        except Exception as err:
+            logger.warning(
+                "Error fetching weather for lat=%s lon=%s: %r", lat, lon, err
+            )
+            return PointResult(lat, lon, error=err)
+        return PointResult(lat, lon, data=share_frame(df))
+
+    tasks = [asyncio.ensure_future(one(lat, lon)) for lat, lon in unique]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def aget_historical_weather_many(
+    points: Iterable[tuple[float, float]],
+    start: DateLike,
+    end: DateLike,
+    max_concurrency: int = 8,
+    timeout: float | None = None,
+) -> list[PointResult]:
+    """
+    Async counterpart of :func:`get_historical_weather_many`.
+
+    Args:
+        points: Sequence of (lat, lon) pairs; duplicates share one fetch.
+        start: Start date (date or datetime).
+        end: End date (date or datetime).
+        max_concurrency: Upper bound on concurrent upstream requests.
+        timeout: Per-point fetch timeout in seconds; a point that exceeds it
+            gets a ``TimeoutError`` result.
+
+    Returns:
+        list[PointResult]: One entry per input point, errors kept per point.
+    """
+    keys = [(float(lat), float(lon)) for lat, lon in points]
+    by_point = {
+        (r.lat, r.lon): r
+        async for r in aiter_historical_weather(
+            keys, start, end, max_concurrency, timeout
+        )
+    }
+    return [by_point[k] for k in keys]
+
+
+def _chunk_windows(
+    start: datetime, end: datetime, chunk: str
+) -> list[tuple[datetime, datetime]]:
+    """Split [start, end] on calendar ``chunk`` ("year" or "month") boundaries."""
+    freq = {"year": "YS", "month": "MS"}[chunk]
+    starts = [start] + [
+        b.to_pydatetime() for b in pd.date_range(start, end, freq=freq) if b > start
+    ]
+    ends = [s - timedelta(days=1) for s in starts[1:]] + [end]
+    return list(zip(starts, ends, strict=True))
+
+
+def is_cached(
+    lat: float, lon: float, start: DateLike, end: DateLike, compact: bool = False
+) -> bool:
+    """True if this exact window is already in the in-process fetch cache."""
+    lat, lon = snap_point(lat, lon)
+    return _frame_cache.peek(_cache_key(lat, lon, start, end, compact)) is not None
+
+
+def warm_historical_weather(
+    lat: float,
+    lon: float,
+    start: DateLike,
+    end: DateLike,
+    refresh_within: float = 0.0,
+) -> bool:
+    """
+    Make sure a window stays cached for at least ``refresh_within`` seconds.
+
+    A window that is missing, expired or due to expire sooner is fetched
+    and stored again (refresh-ahead); one that stays fresh is left alone.
+    Used by the warm-up scheduler, so the cache key must match the one the
+    interactive caller will use (same ``start``/``end`` types).
+
+    Returns:
+        bool: True if upstream was fetched, False if the entry was warm.
+        Upstream errors are raised.
+    """
+    lat, lon, station = _resolve(lat, lon)
+    key = _cache_key(lat, lon, start, end, False)
+    left = _frame_cache.ttl_left(key)
+    if left is not None and left > refresh_within:
+        return False
+    _cache_put(key, _fetch_coalesced(lat, lon, station, start, end), end)
+    return True
+
+
+def stream_historical_weather(
+    lat: float,
+    lon: float,
+    start: DateLike,
+    end: DateLike,
+    chunk: str = "year",
+    prefetch: int = 2,
+    cache_result: bool = False,
+) -> Iterator[pd.DataFrame]:
+    """
+    Yield a date range as consecutive calendar chunks, oldest first.
+
+    Up to ``prefetch`` chunks beyond the one being consumed are fetched in
+    the background, so rendering or writing one chunk overlaps with the
+    network wait for the next. Without ``cache_result`` chunks bypass the
+    in-process cache, keeping peak memory bounded by the chunk size. If the
+    whole window is already cached it is sliced from there, and a chunk
+    cached by an earlier, interrupted stream is not fetched again.
+
+    Args:
+        lat: Latitude in decimal degrees.
+        lon: Longitude in decimal degrees.
+        start: Start date (date or datetime).
+        end: End date (date or datetime).
+        chunk: "year" or "month".
+        prefetch: Number of chunks to fetch ahead of the consumer.
+        cache_result: Store each chunk in the fetch cache as it arrives, so
+            a consumer that stops early keeps what it was sent; once the
+            generator is drained the chunks are replaced by the whole
+            window, so a later :func:`get_historical_weather` for it is a
+            hit.
+
+    Yields:
+        pd.DataFrame: One read-only frame per chunk. Upstream errors are
+        raised to the consumer rather than swallowed.
+    """
+    lat, lon, station = _resolve(lat, lon)
+    start_dt, end_dt = _as_datetime(start), _as_datetime(end)
+    windows = _chunk_windows(start_dt, end_dt, chunk)
+
+    cached = _frame_cache.peek(_cache_key(lat, lon, start, end, False))
+    if cached is not None and isinstance(cached.index, pd.DatetimeIndex):
+        for s, e in windows:
+            yield share_frame(cached.loc[s:e])
+        return
+
+    def fetch_chunk(s: datetime, e: datetime) -> pd.DataFrame:
+        hit = _frame_cache.peek(_cache_key(lat, lon, s, e, False))
+        if hit is not None:
+            return hit
+        return _fetch_coalesced(lat, lon, station, s, e)
+
+    parts: list[pd.DataFrame] = []
+    pool = ThreadPoolExecutor(
+        max_workers=max(1, prefetch), thread_name_prefix="weather-chunk"
+    )
+    pending: deque[tuple[datetime, datetime, Future[pd.DataFrame]]] = deque()
+    todo = iter(windows)
+    try:
+        for s, e in todo:
+            pending.append((s, e, pool.submit(fetch_chunk, s, e)))
+            if len(pending) > prefetch:
+                break
+        while pending:
+            s, e, future = pending.popleft()
+            part = future.result()
+            nxt = next(todo, None)
+            if nxt is not None:
+                pending.append((*nxt, pool.submit(fetch_chunk, *nxt)))
+            if cache_result:
+                part = freeze_frame(part)
+                _cache_put(_cache_key(lat, lon, s, e, False), part, e)
+                parts.append(part)
+            yield share_frame(part)
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    if cache_result:
+        full = pd.concat(parts) if parts else pd.DataFrame()
+        for s, e in windows:
+            _frame_cache.discard(_cache_key(lat, lon, s, e, False))
+        _cache_put(_cache_key(lat, lon, start, end, False), freeze_frame(full), end)
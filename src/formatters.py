@@ -2,8 +2,14 @@
 # Utilities to convert a raw weather dataframe into a layperson-friendly table.
 from __future__ import annotations
 
+import numpy as np
 import pandas as pd
 
+try:
+    from src.metrics import REGISTRY
+except Exception:
+    from metrics import REGISTRY  # type: ignore
+
 # Mapping from raw column names to layperson-friendly labels
 COLUMN_MAP: dict[str, str] = {
     "time": "Date",
@@ -39,6 +45,9 @@ COMPASS = [
     "NNW",
 ]
 
+# Array form of COMPASS so labels can be looked up by integer index in bulk
+_COMPASS_ARR = np.array(COMPASS, dtype=object)
+
 
 def _is_na(x) -> bool:
     # Handles None, numpy.nan, pandas.NA uniformly
@@ -67,44 +76,105 @@ def to_kmh(x: float | int | None) -> float | None:
     return xf
 
 
-def build_user_view(df: pd.DataFrame) -> tuple[pd.DataFrame, dict]:
-    """Return (user_friendly_df, column_config_meta)."""
-    out = df.copy()
+def compass_labels(deg: pd.Series) -> pd.Series:
+    """Vectorised :func:`deg_to_compass` over a Series of wind directions."""
+    vals = pd.to_numeric(deg, errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+    mask = np.isfinite(vals)
+    idx = np.zeros(len(vals), dtype=np.intp)
+    # Same bucketing as deg_to_compass; np.mod keeps the result in [0, 360)
+    idx[mask] = np.floor(np.mod(vals[mask], 360.0) / 22.5 + 0.5).astype(np.intp) % 16
+    labels = np.where(mask, _COMPASS_ARR[idx], "—")
+    return pd.Series(labels, index=deg.index, dtype=object)
+
+
+def series_to_kmh(s: pd.Series) -> pd.Series:
+    """Vectorised :func:`to_kmh` over a Series of wind speeds."""
+    out = pd.to_numeric(s, errors="coerce").astype(float)
+    # return out * 3.6  # <- enable if your source is m/s
+    return out
+
+
+def _str_or_dash(s: pd.Series) -> pd.Series:
+    """Render each value with ``str`` and NA as an em dash, column-wise."""
+    text = s.astype(str).astype(object)
+    return text.where(s.notna(), "—")
+
+
+def compass_categorical(deg: pd.Series) -> pd.Series:
+    """Compass labels as a Categorical over COMPASS (int8 codes, NA if unknown)."""
+    labels = compass_labels(deg)
+    return pd.Series(
+        pd.Categorical(labels.where(labels != "—"), categories=COMPASS),
+        index=deg.index,
+    )
+
+
+def build_user_view(
+    df: pd.DataFrame, compact: bool = False, typed: bool = False
+) -> tuple[pd.DataFrame, dict]:
+    """Return (user_friendly_df, column_config_meta).
+
+    With ``compact=True`` numeric columns are float32 and keep NA instead of
+    "—", and wind is split into a categorical "Wind Direction" plus float32
+    speed/gust columns rather than one summary string per row.
+
+    With ``typed=True`` "Date" stays datetime64 and numeric columns keep NA,
+    leaving date formatting and placeholders to the column config.
+    """
+    # Shallow: columns are only ever replaced, so read-only inputs are fine
+    out = df.copy(deep=False)
+    clock = REGISTRY.stages("format_stage_seconds")
 
     # Parse & format date
     if "time" in out.columns:
-        out["time"] = pd.to_datetime(out["time"], errors="coerce").dt.strftime(
-            "%b %d, %Y"
-        )
+        out["time"] = pd.to_datetime(out["time"], errors="coerce")
+        if not typed:
+            out["time"] = out["time"].dt.strftime("%b %d, %Y")
+    clock.mark("date")
 
     # Rounding for numeric columns (preserve NA where present)
     num_cols = ["tavg", "tmin", "tmax", "prcp", "snow", "pres", "tsun"]
     for c in num_cols:
         if c in out.columns:
             out[c] = pd.to_numeric(out[c], errors="coerce").round(1)
+            if compact:
+                out[c] = out[c].astype(np.float32)
+    clock.mark("numeric")
 
     # Wind numeric conversions
-    if "wspd" in out.columns:
-        out["wspd"] = out["wspd"].apply(to_kmh)
-        out["wspd"] = pd.to_numeric(out["wspd"], errors="coerce").round(1)
+    for c in ("wspd", "wpgt"):
+        if c in out.columns:
+            out[c] = series_to_kmh(out[c]).round(1)
+            if compact:
+                out[c] = out[c].astype(np.float32)
+    clock.mark("wind_units")
 
-    if "wpgt" in out.columns:
-        out["wpgt"] = out["wpgt"].apply(to_kmh)
-        out["wpgt"] = pd.to_numeric(out["wpgt"], errors="coerce").round(1)
+    if compact:
+        if "wdir" in out.columns:
+            out["wdir"] = compass_categorical(out["wdir"])
+        out = out.rename(columns={**COLUMN_MAP, "wdir": "Wind Direction"}, copy=False)
+        clock.mark("compact_wind")
+        return out, _column_config()
 
-    # Friendly wind summary (compass + speeds)
+    # Friendly wind summary (compass + speeds), built column-wise
     if "wdir" in out.columns:
-        out["Wind"] = out.apply(
-            lambda r: (
-                f'{deg_to_compass(r.get("wdir"))} • '
-                f'avg {("—" if _is_na(r.get("wspd")) else r.get("wspd"))} km/h • '
-                f'gust {("—" if _is_na(r.get("wpgt")) else r.get("wpgt"))} km/h'
-            ),
-            axis=1,
+        missing = pd.Series("—", index=out.index, dtype=object)
+        wspd = _str_or_dash(out["wspd"]) if "wspd" in out.columns else missing
+        wpgt = _str_or_dash(out["wpgt"]) if "wpgt" in out.columns else missing
+        out["Wind"] = (
+            compass_labels(out["wdir"])
+            + " • avg "
+            + wspd
+            + " km/h • gust "
+            + wpgt
+            + " km/h"
         )
+    clock.mark("wind_summary")
 
     # Replace NA with em dash for display
-    out = out.where(~out.isna(), other="—")
+    if not typed:
+        out = out.where(~out.isna(), other="—")
+        clock.mark("na_fill")
 
     # Rename columns to friendly labels
     out = out.rename(columns=COLUMN_MAP)
@@ -118,10 +188,162 @@ def build_user_view(df: pd.DataFrame) -> tuple[pd.DataFrame, dict]:
     for dc in drop_cols:
         if dc in out.columns and "Wind" in out.columns:
             out = out.drop(columns=[dc])
+    clock.mark("rename")
+
+    return out, _column_config()
+
+
+def build_display_frame(df: pd.DataFrame) -> tuple[pd.DataFrame, dict]:
+    """Return (display_df, column_config_meta) for the daily table, newest first.
+
+    The frame is the typed user view: "Date" is datetime64 and numeric columns
+    are numeric with NA, so sorting uses the real timestamp and Streamlit's
+    column config handles date and number formatting.
+    """
+    display_df, col_cfg = build_user_view(df, typed=True)
+    if "Date" in display_df.columns:
+        display_df = display_df.sort_values(
+            "Date", ascending=False, kind="stable", na_position="last"
+        )
+    return display_df, col_cfg
+
 
-    # Column config metadata for Streamlit
-    col_cfg = {
-        "Date": {"help": "Date of the observation"},
+def build_chart_frame(raw_df: pd.DataFrame) -> pd.DataFrame:
+    """Return ``raw_df`` with friendly numeric columns and a sorted "Date" column."""
+    chart_df = raw_df
+    # Ensure time column
+    if "time" not in chart_df.columns and isinstance(chart_df.index, pd.DatetimeIndex):
+        chart_df = chart_df.reset_index()
+    # Rename for nice axis labels but keep numerics intact (rename already
+    # returns a new frame, so no up-front copy is needed)
+    chart_df = chart_df.rename(columns=COLUMN_MAP, copy=False)
+    if "Date" not in chart_df.columns and "time" in chart_df.columns:
+        chart_df["Date"] = pd.to_datetime(chart_df["time"], errors="coerce")
+        chart_df = chart_df.drop(columns=["time"])
+    if "Date" in chart_df.columns:
+        chart_df = chart_df.sort_values("Date")
+    return chart_df
+
+
+# Friendly labels for rollup columns (see src/rollups.py)
+ROLLUP_COLUMN_MAP: dict[str, str] = {
+    "period": "Period",
+    "tavg": "Average Temperature (°C)",
+    "tmin": "Lowest Temperature (°C)",
+    "tmax": "Highest Temperature (°C)",
+    "prcp": "Total Rainfall (mm)",
+    "tsun": "Total Sunshine (hours)",
+    "days": "Days",
+}
+
+# Date format of the "Period" column per rollup granularity
+_PERIOD_FORMATS = {
+    "week": "MMM DD, YYYY",
+    "month": "MMM YYYY",
+    "season": "MMM YYYY",
+    "year": "YYYY",
+}
+_SEASONS = np.array(["Winter", "Spring", "Summer", "Autumn"], dtype=object)
+
+
+def build_rollup_frame(
+    rollup_df: pd.DataFrame, granularity: str
+) -> tuple[pd.DataFrame, dict]:
+    """Return (display_df, column_config_meta) for a rollup table, newest first.
+
+    "Period" is the period's first day as datetime64; seasonal tables also
+    get a "Season" label such as "Winter 2023/24".
+    """
+    out = rollup_df.reset_index().rename(columns=ROLLUP_COLUMN_MAP)
+    for c in ("tavg", "tmin", "tmax", "prcp", "tsun"):
+        label = ROLLUP_COLUMN_MAP[c]
+        if label in out.columns:
+            out[label] = out[label].round(1)
+    if granularity == "season" and "Period" in out.columns:
+        start = out["Period"].dt
+        names = _SEASONS[(start.month.to_numpy() % 12) // 3]
+        years = start.year.astype(str)
+        winter_end = ((start.year + 1) % 100).astype(str).str.zfill(2)
+        out.insert(
+            1,
+            "Season",
+            names + " " + np.where(names == "Winter", years + "/" + winter_end, years),
+        )
+    out = out.sort_values("Period", ascending=False, kind="stable")
+
+    meta = _column_config()
+    meta.update(
+        {
+            "Period": {
+                "help": "First day of the period",
+                "format": _PERIOD_FORMATS[granularity],
+            },
+            "Season": {"help": "Meteorological season (Dec-Feb is winter)"},
+            "Average Temperature (°C)": {
+                "help": "Mean of the daily average temperatures",
+                "format": "%.1f",
+            },
+            "Lowest Temperature (°C)": {
+                "help": "Coldest temperature in the period",
+                "format": "%.1f",
+            },
+            "Highest Temperature (°C)": {
+                "help": "Warmest temperature in the period",
+                "format": "%.1f",
+            },
+            "Total Rainfall (mm)": {
+                "help": "Precipitation summed over the period",
+                "format": "%.1f",
+            },
+            "Total Sunshine (hours)": {
+                "help": "Sunshine summed over the period",
+                "format": "%.1f",
+            },
+            "Days": {"help": "Days with observations", "format": "%d"},
+        }
+    )
+    return out, meta
+
+
+# Chart labels for the normals overlay (see src/normals.py)
+ANOMALY_COLUMN_MAP: dict[str, str] = {
+    "tavg": "Average Temperature (°C)",
+    "tavg_normal": "Normal Average Temperature (°C)",
+    "tavg_anom": "Temperature Anomaly (°C)",
+    "tavg_pct": "Temperature Percentile",
+    "prcp_cum": "Cumulative Rainfall (mm)",
+    "prcp_normal_cum": "Normal Cumulative Rainfall (mm)",
+}
+
+
+def build_anomaly_chart_frame(anomaly_df: pd.DataFrame) -> pd.DataFrame:
+    """Chart frame for ``Normals.anomalies`` output, with a sorted "Date" column.
+
+    Rainfall is compared as running totals: daily totals are mostly zero,
+    which makes day-by-day rainfall anomalies unreadable. Days without an
+    observation add nothing to either total.
+    """
+    out = anomaly_df.sort_index()
+    if "prcp" in out.columns and "prcp_normal" in out.columns:
+        seen = out["prcp"].notna()
+        out = out.assign(
+            prcp_cum=out["prcp"].where(seen, 0.0).cumsum(),
+            prcp_normal_cum=out["prcp_normal"].where(seen, 0.0).cumsum(),
+        )
+    cols = [c for c in ANOMALY_COLUMN_MAP if c in out.columns]
+    out = out[cols].rename(columns=ANOMALY_COLUMN_MAP)
+    out.insert(0, "Date", out.index)
+    return out.reset_index(drop=True)
+
+
+def _column_config() -> dict:
+    """Column config metadata for Streamlit, keyed by friendly label.
+
+    ``format`` is printf-style for numbers and moment.js-style for dates, as
+    ``st.column_config`` expects.
+    """
+    return {
+        "Date": {"help": "Date of the observation", "format": "MMM DD, YYYY"},
         "Average Temperature (°C)": {
             "help": "Mean temperature for the day",
             "format": "%.1f",
@@ -148,5 +370,7 @@ def build_user_view(df: pd.DataFrame) -> tuple[pd.DataFrame, dict]:
             "format": "%.1f",
         },
         "Wind": {"help": "Compass direction, average speed, and maximum gust (km/h)"},
+        "Wind Direction": {"help": "Compass direction the wind blew from"},
+        "Wind Speed (km/h)": {"help": "Average wind speed", "format": "%.1f"},
+        "Wind Gusts (km/h)": {"help": "Maximum wind gust", "format": "%.1f"},
     }
-    return out, col_cfg
@@ -0,0 +1,298 @@
+# src/hourly_store.py
+# Memory-mapped columnar store of hourly observations: one .npy file per
+# variable and location on a dense hourly grid, so any window is a slice.
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import threading
+from datetime import date, datetime
+from os import PathLike
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+try:
+    from src.store import (
+        DAILY_COLUMNS,
+        Interval,
+        merge_intervals,
+        missing_intervals,
+    )
+except Exception:
+    from store import (  # type: ignore
+        DAILY_COLUMNS,
+        Interval,
+        merge_intervals,
+        missing_intervals,
+    )
+
+DateLike = date | datetime
+
+# Meteostat hourly columns kept by the store (``coco`` is a weather code)
+HOURLY_COLUMNS: tuple[str, ...] = (
+    "temp",
+    "dwpt",
+    "rhum",
+    "prcp",
+    "snow",
+    "wdir",
+    "wspd",
+    "wpgt",
+    "pres",
+    "tsun",
+    "coco",
+)
+_HOUR = np.timedelta64(1, "h")
+
+
+def _as_date(d: DateLike) -> date:
+    return d.date() if isinstance(d, datetime) else d
+
+
+def _hour(ts: pd.Timestamp | datetime | date) -> np.datetime64:
+    return np.datetime64(pd.Timestamp(ts).floor("h").to_datetime64(), "h")
+
+
+class HourlyStore:
+    """
+    Hourly rows per location as memory-mapped float32 columns.
+
+    Each location directory holds ``<column>.v<N>.npy`` files covering the
+    same dense hour grid from ``origin`` (NaN where nothing was observed)
+    and a ``meta.json`` naming the current version ``N``, the grid and the
+    covered day intervals. Reads map the files read-only and slice them, so
+    a window costs no copy and the data lives in the page cache, not the
+    Python heap. Every write builds the next version beside the current one
+    and then switches ``meta.json`` over atomically, so mapped slices of the
+    old version stay valid, and unchanged, for whoever holds them. Within
+    the current grid the files are copied (or, for untouched columns,
+    linked) and only the written slice is touched; a write that extends the
+    grid rebuilds the columns.
+    """
+
+    def __init__(self, root: str | PathLike[str]):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        # Open maps per location: (version, origin, {column: memmap})
+        self._maps: dict[str, tuple[int, np.datetime64, dict[str, np.ndarray]]] = {}
+
+    def _dir(self, loc: str) -> Path:
+        return self.root / loc.replace(",", "_")
+
+    def _meta(self, loc: str) -> dict | None:
+        path = self._dir(loc) / "meta.json"
+        if not path.exists():
+            return None
+        return json.loads(path.read_text())
+
+    def covered(self, loc: str) -> list[Interval]:
+        """Day intervals (inclusive) already stored for ``loc``."""
+        meta = self._meta(loc)
+        if meta is None:
+            return []
+        return [
+            (date.fromisoformat(s), date.fromisoformat(e)) for s, e in meta["coverage"]
+        ]
+
+    def missing(self, loc: str, start: DateLike, end: DateLike) -> list[Interval]:
+        """Day sub-ranges of [start, end] that still need fetching for ``loc``."""
+        return missing_intervals(self.covered(loc), _as_date(start), _as_date(end))
+
+    def _columns(self, loc: str) -> tuple[np.datetime64, dict[str, np.ndarray]] | None:
+        """Current (origin, read-only maps), reopened only after a write."""
+        meta = self._meta(loc)
+        if meta is None:
+            return None
+        cached = self._maps.get(loc)
+        if cached is not None and cached[0] == meta["version"]:
+            return cached[1], cached[2]
+        folder = self._dir(loc)
+        origin = np.datetime64(meta["origin"], "h")
+        maps = {
+            c: np.load(folder / f"{c}.v{meta['version']}.npy", mmap_mode="r")
+            for c in HOURLY_COLUMNS
+        }
+        self._maps[loc] = (meta["version"], origin, maps)
+        return origin, maps
+
+    def put(
+        self,
+        loc: str,
+        df: pd.DataFrame | None,
+        start: DateLike | None = None,
+        end: DateLike | None = None,
+    ) -> None:
+        """
+        Write ``df``'s hourly rows for ``loc`` and record [start, end] as covered.
+
+        Like :meth:`RangeStore.put`, coverage is only recorded when both
+        bounds are given and ``start <= end``; rows are stored regardless.
+        """
+        rows = df if df is not None else pd.DataFrame()
+        hours = (
+            pd.DatetimeIndex(rows.index).floor("h").to_numpy().astype("datetime64[h]")
+            if len(rows)
+            else np.array([], dtype="datetime64[h]")
+        )
+        with self._lock:
+            meta = self._meta(loc) or {"version": 0, "coverage": []}
+            current = self._columns(loc)
+            bounds = [hours.min(), hours.max()] if len(hours) else []
+            if start is not None and end is not None:
+                bounds += [_hour(_as_date(start)), _hour(_as_date(end)) + 23 * _HOUR]
+            old_origin, old = current if current is not None else (None, {})
+            old_len = len(next(iter(old.values()))) if old else 0
+            if old_origin is not None:
+                bounds += [old_origin, old_origin + (old_len - 1) * _HOUR]
+            if not bounds:
+                return
+            origin = min(bounds)
+            length = int((max(bounds) - origin) / _HOUR) + 1
+
+            folder = self._dir(loc)
+            folder.mkdir(parents=True, exist_ok=True)
+            pos = (hours - origin) // _HOUR
+            values = {
+                c: pd.to_numeric(rows[c], errors="coerce").to_numpy(
+                    dtype=np.float32, na_value=np.nan
+                )
+                for c in HOURLY_COLUMNS
+                if c in rows.columns and len(rows)
+            }
+            grow = old_origin is None or origin != old_origin or length != old_len
+            version = meta["version"] + 1
+            i0 = int(pos.min()) if len(pos) else 0
+            for c in HOURLY_COLUMNS:
+                path = folder / f"{c}.v{version}.npy"
+                previous = folder / f"{c}.v{meta['version']}.npy"
+                if grow:
+                    col = np.full(length, np.nan, dtype=np.float32)
+                    if old_origin is not None:
+                        at = int((old_origin - origin) // _HOUR)
+                        col[at : at + old_len] = old[c]
+                    if c in values:
+                        col[pos] = values[c]
+                    np.save(path, col)
+                elif c not in values:
+                    # Unchanged column: the next version shares the file
+                    os.link(previous, path)
+                else:
+                    # Same grid: copy the file outside the Python heap, then
+                    # write only the slice the rows touch into the copy
+                    shutil.copyfile(previous, path)
+                    mm = np.load(path, mmap_mode="r+")
+                    mm[i0 : int(pos.max()) + 1][pos - i0] = values[c]
+                    mm.flush()
+                    del mm
+
+            coverage = [
+                (date.fromisoformat(s), date.fromisoformat(e))
+                for s, e in meta["coverage"]
+            ]
+            if (
+                start is not None
+                and end is not None
+                and _as_date(start) <= _as_date(end)
+            ):
+                coverage.append((_as_date(start), _as_date(end)))
+            new_meta = {
+                "version": version,
+                "origin": str(origin),
+                "length": length,
+                "coverage": [
+                    [s.isoformat(), e.isoformat()] for s, e in merge_intervals(coverage)
+                ],
+            }
+            tmp = folder / "meta.json.tmp"
+            tmp.write_text(json.dumps(new_meta))
+            tmp.replace(folder / "meta.json")
+            # Mapped slices of the old version keep their (unlinked) files alive
+            for c in HOURLY_COLUMNS:
+                (folder / f"{c}.v{meta['version']}.npy").unlink(missing_ok=True)
+            self._maps.pop(loc, None)
+
+    def get(self, loc: str, start: DateLike, end: DateLike) -> pd.DataFrame:
+        """
+        Rows for every hour of the days [start, end] held for ``loc``.
+
+        Columns are read-only slices of the mapped files (no copy); hours
+        outside the stored grid are left out, hours inside it without an
+        observation are NaN.
+        """
+        lo = _hour(_as_date(start))
+        hi = _hour(_as_date(end)) + 24 * _HOUR  # exclusive
+        with self._lock:
+            current = self._columns(loc)
+        if current is None:
+            return pd.DataFrame(
+                {c: np.array([], dtype=np.float32) for c in HOURLY_COLUMNS},
+                index=pd.DatetimeIndex([], name="time"),
+            )
+        origin, maps = current
+        length = len(next(iter(maps.values())))
+        i0 = min(max(int((lo - origin) // _HOUR), 0), length)
+        i1 = min(max(int((hi - origin) // _HOUR), i0), length)
+        index = pd.DatetimeIndex(
+            np.arange(origin + i0 * _HOUR, origin + i1 * _HOUR, _HOUR).astype(
+                "datetime64[ns]"
+            ),
+            name="time",
+        )
+        return pd.DataFrame(
+            {c: maps[c][i0:i1] for c in HOURLY_COLUMNS}, index=index, copy=False
+        )
+
+
+def _circular_mean(degrees: pd.Series, weights: pd.Series, days: pd.Index) -> pd.Series:
+    """Wind-speed weighted mean direction per day, in [0, 360)."""
+    rad = np.radians(degrees)
+    w = weights.where(weights.notna() & degrees.notna())
+    east = (np.sin(rad) * w).groupby(days).sum(min_count=1)
+    north = (np.cos(rad) * w).groupby(days).sum(min_count=1)
+    out = np.degrees(np.arctan2(east, north)).round() % 360
+    return out.where((east != 0) | (north != 0))
+
+
+def daily_from_hourly(hourly: pd.DataFrame) -> pd.DataFrame:
+    """
+    Daily rows with Meteostat's daily columns, aggregated from hourly rows.
+
+    Days are the calendar days of the hourly timestamps (UTC as fetched).
+    Temperatures give the mean/min/max, precipitation and sunshine are
+    summed, snow depth, gusts and wind speed follow Meteostat's daily
+    definitions (max, max, mean) and the wind direction is the speed-weighted
+    circular mean. A value is NaN only when the day has no hourly value for
+    it.
+    """
+    if hourly.empty:
+        return pd.DataFrame(
+            columns=list(DAILY_COLUMNS),
+            index=pd.DatetimeIndex([], name="time"),
+            dtype=float,
+        )
+    frame = hourly.reindex(columns=list(HOURLY_COLUMNS)).astype(np.float64)
+    days = pd.DatetimeIndex(frame.index).normalize().rename("time")
+    groups = frame.groupby(days)
+    out = pd.DataFrame(
+        {
+            "tavg": groups["temp"].mean(),
+            "tmin": groups["temp"].min(),
+            "tmax": groups["temp"].max(),
+            "prcp": groups["prcp"].sum(min_count=1),
+            "snow": groups["snow"].max(),
+            "wdir": _circular_mean(frame["wdir"], frame["wspd"], days),
+            "wspd": groups["wspd"].mean(),
+            "wpgt": groups["wpgt"].max(),
+            "pres": groups["pres"].mean(),
+            "tsun": groups["tsun"].sum(min_count=1),
+        }
+    )
+    # Meteostat's one-decimal precision (the store keeps float32); days
+    # without a single observation are dropped
+    out = out.round(1).dropna(how="all")
+    out.index = pd.DatetimeIndex(out.index, name="time")
+    return out
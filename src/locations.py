@@ -0,0 +1,79 @@
+# src/locations.py
+# Location presets and free-text location parsing shared by the app and batch tools.
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+PRESETS = {
+    "Edinburgh, UK": (55.9533, -3.1883),
+    "London, UK": (51.5074, -0.1278),
+    "Glasgow, UK": (55.8642, -4.2518),
+    "Belfast, UK": (54.5973, -5.9301),
+    "Manchester, UK": (53.4808, -2.2426),
+}
+# What the app shows before the user changes anything: the default location
+# over the last DEFAULT_WINDOW_DAYS days up to today
+DEFAULT_LOCATION = "Edinburgh, UK"
+DEFAULT_WINDOW_DAYS = 9
+
+
+def _station_coordinates(name: str) -> tuple[float, float] | None:
+    """
+    Coordinates of the best station match for a place name, if indexed.
+
+    A name qualified with a region or country ("Heathrow, England") that
+    matches no station as a whole is looked up by its first part.
+    """
+    # Imported here: the station index pulls in pandas, which callers that
+    # only need presets and "lat,lon" pairs should not pay for
+    try:
+        from src.stations import default_index
+    except Exception:
+        from stations import default_index  # type: ignore
+
+    index = default_index()
+    if index is None or not name:
+        return None
+    matches = index.search(name, limit=1)
+    if not matches and "," in name:
+        matches = index.search(name.split(",", 1)[0], limit=1)
+    return (matches[0].lat, matches[0].lon) if matches else None
+
+
+def parse_location(text: str) -> tuple[float, float] | None:
+    text = (text or "").strip()
+    if text in PRESETS:
+        return PRESETS[text]
+    # Support "lat,lon"
+    if "," in text:
+        try:
+            lat_str, lon_str = (p.strip() for p in text.split(",", 1))
+            return float(lat_str), float(lon_str)
+        except ValueError:
+            # Not coordinates: a place name such as "Paris, France"
+            return _station_coordinates(text)
+    # Place names resolve through the offline station index, when configured
+    station = _station_coordinates(text)
+    if station is not None:
+        return station
+    # Fallback to the default preset
+    return PRESETS[DEFAULT_LOCATION]
+
+
+def parse_locations(texts: Iterable[str]) -> dict[str, tuple[float, float]]:
+    """Parse several location strings into ``{label: (lat, lon)}``.
+
+    Only presets, "lat,lon" pairs and (with a station index) place names are
+    accepted, with no silent fallback to the default preset; anything else is
+    skipped. The label is the stripped input.
+    """
+    out: dict[str, tuple[float, float]] = {}
+    for text in texts:
+        label = (text or "").strip()
+        if label in PRESETS or "," in label:
+            latlon = parse_location(label)
+        else:
+            latlon = _station_coordinates(label)
+        if latlon is not None:
+            out[label] = latlon
+    return out
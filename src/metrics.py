@@ -0,0 +1,336 @@
+# src/metrics.py
+# Lightweight in-process metrics (counters, gauges, histograms) with pluggable sinks.
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Protocol
+
+logger = logging.getLogger(__name__)
+
+PREFIX = "climate_compare_"
+METRICS_ENV_VAR = "CLIMATE_COMPARE_METRICS"
+
+# Seconds; spans a cache-warm formatter stage up to a slow multi-decade fetch
+DEFAULT_BUCKETS: tuple[float, ...] = (
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+Labels = tuple[tuple[str, str], ...]
+
+
+def _labels(labels: dict[str, str]) -> Labels:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _fmt_labels(labels: Labels, extra: tuple[str, str] | None = None) -> str:
+    pairs = [*labels, extra] if extra else list(labels)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in pairs) + "}"
+
+
+class Histogram:
+    """Fixed-bucket histogram (Prometheus semantics: ``le`` upper bounds)."""
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """Estimate the ``q`` quantile by interpolating within its bucket."""
+        if not self.count:
+            return float("nan")
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if seen + n >= rank and n:
+                lo = self.buckets[i - 1] if i else 0.0
+                hi = self.buckets[i] if i < len(self.buckets) else self.buckets[-1]
+                return lo + (hi - lo) * (rank - seen) / n
+            seen += n
+        return self.buckets[-1]
+
+
+class StageClock:
+    """Records the time since the previous ``mark`` under a ``stage`` label."""
+
+    def __init__(self, registry: Metrics, name: str):
+        self._registry = registry
+        self._name = name
+        self._last = time.perf_counter()
+
+    def mark(self, stage: str) -> None:
+        now = time.perf_counter()
+        self._registry.observe(self._name, now - self._last, stage=stage)
+        self._last = now
+
+
+class Metrics:
+    """Thread-safe registry of named, labelled counters, gauges and histograms."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counters: dict[str, dict[Labels, float]] = {}
+        self._gauges: dict[str, dict[Labels, float]] = {}
+        self._histograms: dict[str, dict[Labels, Histogram]] = {}
+        self._sinks: list[Sink] = []
+
+    def inc(self, name: str, value: float = 1.0, **labels: str) -> None:
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            key = _labels(labels)
+            series[key] = series.get(key, 0.0) + value
+
+    def set(self, name: str, value: float, **labels: str) -> None:
+        with self._lock:
+            self._gauges.setdefault(name, {})[_labels(labels)] = value
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            key = _labels(labels)
+            if key not in series:
+                series[key] = Histogram()
+            series[key].observe(value)
+
+    @contextmanager
+    def timer(self, name: str, **labels: str) -> Iterator[None]:
+        """Observe the wall time of the ``with`` block into histogram ``name``."""
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - t0, **labels)
+
+    def stages(self, name: str) -> StageClock:
+        """Start a :class:`StageClock` for consecutive stages of one operation."""
+        return StageClock(self, name)
+
+    def counter(self, name: str, **labels: str) -> float:
+        with self._lock:
+            return self._counters.get(name, {}).get(_labels(labels), 0.0)
+
+    def histogram(self, name: str, **labels: str) -> Histogram | None:
+        with self._lock:
+            return self._histograms.get(name, {}).get(_labels(labels))
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._histograms.clear()
+
+    def summary(self) -> list[dict[str, object]]:
+        """Flat rows (metric, labels, count/value, sum, p50, p95) for display."""
+        rows: list[dict[str, object]] = []
+        with self._lock:
+            for kind, store in (("counter", self._counters), ("gauge", self._gauges)):
+                for name, series in sorted(store.items()):
+                    for labels, value in sorted(series.items()):
+                        rows.append(
+                            {
+                                "metric": name,
+                                "labels": _fmt_labels(labels),
+                                "type": kind,
+                                "value": value,
+                            }
+                        )
+            for name, hseries in sorted(self._histograms.items()):
+                for labels, h in sorted(hseries.items()):
+                    rows.append(
+                        {
+                            "metric": name,
+                            "labels": _fmt_labels(labels),
+                            "type": "histogram",
+                            "value": h.count,
+                            "sum": h.sum,
+                            "p50": h.quantile(0.5),
+                            "p95": h.quantile(0.95),
+                        }
+                    )
+        return rows
+
+    def render_prometheus(self) -> str:
+        """Render every series in the Prometheus text exposition format."""
+        out: list[str] = []
+        with self._lock:
+            for kind, store in (("counter", self._counters), ("gauge", self._gauges)):
+                for name, series in sorted(store.items()):
+                    out.append(f"# TYPE {PREFIX}{name} {kind}")
+                    for labels, value in sorted(series.items()):
+                        out.append(f"{PREFIX}{name}{_fmt_labels(labels)} {value:g}")
+            for name, hseries in sorted(self._histograms.items()):
+                out.append(f"# TYPE {PREFIX}{name} histogram")
+                for labels, h in sorted(hseries.items()):
+                    cumulative = 0
+                    for le, n in zip(
+                        [*map(str, h.buckets), "+Inf"], h.counts, strict=True
+                    ):
+                        cumulative += n
+                        out.append(
+                            f"{PREFIX}{name}_bucket"
+                            f"{_fmt_labels(labels, ('le', le))} {cumulative}"
+                        )
+                    out.append(f"{PREFIX}{name}_sum{_fmt_labels(labels)} {h.sum:g}")
+                    out.append(f"{PREFIX}{name}_count{_fmt_labels(labels)} {h.count}")
+        return "\n".join(out) + "\n"
+
+    # --- Sinks ---
+    def add_sink(self, sink: Sink) -> None:
+        with self._lock:
+            self._sinks.append(sink)
+
+    def remove_sink(self, sink: Sink) -> None:
+        with self._lock:
+            if sink in self._sinks:
+                self._sinks.remove(sink)
+
+    @property
+    def sinks(self) -> list[Sink]:
+        with self._lock:
+            return list(self._sinks)
+
+    def export(self) -> None:
+        """Push the current state to every push-style sink."""
+        for sink in self.sinks:
+            try:
+                sink.export(self)
+            except Exception:
+                logger.exception("Metrics sink %r failed", sink)
+
+
+class Sink(Protocol):
+    def export(self, registry: Metrics) -> None: ...
+
+
+class LoggingSink:
+    """Logs one line per series at INFO on every export."""
+
+    def __init__(self, log: logging.Logger | None = None):
+        self.log = log or logger
+
+    def export(self, registry: Metrics) -> None:
+        for row in registry.summary():
+            if row["type"] == "histogram":
+                self.log.info(
+                    "%s%s count=%s sum=%.4fs p50=%.4fs p95=%.4fs",
+                    row["metric"],
+                    row["labels"],
+                    row["value"],
+                    row["sum"],
+                    row["p50"],
+                    row["p95"],
+                )
+            else:
+                self.log.info("%s%s %s", row["metric"], row["labels"], row["value"])
+
+
+class PrometheusFileSink:
+    """Writes the text format to ``path`` (node_exporter textfile style)."""
+
+    def __init__(self, path: str | os.PathLike[str]):
+        self.path = Path(path)
+
+    def export(self, registry: Metrics) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp.write_text(registry.render_prometheus())
+        # Atomic replace so scrapers never read a half-written file
+        tmp.replace(self.path)
+
+
+class PrometheusHTTPSink:
+    """Serves ``/metrics`` on a background thread; scraped live, so export is a no-op."""
+
+    def __init__(self, registry: Metrics, port: int, host: str = "127.0.0.1"):
+        # Imported here: http.server is slow to import and rarely needed
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:  # noqa: N802 (http.server naming)
+                if self.path.split("?", 1)[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = registry.render_prometheus().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: object) -> None:
+                logger.debug(format, *args)
+
+        self.server = ThreadingHTTPServer((host, port), _Handler)
+        self.port = self.server.server_address[1]
+        self._thread = threading.Thread(
+            target=self.server.serve_forever, name="metrics-http", daemon=True
+        )
+        self._thread.start()
+
+    def export(self, registry: Metrics) -> None:
+        pass
+
+    def close(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+# Process-wide registry used by fetch, formatters and the Streamlit app
+REGISTRY = Metrics()
+_configured = False
+_config_lock = threading.Lock()
+
+
+def configure_from_env(registry: Metrics = REGISTRY) -> set[str]:
+    """
+    Attach sinks listed in ``CLIMATE_COMPARE_METRICS`` (once per process).
+
+    The value is a comma-separated list of ``log``, ``file:<path>``,
+    ``http:<port>`` and ``panel`` (Streamlit sidebar debug panel, handled by
+    the app). Returns the set of sink kinds that were requested.
+    """
+    global _configured
+    spec = os.environ.get(METRICS_ENV_VAR, "")
+    kinds = {part.split(":", 1)[0].strip() for part in spec.split(",") if part}
+    with _config_lock:
+        if _configured:
+            return kinds
+        _configured = True
+        for part in (p.strip() for p in spec.split(",") if p.strip()):
+            kind, _, arg = part.partition(":")
+            if kind == "log":
+                registry.add_sink(LoggingSink())
+            elif kind == "file" and arg:
+                registry.add_sink(PrometheusFileSink(arg))
+            elif kind == "http" and arg:
+                registry.add_sink(PrometheusHTTPSink(registry, int(arg)))
+            elif kind != "panel":
+                logger.warning("Unknown metrics sink %r in %s", part, METRICS_ENV_VAR)
+    return kinds
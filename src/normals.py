@@ -0,0 +1,256 @@
+# src/normals.py
+# Day-of-year climate normals per location (1991–2020 by default), computed
+# once and stored compactly, and vectorized anomalies against them.
+from __future__ import annotations
+
+import os
+import threading
+import warnings
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+try:
+    from src.fetch import get_historical_weather, snap_point
+    from src.rollups import SOURCE_COLUMNS, daily_frame
+    from src.store import location_key
+except Exception:
+    from fetch import get_historical_weather, snap_point  # type: ignore
+    from rollups import SOURCE_COLUMNS, daily_frame  # type: ignore
+    from store import location_key  # type: ignore
+
+NORMALS_PERIOD: tuple[date, date] = (date(1991, 1, 1), date(2020, 12, 31))
+NORMAL_COLUMNS: tuple[str, ...] = SOURCE_COLUMNS
+PERCENTILES: tuple[int, ...] = (0, 5, 10, 25, 50, 75, 90, 95, 100)
+STATS: tuple[str, ...] = ("mean", *(f"p{p}" for p in PERCENTILES))
+# Each calendar day pools the days within ±7 of it across all years, which
+# smooths the baseline and gives the percentiles enough samples
+WINDOW_DAYS = 15
+# A day's baseline needs values in at least this share of its pooled samples
+MIN_COVERAGE = 0.5
+# Directory of stored normals (one .npz per location and period); optional
+NORMALS_ENV_VAR = "CLIMATE_COMPARE_NORMALS"
+
+# First day-of-year index of each month on a leap-year calendar, so 29 Feb
+# gets its own slot and later days line up across leap and common years
+_MONTH_START = np.array([0, 31, 60, 91, 121, 152, 182, 213, 244, 274, 305, 335])
+
+
+def day_of_year(days: pd.DatetimeIndex) -> np.ndarray:
+    """Leap-calendar day index (0–365) of each day; 1 March is always 60."""
+    days = pd.DatetimeIndex(days)
+    return _MONTH_START[days.month.to_numpy() - 1] + days.day.to_numpy() - 1
+
+
+def percentile_rank(
+    values: np.ndarray, quantiles: np.ndarray, percentiles: np.ndarray
+) -> np.ndarray:
+    """
+    Interpolated percentile rank of each value within its quantile row.
+
+    ``quantiles`` has one row of ascending quantiles per value, taken at
+    ``percentiles``. Values below the first or above the last quantile rank
+    0 or 100; a value equal to several tied quantiles (e.g. a dry day among
+    mostly dry days) gets the middle of their percentiles. NaN in, NaN out.
+    """
+    rows = np.arange(len(values))
+    k = quantiles.shape[1]
+    v = values[:, None]
+    ranks = []
+    # Rank from the left (strictly above) and right (at or above) of ties
+    for above in ((v > quantiles).sum(axis=1), (v >= quantiles).sum(axis=1)):
+        hi = np.clip(above, 1, k - 1)
+        lo = hi - 1
+        q_lo, q_hi = quantiles[rows, lo], quantiles[rows, hi]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            frac = np.where(q_hi > q_lo, (values - q_lo) / (q_hi - q_lo), 1.0)
+        p = percentiles[lo] + np.clip(frac, 0.0, 1.0) * (
+            percentiles[hi] - percentiles[lo]
+        )
+        ranks.append(np.where(above == 0, percentiles[0], p))
+    out = (ranks[0] + ranks[1]) / 2
+    return np.where(np.isnan(values) | np.isnan(quantiles).any(axis=1), np.nan, out)
+
+
+@dataclass(frozen=True)
+class Normals:
+    """
+    Day-of-year baseline of one location.
+
+    ``values`` is a read-only float32 array of shape
+    (len(columns), len(STATS), 366): the mean and PERCENTILES of each column
+    for every leap-calendar day (NaN where the record is too sparse).
+    """
+
+    key: str
+    period: tuple[date, date]
+    columns: tuple[str, ...]
+    values: np.ndarray
+
+    def frame(self) -> pd.DataFrame:
+        """The baseline as a 366-row frame with ``<column>_<stat>`` columns."""
+        flat = self.values.reshape(-1, self.values.shape[-1]).T
+        names = [f"{c}_{s}" for c in self.columns for s in STATS]
+        return pd.DataFrame(flat, columns=names, index=pd.RangeIndex(366, name="doy"))
+
+    def anomalies(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Compare daily rows with the baseline in one vectorized gather.
+
+        Returns a frame on the days of ``df`` (see :func:`daily_frame`) with,
+        for every baseline column: the observed value, ``<c>_normal`` (the
+        mean for that calendar day), ``<c>_anom`` (observed minus normal) and
+        ``<c>_pct`` (percentile rank among the baseline years).
+        """
+        daily = daily_frame(df)
+        doy = day_of_year(daily.index)
+        base = self.values[:, :, doy].astype(float)  # (columns, stats, days)
+        pcts = np.asarray(PERCENTILES, dtype=float)
+        out: dict[str, np.ndarray] = {}
+        for i, c in enumerate(self.columns):
+            observed = daily[c].to_numpy()
+            normal = base[i, 0]
+            out[c] = observed
+            out[f"{c}_normal"] = normal
+            out[f"{c}_anom"] = observed - normal
+            out[f"{c}_pct"] = percentile_rank(observed, base[i, 1:].T, pcts)
+        return pd.DataFrame(out, index=daily.index)
+
+
+def _pool(cube: np.ndarray) -> np.ndarray:
+    """(n, years, 366) -> (n, 366, years * WINDOW_DAYS): each day's window."""
+    # Wrap the calendar so early January pools with late December
+    half = WINDOW_DAYS // 2
+    padded = np.concatenate([cube[..., -half:], cube, cube[..., :half]], axis=-1)
+    pooled = sliding_window_view(padded, WINDOW_DAYS, axis=-1)
+    return pooled.transpose(0, 2, 1, 3).reshape(cube.shape[0], 366, -1)
+
+
+def compute_normals(
+    df: pd.DataFrame, key: str = "", period: tuple[date, date] = NORMALS_PERIOD
+) -> Normals:
+    """Day-of-year normals from the daily rows of ``df`` within ``period``."""
+    start, end = period
+    daily = daily_frame(df).loc[pd.Timestamp(start) : pd.Timestamp(end)]
+    years = end.year - start.year + 1
+    cube = np.full((len(NORMAL_COLUMNS), years, 366), np.nan)
+    if not daily.empty:
+        rows = daily.index.year.to_numpy() - start.year
+        cube[:, rows, day_of_year(daily.index)] = (
+            daily[list(NORMAL_COLUMNS)].to_numpy().T
+        )
+    # 29 Feb only exists in leap years; it must not count as a missing value
+    leap = np.array(
+        [pd.Timestamp(y, 1, 1).is_leap_year for y in range(start.year, end.year + 1)]
+    )
+    exists = np.ones((years, 366), dtype=bool)
+    exists[~leap, 59] = False
+
+    pooled = _pool(cube)  # (columns, 366, years * WINDOW_DAYS)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)  # all-NaN days
+        mean = np.nanmean(pooled, axis=-1)
+        quantiles = np.nanpercentile(pooled, PERCENTILES, axis=-1)
+    values = np.concatenate([mean[:, None], quantiles.transpose(1, 0, 2)], axis=1)
+    possible = _pool(exists[None]).sum(axis=-1)
+    sparse = (~np.isnan(pooled)).sum(axis=-1) < MIN_COVERAGE * possible
+    values[np.broadcast_to(sparse[:, None], values.shape)] = np.nan
+    values = values.astype(np.float32)
+    values.flags.writeable = False
+    return Normals(key, period, NORMAL_COLUMNS, values)
+
+
+def _normals_path(
+    directory: str | os.PathLike[str], key: str, period: tuple[date, date]
+) -> Path:
+    name = f"{key.replace(',', '_')}_{period[0]:%Y%m%d}-{period[1]:%Y%m%d}.npz"
+    return Path(directory) / name
+
+
+def save_normals(normals: Normals, directory: str | os.PathLike[str]) -> Path:
+    """Write ``normals`` under ``directory``; ~70 kB per location."""
+    path = _normals_path(directory, normals.key, normals.period)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.stem + ".tmp.npz")
+    np.savez(
+        tmp,
+        values=normals.values,
+        columns=np.array(normals.columns),
+        stats=np.array(STATS),
+    )
+    tmp.replace(path)
+    return path
+
+
+def load_normals(
+    directory: str | os.PathLike[str], key: str, period: tuple[date, date]
+) -> Normals | None:
+    """Stored normals for ``key`` and ``period``, or None if absent or stale."""
+    path = _normals_path(directory, key, period)
+    if not path.exists():
+        return None
+    with np.load(path) as data:
+        if tuple(data["stats"]) != STATS:
+            return None  # written with another set of percentiles
+        values = data["values"]
+        columns = tuple(str(c) for c in data["columns"])
+    values.flags.writeable = False
+    return Normals(key, period, columns, values)
+
+
+# Normals per (location key, period), least recently used first
+MAX_NORMALS = 64
+_normals: OrderedDict[tuple[str, tuple[date, date]], Normals] = OrderedDict()
+_normals_lock = threading.Lock()
+
+
+def get_normals(
+    lat: float, lon: float, period: tuple[date, date] = NORMALS_PERIOD
+) -> Normals | None:
+    """
+    Day-of-year normals for a location, computed once.
+
+    Looked up in memory, then in the :data:`NORMALS_ENV_VAR` directory if
+    set; otherwise the whole period is fetched through
+    :func:`get_historical_weather` (so the range store and cache apply),
+    reduced, and stored in both.
+
+    Args:
+        lat: Latitude in decimal degrees.
+        lon: Longitude in decimal degrees.
+        period: First and last day of the baseline.
+
+    Returns:
+        Normals | None: The baseline, or None if the data could not be fetched.
+    """
+    key = location_key(*snap_point(lat, lon))
+    with _normals_lock:
+        normals = _normals.get((key, period))
+        if normals is not None:
+            _normals.move_to_end((key, period))
+            return normals
+    directory = os.environ.get(NORMALS_ENV_VAR)
+    normals = load_normals(directory, key, period) if directory else None
+    if normals is None:
+        df = get_historical_weather(lat, lon, *period)
+        if df is None:
+            return None
+        normals = compute_normals(df, key, period)
+        if directory:
+            save_normals(normals, directory)
+    with _normals_lock:
+        _normals[(key, period)] = normals
+        while len(_normals) > MAX_NORMALS:
+            _normals.popitem(last=False)
+    return normals
+
+
+def clear_normals() -> None:
+    """Forget the in-memory normals (stored files are kept)."""
+    with _normals_lock:
+        _normals.clear()
@@ -0,0 +1,147 @@
+# src/paging.py
+# Server-side table windows: sort and filter the typed frame once, then cut
+# page-sized slices of only the selected columns for the browser.
+from __future__ import annotations
+
+import math
+import threading
+from collections import OrderedDict
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+try:
+    from src.cache import frame_fingerprint
+    from src.metrics import REGISTRY
+except Exception:
+    from cache import frame_fingerprint  # type: ignore
+    from metrics import REGISTRY  # type: ignore
+
+PAGE_SIZES: tuple[int, ...] = (50, 100, 250, 500, 1000)
+DEFAULT_PAGE_SIZE = 100
+
+
+@dataclass(frozen=True)
+class RangeFilter:
+    """Keep rows whose ``column`` lies in [low, high]; None leaves a side open."""
+
+    column: str
+    low: float | pd.Timestamp | None = None
+    high: float | pd.Timestamp | None = None
+
+
+@dataclass(frozen=True)
+class TablePage:
+    """One window of a table and where it sits in the filtered rows."""
+
+    frame: pd.DataFrame
+    page: int  # 0-based, clamped to the last page
+    pages: int
+    total_rows: int
+    first_row: int  # 0-based position of frame's first row among total_rows
+
+    @property
+    def last_row(self) -> int:
+        return self.first_row + len(self.frame)
+
+
+def page_count(rows: int, page_size: int) -> int:
+    """Pages needed for ``rows`` (at least one, so an empty table has a page)."""
+    return max(1, math.ceil(rows / page_size))
+
+
+def row_order(
+    df: pd.DataFrame,
+    sort_by: str | None = None,
+    ascending: bool = True,
+    filters: Sequence[RangeFilter] = (),
+) -> np.ndarray:
+    """
+    Positions of the rows of ``df`` passing ``filters``, in display order.
+
+    Sorting is stable and on the typed values (datetimes as datetimes,
+    numbers as numbers); missing values go last in either direction.
+    """
+    mask = np.ones(len(df), dtype=bool)
+    for f in filters:
+        col = df[f.column]
+        if f.low is not None:
+            mask &= (col >= f.low).fillna(False).to_numpy(dtype=bool)
+        if f.high is not None:
+            mask &= (col <= f.high).fillna(False).to_numpy(dtype=bool)
+    rows = np.flatnonzero(mask)
+    if sort_by is None:
+        return rows if ascending else rows[::-1]
+    key = df[sort_by].iloc[rows].reset_index(drop=True)
+    order = key.sort_values(ascending=ascending, kind="stable", na_position="last")
+    return rows[order.index.to_numpy()]
+
+
+# Row orders per (fingerprint, sort, filters); a few ints per row, so a
+# re-sort or filter is computed once and paging is a slice of it
+MAX_ORDERS = 32
+_orders: OrderedDict[tuple, np.ndarray] = OrderedDict()
+_orders_lock = threading.Lock()
+
+
+def cached_row_order(
+    df: pd.DataFrame,
+    sort_by: str | None = None,
+    ascending: bool = True,
+    filters: Sequence[RangeFilter] = (),
+    fingerprint: str | None = None,
+) -> np.ndarray:
+    """:func:`row_order`, memoized on the content fingerprint of ``df``."""
+    fp = fingerprint or frame_fingerprint(df)
+    key = (fp, sort_by, ascending, tuple(filters))
+    with _orders_lock:
+        order = _orders.get(key)
+        if order is not None:
+            _orders.move_to_end(key)
+    if order is not None:
+        REGISTRY.inc("table_order_cache_requests_total", result="hit")
+        return order
+    REGISTRY.inc("table_order_cache_requests_total", result="miss")
+    with REGISTRY.timer("table_sort_seconds"):
+        order = row_order(df, sort_by, ascending, filters)
+    order.flags.writeable = False
+    with _orders_lock:
+        _orders[key] = order
+        while len(_orders) > MAX_ORDERS:
+            _orders.popitem(last=False)
+    return order
+
+
+def table_page(
+    df: pd.DataFrame,
+    page: int = 0,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    columns: Sequence[str] | None = None,
+    sort_by: str | None = None,
+    ascending: bool = True,
+    filters: Sequence[RangeFilter] = (),
+    fingerprint: str | None = None,
+) -> TablePage:
+    """
+    One page of ``df`` after filtering and sorting, with only ``columns``.
+
+    The sort and filter run against the full typed frame (once per
+    fingerprint, see :func:`cached_row_order`); only the page's rows of the
+    selected columns are materialized, so what reaches the browser scales
+    with the page, not the range. ``page`` past the end gives the last page.
+    """
+    order = cached_row_order(df, sort_by, ascending, filters, fingerprint)
+    pages = page_count(len(order), page_size)
+    page = min(max(page, 0), pages - 1)
+    first = page * page_size
+    rows = order[first : first + page_size]
+    cols = list(df.columns) if columns is None else [c for c in columns if c in df]
+    frame = df.iloc[rows, df.columns.get_indexer(cols)]
+    return TablePage(frame, page, pages, len(order), first)
+
+
+def clear_orders() -> None:
+    with _orders_lock:
+        _orders.clear()
@@ -0,0 +1,246 @@
+# src/resilience.py
+# Retries, hedged requests and a circuit breaker around a blocking upstream call.
+from __future__ import annotations
+
+import random
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import TypeVar
+
+import numpy as np
+
+T = TypeVar("T")
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling upstream while the circuit breaker is open."""
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """How often, and for how long in total, one upstream call is retried."""
+
+    attempts: int = 3
+    deadline: float = 20.0  # seconds for the whole call, retries included
+    base_delay: float = 0.25
+    max_delay: float = 2.0
+    retry_on: tuple[type[BaseException], ...] = (TimeoutError, OSError)
+
+    def backoff(self, retry: int, rng: random.Random) -> float:
+        """Full-jitter delay before retry number ``retry`` (1-based)."""
+        return rng.uniform(0, min(self.max_delay, self.base_delay * 2 ** (retry - 1)))
+
+
+class LatencyTracker:
+    """Rolling window of successful call latencies."""
+
+    def __init__(self, window: int = 200):
+        self._samples: deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def quantile(self, q: float, min_samples: int = 20) -> float | None:
+        """The ``q`` latency quantile, or None until ``min_samples`` are seen."""
+        with self._lock:
+            if len(self._samples) < min_samples:
+                return None
+            return float(np.quantile(np.fromiter(self._samples, float), q))
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    After ``failure_threshold`` failures in a row the circuit opens and calls
+    are refused for ``reset_timeout`` seconds. Then a single probe call is let
+    through (half-open): success closes the circuit, failure re-opens it.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state()
+
+    def _state(self) -> str:
+        if self._opened_at is None:
+            return self.CLOSED
+        if self._clock() - self._opened_at < self.reset_timeout:
+            return self.OPEN
+        return self.HALF_OPEN
+
+    def allow(self) -> bool:
+        """True if a call may go upstream now (claims the half-open probe)."""
+        with self._lock:
+            state = self._state()
+            if state == self.HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            return state == self.CLOSED
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._probing or self._failures >= self.failure_threshold:
+                self._opened_at = self._clock()
+            self._probing = False
+
+
+class Upstream:
+    """
+    Runs a blocking upstream call with a deadline, retries, hedging and a breaker.
+
+    Each attempt runs on a worker thread so the caller can stop waiting at the
+    deadline; an abandoned attempt still runs to completion in the background.
+    With ``hedge_quantile`` set, a second identical request is started once
+    an attempt has taken longer than that quantile of recent latencies, and
+    whichever answers first wins.
+
+    Args:
+        retry: Attempts, overall deadline, backoff and retryable error types.
+        breaker: Circuit breaker shared by every call through this object.
+        hedge_quantile: Latency quantile (e.g. 0.95) that triggers a hedged
+            request; None disables hedging.
+        hedge_min_samples: Successful calls to observe before hedging.
+        max_workers: Threads available for attempts, hedges included.
+        on_event: Called with "retry", "hedge", "hedge_won" or "rejected".
+        sleep: Used for backoff waits; injectable for tests.
+        rng: Source of backoff jitter.
+    """
+
+    def __init__(
+        self,
+        retry: RetryPolicy | None = None,
+        breaker: CircuitBreaker | None = None,
+        hedge_quantile: float | None = None,
+        hedge_min_samples: int = 20,
+        max_workers: int = 16,
+        on_event: Callable[[str], None] | None = None,
+        sleep: Callable[[float], None] = time.sleep,
+        rng: random.Random | None = None,
+    ):
+        self.retry = retry or RetryPolicy()
+        self.breaker = breaker or CircuitBreaker()
+        self.hedge_quantile = hedge_quantile
+        self.hedge_min_samples = hedge_min_samples
+        self.latency = LatencyTracker()
+        self.on_event = on_event
+        self._sleep = sleep
+        self._rng = rng or random.Random()
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="upstream"
+        )
+
+    def _emit(self, event: str) -> None:
+        if self.on_event is not None:
+            self.on_event(event)
+
+    def call(self, fn: Callable[[], T]) -> T:
+        """
+        Call ``fn`` under the retry policy and circuit breaker.
+
+        Raises:
+            CircuitOpenError: The breaker refused the first attempt.
+            TimeoutError: The deadline passed before any attempt succeeded.
+            Exception: The last error raised by ``fn`` otherwise.
+        """
+        deadline = time.monotonic() + self.retry.deadline
+        attempt = 0
+        while True:
+            attempt += 1
+            if not self.breaker.allow():
+                self._emit("rejected")
+                raise CircuitOpenError("upstream circuit breaker is open")
+            try:
+                result = self._attempt(fn, deadline)
+            except Exception as err:
+                if not isinstance(err, self.retry.retry_on):
+                    # Not a transport failure (bad arguments, an empty result,
+                    # ...): upstream answered, so it must not trip the circuit
+                    # for every location, and it is not worth retrying
+                    self.breaker.record_success()
+                    raise
+                self.breaker.record_failure()
+                delay = self.retry.backoff(attempt, self._rng)
+                if (
+                    attempt >= self.retry.attempts
+                    or time.monotonic() + delay >= deadline
+                    or self.breaker.state != CircuitBreaker.CLOSED
+                ):
+                    raise
+                self._emit("retry")
+                self._sleep(delay)
+                continue
+            self.breaker.record_success()
+            return result
+
+    def _timed(self, fn: Callable[[], T]) -> T:
+        t0 = time.perf_counter()
+        result = fn()
+        self.latency.record(time.perf_counter() - t0)
+        return result
+
+    def _attempt(self, fn: Callable[[], T], deadline: float) -> T:
+        first = self._pool.submit(self._timed, fn)
+        futures: list[Future[T]] = [first]
+        hedge_after = (
+            None
+            if self.hedge_quantile is None
+            else self.latency.quantile(self.hedge_quantile, self.hedge_min_samples)
+        )
+        if hedge_after is not None and time.monotonic() + hedge_after < deadline:
+            done, _ = wait(futures, timeout=hedge_after)
+            if not done:
+                self._emit("hedge")
+                futures.append(self._pool.submit(self._timed, fn))
+
+        errors: list[BaseException] = []
+        while futures:
+            done, _ = wait(
+                futures,
+                timeout=max(deadline - time.monotonic(), 0.0),
+                return_when=FIRST_COMPLETED,
+            )
+            if not done:
+                raise TimeoutError(
+                    f"upstream call exceeded its {self.retry.deadline:g}s deadline"
+                )
+            for fut in done:
+                futures.remove(fut)
+                err = fut.exception()
+                if err is None:
+                    if fut is not first:
+                        self._emit("hedge_won")
+                    for other in futures:
+                        other.cancel()
+                    return fut.result()
+                errors.append(err)
+        raise errors[0]
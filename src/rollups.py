@@ -0,0 +1,214 @@
+# src/rollups.py
+# Materialized weekly/monthly/seasonal/annual aggregates per location, kept
+# up to date incrementally as new or revised days arrive.
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+try:
+    from src.fetch import DateLike, get_historical_weather, snap_point
+    from src.store import location_key
+except Exception:
+    from fetch import DateLike, get_historical_weather, snap_point  # type: ignore
+    from store import location_key  # type: ignore
+
+GRANULARITIES: tuple[str, ...] = ("week", "month", "season", "year")
+# Daily columns the rollups are computed from
+SOURCE_COLUMNS: tuple[str, ...] = ("tavg", "tmin", "tmax", "prcp", "tsun")
+ROLLUP_COLUMNS: tuple[str, ...] = (*SOURCE_COLUMNS, "days")
+
+# Length of one period, to find where a period starting on a given day ends
+_PERIOD_LENGTH = {
+    "week": pd.DateOffset(days=7),
+    "month": pd.DateOffset(months=1),
+    "season": pd.DateOffset(months=3),
+    "year": pd.DateOffset(years=1),
+}
+
+
+def period_start(days: pd.DatetimeIndex, granularity: str) -> pd.DatetimeIndex:
+    """
+    First day of the period each of ``days`` falls in.
+
+    Weeks start on Monday; seasons are meteorological (DJF, MAM, JJA, SON),
+    so December opens the winter that runs into the next year.
+    """
+    days = pd.DatetimeIndex(days).normalize()
+    if granularity == "week":
+        return days - pd.to_timedelta(days.dayofweek, unit="D")
+    months = days.to_numpy().astype("datetime64[M]")
+    if granularity == "month":
+        out = months
+    elif granularity == "season":
+        # Month numbers since 1970-01; shift so Dec/Jan/Feb share a quarter
+        n = months.astype(np.int64)
+        out = ((n + 1) // 3 * 3 - 1).astype("datetime64[M]")
+    elif granularity == "year":
+        out = days.to_numpy().astype("datetime64[Y]")
+    else:
+        raise ValueError(f"unknown granularity {granularity!r}")
+    return pd.DatetimeIndex(out.astype("datetime64[ns]"), name=days.name)
+
+
+def period_end(starts: pd.DatetimeIndex, granularity: str) -> pd.DatetimeIndex:
+    """Last day of the periods starting on ``starts``."""
+    return pd.DatetimeIndex(starts) + _PERIOD_LENGTH[granularity] - pd.Timedelta(days=1)
+
+
+def daily_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Float64 SOURCE_COLUMNS on a sorted, unique, day-normalised index."""
+    if "time" in df.columns:
+        index = pd.DatetimeIndex(pd.to_datetime(df["time"], errors="coerce"))
+    else:
+        index = pd.DatetimeIndex(df.index)
+    cols = {
+        c: (
+            pd.to_numeric(df[c], errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+            if c in df.columns
+            else np.full(len(df), np.nan)
+        )
+        for c in SOURCE_COLUMNS
+    }
+    out = pd.DataFrame(cols, index=index.normalize().rename("time"))
+    out = out[out.index.notna()]
+    return out[~out.index.duplicated(keep="last")].sort_index()
+
+
+def rollup(df: pd.DataFrame, granularity: str) -> pd.DataFrame:
+    """
+    Aggregate daily rows into periods of ``granularity``.
+
+    Returns one row per period, indexed by its first day (``period``): mean
+    ``tavg``, lowest ``tmin``, highest ``tmax``, total ``prcp`` and ``tsun``
+    (NaN when the period has no value at all) and the number of ``days``.
+    """
+    src = daily_frame(df)
+    groups = src.groupby(period_start(src.index, granularity).rename("period"))
+    out = pd.DataFrame(
+        {
+            "tavg": groups["tavg"].mean(),
+            "tmin": groups["tmin"].min(),
+            "tmax": groups["tmax"].max(),
+            "prcp": groups["prcp"].sum(min_count=1),
+            "tsun": groups["tsun"].sum(min_count=1),
+            "days": groups.size().astype(np.int64),
+        },
+        columns=list(ROLLUP_COLUMNS),
+    )
+    out.index = pd.DatetimeIndex(out.index, name="period")
+    return out
+
+
+class RollupTable:
+    """
+    The daily rows seen for one location plus their materialized rollups.
+
+    :meth:`update` merges a fetched frame in and recomputes only the periods
+    containing new or revised days; :meth:`get` serves a date window from
+    the materialized rows, aggregating just the partially covered periods at
+    its edges on the fly.
+    """
+
+    def __init__(self) -> None:
+        self.daily = daily_frame(pd.DataFrame(index=pd.DatetimeIndex([])))
+        self._rollups = {g: rollup(self.daily, g) for g in GRANULARITIES}
+        self._lock = threading.Lock()
+
+    def update(self, df: pd.DataFrame) -> pd.DatetimeIndex:
+        """Merge ``df`` in; return the days that were new or changed."""
+        incoming = daily_frame(df)
+        with self._lock:
+            known = self.daily.reindex(incoming.index)
+            same = ((known == incoming) | (known.isna() & incoming.isna())).all(axis=1)
+            changed = incoming.index[~same.to_numpy()]
+            if changed.empty:
+                return changed
+            self.daily = pd.concat(
+                [self.daily.drop(changed, errors="ignore"), incoming.loc[changed]]
+            ).sort_index()
+            for g in GRANULARITIES:
+                affected = period_start(changed, g).unique()
+                sub = self.daily.loc[affected.min() :]
+                sub = sub[period_start(sub.index, g).isin(affected)]
+                self._rollups[g] = pd.concat(
+                    [self._rollups[g].drop(affected, errors="ignore"), rollup(sub, g)]
+                ).sort_index()
+            return changed
+
+    def get(
+        self,
+        granularity: str,
+        start: DateLike | None = None,
+        end: DateLike | None = None,
+    ) -> pd.DataFrame:
+        """Rollup rows for periods overlapping [start, end], clipped to it."""
+        with self._lock:
+            table, daily = self._rollups[granularity], self.daily
+        lo = pd.Timestamp(start) if start is not None else pd.Timestamp.min
+        hi = pd.Timestamp(end) if end is not None else pd.Timestamp.max
+        starts = table.index
+        inner = table[(starts >= lo) & (period_end(starts, granularity) <= hi)]
+        window = daily.loc[lo:hi]
+        edges = window[~period_start(window.index, granularity).isin(inner.index)]
+        if edges.empty:
+            return inner
+        return pd.concat([inner, rollup(edges, granularity)]).sort_index()
+
+
+# Per-location tables, least recently used first
+MAX_TABLES = 32
+_tables: OrderedDict[str, RollupTable] = OrderedDict()
+_tables_lock = threading.Lock()
+
+
+def _table(key: str) -> RollupTable:
+    with _tables_lock:
+        table = _tables.get(key)
+        if table is None:
+            table = _tables[key] = RollupTable()
+            while len(_tables) > MAX_TABLES:
+                _tables.popitem(last=False)
+        _tables.move_to_end(key)
+        return table
+
+
+def get_rollup(
+    lat: float, lon: float, start: DateLike, end: DateLike, granularity: str
+) -> pd.DataFrame | None:
+    """
+    Weekly, monthly, seasonal or annual aggregates for a location and window.
+
+    The daily frame comes from :func:`get_historical_weather` (and so from
+    its cache); only periods whose days changed since the last call for this
+    location are recomputed.
+
+    Args:
+        lat: Latitude in decimal degrees.
+        lon: Longitude in decimal degrees.
+        start: Start date (date or datetime).
+        end: End date (date or datetime).
+        granularity: One of :data:`GRANULARITIES`.
+
+    Returns:
+        pd.DataFrame | None: One row per period (see :func:`rollup`), or None
+        if the daily data could not be fetched.
+    """
+    if granularity not in GRANULARITIES:
+        raise ValueError(f"unknown granularity {granularity!r}")
+    df = get_historical_weather(lat, lon, start, end)
+    if df is None:
+        return None
+    # Points snapping to one station share its table
+    table = _table(location_key(*snap_point(lat, lon)))
+    table.update(df)
+    return table.get(granularity, start, end)
+
+
+def clear_rollups() -> None:
+    """Drop every materialized table."""
+    with _tables_lock:
+        _tables.clear()
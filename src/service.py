@@ -0,0 +1,433 @@
+# src/service.py
+# Local HTTP data service: the app's cached daily, rollup and user-view frames
+# for other tools, as Arrow IPC streams (JSON/CSV fallbacks) with ETags.
+from __future__ import annotations
+
+import argparse
+import hashlib
+import importlib.util
+import io
+import json
+import logging
+import os
+import sys
+import threading
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from datetime import date
+from typing import Any
+from urllib.parse import parse_qs, urlsplit
+
+import pandas as pd
+
+try:
+    from src.cache import frame_fingerprint
+    from src.fetch import cache_ttl, get_historical_weather
+    from src.locations import parse_locations
+    from src.metrics import REGISTRY
+    from src.rollups import GRANULARITIES, SOURCE_COLUMNS, get_rollup
+    from src.store import DAILY_COLUMNS
+    from src.views import display_view, rollup_view
+    from src.warmup import record_request
+except Exception:
+    from cache import frame_fingerprint  # type: ignore
+    from fetch import cache_ttl, get_historical_weather  # type: ignore
+    from locations import parse_locations  # type: ignore
+    from metrics import REGISTRY  # type: ignore
+    from rollups import GRANULARITIES, SOURCE_COLUMNS, get_rollup  # type: ignore
+    from store import DAILY_COLUMNS  # type: ignore
+    from views import display_view, rollup_view  # type: ignore
+    from warmup import record_request  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+# Port to serve on alongside the Streamlit app; unset means no service
+SERVICE_ENV_VAR = "CLIMATE_COMPARE_SERVICE"
+ARROW_STREAM = "application/vnd.apache.arrow.stream"
+CONTENT_TYPES = {
+    "arrow": ARROW_STREAM,
+    "json": "application/json",
+    "csv": "text/csv; charset=utf-8",
+}
+VIEWS = ("raw", "user")
+# Max-age of responses whose window is final (see fetch.cache_ttl)
+FINAL_MAX_AGE = 7 * 24 * 60 * 60
+# Bump when the serialized layout changes so clients drop stale ETags
+_ETAG_VERSION = "1"
+
+
+class QueryError(ValueError):
+    """A request parameter is missing or invalid (HTTP 400)."""
+
+
+@dataclass(frozen=True)
+class Query:
+    """Parsed ``/weather`` parameters."""
+
+    lat: float
+    lon: float
+    start: date
+    end: date
+    columns: tuple[str, ...] | None = None
+    granularity: str = "day"
+    view: str = "raw"
+    fmt: str | None = None
+
+    def key(self) -> str:
+        """Canonical text of everything besides the data that shapes a response."""
+        cols = ",".join(self.columns) if self.columns is not None else "*"
+        return f"{self.granularity}|{self.view}|{cols}"
+
+
+def arrow_available() -> bool:
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def _param(params: Mapping[str, list[str]], name: str) -> str | None:
+    values = params.get(name)
+    return values[-1].strip() if values else None
+
+
+def _date(params: Mapping[str, list[str]], name: str) -> date:
+    text = _param(params, name)
+    if not text:
+        raise QueryError(f"missing {name!r}")
+    try:
+        return date.fromisoformat(text)
+    except ValueError:
+        raise QueryError(f"{name!r} must be an ISO date (YYYY-MM-DD)") from None
+
+
+def parse_query(params: Mapping[str, list[str]]) -> Query:
+    """
+    Validate ``/weather`` query parameters (as from :func:`parse_qs`).
+
+    ``location`` takes a preset, "lat,lon" or an indexed place name;
+    ``lat``/``lon`` may be given instead. ``start`` and ``end`` are ISO
+    dates. ``columns`` is a comma-separated list of Meteostat names,
+    ``granularity`` is ``day`` or one of :data:`GRANULARITIES`, ``view`` is
+    ``raw`` or ``user`` and ``format`` forces ``arrow``, ``json`` or ``csv``
+    over the Accept header.
+    """
+    text = _param(params, "location")
+    if text:
+        found = parse_locations([text])
+        if not found:
+            raise QueryError(f"unknown location {text!r}")
+        lat, lon = found[text]
+    else:
+        try:
+            lat = float(_param(params, "lat") or "")
+            lon = float(_param(params, "lon") or "")
+        except ValueError:
+            raise QueryError("give 'location' or numeric 'lat' and 'lon'") from None
+
+    start, end = _date(params, "start"), _date(params, "end")
+    if start > end:
+        raise QueryError("'start' is after 'end'")
+
+    granularity = _param(params, "granularity") or "day"
+    if granularity != "day" and granularity not in GRANULARITIES:
+        raise QueryError(f"unknown granularity {granularity!r}")
+    view = _param(params, "view") or "raw"
+    if view not in VIEWS:
+        raise QueryError(f"unknown view {view!r}")
+    fmt = _param(params, "format") or None
+    if fmt is not None and fmt not in CONTENT_TYPES:
+        raise QueryError(f"unknown format {fmt!r}")
+
+    columns: tuple[str, ...] | None = None
+    spec = _param(params, "columns")
+    if spec:
+        columns = tuple(dict.fromkeys(c.strip() for c in spec.split(",") if c.strip()))
+        known = DAILY_COLUMNS if granularity == "day" else SOURCE_COLUMNS
+        unknown = [c for c in columns if c not in known]
+        if unknown:
+            raise QueryError(f"unknown columns {unknown} for granularity {granularity}")
+    return Query(lat, lon, start, end, columns, granularity, view, fmt)
+
+
+def negotiate(fmt: str | None, accept: str | None) -> str | None:
+    """
+    The response format: ``fmt`` if given, else the first of Arrow, CSV and
+    JSON named in ``accept``, else Arrow when pyarrow is installed and JSON
+    otherwise. None when Arrow is required but unavailable (HTTP 406).
+    """
+    if fmt is None:
+        accept = accept or ""
+        fmt = next(
+            (
+                f
+                for f in ("arrow", "csv", "json")
+                if CONTENT_TYPES[f].split(";")[0] in accept
+            ),
+            "arrow" if arrow_available() else "json",
+        )
+    if fmt == "arrow" and not arrow_available():
+        return None
+    return fmt
+
+
+def source_frame(query: Query) -> pd.DataFrame | None:
+    """The cached daily rows behind ``query``; every column is kept."""
+    record_request(query.lat, query.lon, query.start, query.end)
+    return get_historical_weather(query.lat, query.lon, query.start, query.end)
+
+
+def output_columns(query: Query) -> tuple[str, ...] | None:
+    """
+    Columns the writer picks from the :func:`response_frame` (None: all).
+
+    Raw frames are served as cached and projected only while serializing;
+    user views are built from the projected columns and served whole.
+    """
+    if query.columns is None or query.view != "raw":
+        return None
+    return query.columns if query.granularity == "day" else (*query.columns, "days")
+
+
+def project(df: pd.DataFrame, columns: Sequence[str] | None) -> list[str]:
+    """The names of ``columns`` present in ``df`` (all of them for None)."""
+    if columns is None:
+        return [str(c) for c in df.columns]
+    # Absent columns (a station that never reports one) stay absent
+    return [c for c in columns if c in df.columns]
+
+
+def etag(query: Query, fingerprint: str, fmt: str) -> str:
+    """Strong ETag of a response: the data's content hash plus its shape."""
+    h = hashlib.blake2b(digest_size=12)
+    h.update(f"{_ETAG_VERSION}|{fingerprint}|{query.key()}|{fmt}".encode())
+    return f'"{h.hexdigest()}"'
+
+
+def _matches(if_none_match: str | None, tag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = {t.strip().removeprefix("W/") for t in if_none_match.split(",")}
+    return "*" in tags or tag in tags
+
+
+def response_frame(query: Query, daily: pd.DataFrame, fingerprint: str) -> pd.DataFrame:
+    """
+    The frame to serialize for ``query`` from its daily rows.
+
+    Raw daily rows are served as cached; rollups come from the materialized
+    tables of :mod:`src.rollups` and user views from the memoized builders
+    of :mod:`src.views` (the same frames the app renders). Raw frames keep
+    every column; :func:`output_columns` selects them while serializing.
+    """
+    # Views of different column subsets of one frame are memoized apart
+    key = f"{fingerprint}|{query.key()}"
+    if query.granularity == "day":
+        if query.view == "raw":
+            return daily
+        frame, _ = display_view(daily[project(daily, query.columns)].reset_index(), key)
+        return frame
+    rolled = get_rollup(query.lat, query.lon, query.start, query.end, query.granularity)
+    if rolled is None:
+        raise LookupError("rollup unavailable")
+    if query.view == "raw":
+        return rolled
+    if query.columns is not None:
+        rolled = rolled[[*query.columns, "days"]]
+    frame, _ = rollup_view(rolled, query.granularity, key)
+    return frame
+
+
+def _time_indexed(df: pd.DataFrame) -> bool:
+    return isinstance(df.index, pd.DatetimeIndex)
+
+
+def write_arrow(
+    df: pd.DataFrame, out: io.BufferedIOBase, columns: Sequence[str] | None = None
+) -> None:
+    """
+    Write ``df``'s ``columns`` (all for None) to ``out`` as one Arrow IPC
+    stream record batch.
+
+    Numeric and datetime columns are wrapped as Arrow arrays over their
+    existing NumPy buffers (only a validity bitmap is built for NaN), so the
+    cached data is not copied before it reaches the socket; nor is it for
+    the projection, which picks the columns rather than slicing the frame.
+    A datetime index becomes the first column.
+    """
+    import pyarrow as pa
+
+    arrays, names = [], []
+    if _time_indexed(df):
+        arrays.append(pa.array(df.index.to_numpy(), from_pandas=True))
+        names.append(df.index.name or "time")
+    for c in project(df, columns):
+        arrays.append(pa.array(df[c], from_pandas=True))
+        names.append(c)
+    batch = pa.RecordBatch.from_arrays(arrays, names=names)
+    with pa.ipc.new_stream(out, batch.schema) as writer:
+        writer.write_batch(batch)
+
+
+def to_bytes(df: pd.DataFrame, fmt: str, columns: Sequence[str] | None = None) -> bytes:
+    """``df``'s ``columns`` as JSON records or CSV, datetime index included."""
+    frame = df if columns is None else df[project(df, columns)]
+    frame = frame.reset_index() if _time_indexed(frame) else frame
+    if fmt == "csv":
+        return frame.to_csv(index=False).encode()
+    return frame.to_json(orient="records", date_format="iso").encode()
+
+
+def _make_handler() -> type:
+    # Imported here: http.server is slow to import and rarely needed
+    from http.server import BaseHTTPRequestHandler
+
+    class _Handler(BaseHTTPRequestHandler):
+        # HTTP/1.0: the connection closes after each response, so Arrow
+        # streams can be written as they are produced without a length
+        protocol_version = "HTTP/1.0"
+
+        def do_GET(self) -> None:  # noqa: N802 (http.server naming)
+            url = urlsplit(self.path)
+            if url.path == "/health":
+                self._send_json(200, {"status": "ok"})
+            elif url.path == "/weather":
+                with REGISTRY.timer("service_request_seconds", endpoint="weather"):
+                    self._weather(parse_qs(url.query))
+            else:
+                self._send_json(404, {"error": f"no such endpoint {url.path}"})
+
+        def _weather(self, params: dict[str, list[str]]) -> None:
+            try:
+                query = parse_query(params)
+            except QueryError as e:
+                self._send_json(400, {"error": str(e)})
+                return
+            fmt = negotiate(query.fmt, self.headers.get("Accept"))
+            if fmt is None:
+                self._send_json(406, {"error": "arrow output needs pyarrow"})
+                return
+            daily = source_frame(query)
+            if daily is None:
+                self._send_json(502, {"error": "weather data unavailable"})
+                return
+            fingerprint = frame_fingerprint(daily)
+            tag = etag(query, fingerprint, fmt)
+            ttl = cache_ttl(query.end)
+            headers = {
+                "ETag": tag,
+                "Cache-Control": f"max-age={int(FINAL_MAX_AGE if ttl is None else ttl)}",
+                "Vary": "Accept",
+            }
+            # Revalidation is settled on the cached frame's hash alone: no
+            # rollup, view or serialization work for an unchanged range
+            if _matches(self.headers.get("If-None-Match"), tag):
+                self._send(304, headers)
+                return
+            try:
+                frame = response_frame(query, daily, fingerprint)
+            except LookupError as e:
+                self._send_json(502, {"error": str(e)})
+                return
+            headers["Content-Type"] = CONTENT_TYPES[fmt]
+            columns = output_columns(query)
+            if fmt == "arrow":
+                self._send(200, headers)
+                write_arrow(frame, self.wfile, columns)
+            else:
+                self._send(200, headers, to_bytes(frame, fmt, columns))
+
+        def _send(
+            self, status: int, headers: dict[str, str], body: bytes | None = None
+        ) -> None:
+            REGISTRY.inc("service_requests_total", status=str(status))
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            if body is not None:
+                self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            if body is not None:
+                self.wfile.write(body)
+
+        def _send_json(self, status: int, payload: dict[str, Any]) -> None:
+            body = json.dumps(payload).encode()
+            self._send(status, {"Content-Type": CONTENT_TYPES["json"]}, body)
+
+        def log_message(self, format: str, *args: object) -> None:
+            logger.debug(format, *args)
+
+    return _Handler
+
+
+class DataService:
+    """
+    Serves ``/weather`` and ``/health`` on a background thread.
+
+    ``GET /weather`` takes the parameters of :func:`parse_query` and answers
+    with the cached frame in the negotiated format. Every response carries
+    an ETag derived from the cached data, so a client revalidating with
+    ``If-None-Match`` gets a bodiless 304 until the range's data changes.
+    """
+
+    def __init__(self, port: int = 0, host: str = "127.0.0.1"):
+        from http.server import ThreadingHTTPServer
+
+        self.server = ThreadingHTTPServer((host, port), _make_handler())
+        self.port = self.server.server_address[1]
+        self.url = f"http://{host}:{self.port}"
+        self._thread = threading.Thread(
+            target=self.server.serve_forever, name="data-service", daemon=True
+        )
+        self._thread.start()
+
+    def join(self, timeout: float | None = None) -> None:
+        """Block until the service stops (see :meth:`close`) or ``timeout``."""
+        self._thread.join(timeout)
+
+    def close(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+_service: DataService | None = None
+_service_lock = threading.Lock()
+
+
+def start_from_env() -> DataService | None:
+    """Start the service on the :data:`SERVICE_ENV_VAR` port (once per process)."""
+    global _service
+    spec = os.environ.get(SERVICE_ENV_VAR, "").strip()
+    if not spec:
+        return None
+    with _service_lock:
+        if _service is None:
+            try:
+                _service = DataService(int(spec))
+            except (ValueError, OSError):
+                logger.exception("Could not start the data service on %r", spec)
+                return None
+            logger.info("Data service listening on %s", _service.url)
+    return _service
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.service",
+        description="Serve cached weather frames over HTTP (Arrow, JSON, CSV).",
+    )
+    parser.add_argument("--port", type=int, default=8502)
+    parser.add_argument("--host", default="127.0.0.1")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    service = DataService(args.port, args.host)
+    print(f"Serving on {service.url}/weather", file=sys.stderr)
+    try:
+        service.join()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
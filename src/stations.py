@@ -0,0 +1,343 @@
+# src/stations.py
+# Offline weather-station index: nearest station to a coordinate and
+# place-name prefix search, built from Meteostat's station list.
+from __future__ import annotations
+
+import argparse
+import bisect
+import logging
+import math
+import os
+import re
+import sys
+import threading
+import unicodedata
+from dataclasses import dataclass
+from os import PathLike
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Path of a stations CSV (id,name,country,latitude,longitude,elevation);
+# downloaded from Meteostat on first use if the file does not exist yet
+STATIONS_ENV_VAR = "CLIMATE_COMPARE_STATIONS"
+# Coordinates farther than this from every station are not snapped (the same
+# search radius Meteostat's Point uses)
+MAX_SNAP_KM = 35.0
+EARTH_RADIUS_KM = 6371.0088
+STATION_COLUMNS: tuple[str, ...] = (
+    "id",
+    "name",
+    "country",
+    "latitude",
+    "longitude",
+    "elevation",
+)
+
+_LEAF_SIZE = 16
+
+
+@dataclass(frozen=True)
+class Station:
+    """One weather station of the index."""
+
+    id: str
+    name: str
+    country: str
+    lat: float
+    lon: float
+    elevation: float | None = None
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance between two points in kilometres."""
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp, dl = p2 - p1, math.radians(lon2 - lon1)
+    h = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(h)))
+
+
+def _unit_vectors(lat: np.ndarray, lon: np.ndarray) -> np.ndarray:
+    """Points on the unit sphere; chord length grows with haversine distance."""
+    p, lam = np.radians(lat), np.radians(lon)
+    return np.column_stack(
+        (np.cos(p) * np.cos(lam), np.cos(p) * np.sin(lam), np.sin(p))
+    )
+
+
+def _normalize(text: str) -> str:
+    """Case- and accent-insensitive search key with single spaces."""
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(c for c in text if not unicodedata.combining(c)).casefold()
+    return " ".join(re.split(r"[\s/,()-]+", text)).strip()
+
+
+class StationIndex:
+    """
+    Nearest-station lookup and name search over a fixed set of stations.
+
+    Coordinates are indexed in a KD-tree over unit vectors: the straight
+    chord between two points on the sphere is monotonic in their haversine
+    distance, so the nearest neighbour by chord is exact under haversine
+    and the wrap at ±180° longitude needs no special casing. Names are kept
+    in a sorted list of normalized keys (one per word suffix, so "heathrow"
+    finds "London Heathrow") searched with :mod:`bisect`.
+    """
+
+    def __init__(self, stations: list[Station]):
+        self.stations = stations
+        n = len(stations)
+        xyz = _unit_vectors(
+            np.array([s.lat for s in stations], dtype=float),
+            np.array([s.lon for s in stations], dtype=float),
+        )
+        order = np.arange(n)
+        # Nodes as parallel lists: [lo, hi) slice of the point order, split
+        # dimension and value, children (-1 for a leaf)
+        self._lo: list[int] = []
+        self._hi: list[int] = []
+        self._dim: list[int] = []
+        self._val: list[float] = []
+        self._left: list[int] = []
+        self._right: list[int] = []
+        if n:
+            self._build(xyz, order, 0, n)
+        # Plain-float copies in tree order: the query loop reads them one by one
+        self._order = order.tolist()
+        self._xyz = xyz[order].tolist()
+
+        self._names = [_normalize(s.name) for s in stations]
+        keys: list[tuple[str, int]] = []
+        for i, name in enumerate(self._names):
+            words = name.split(" ")
+            keys.extend((" ".join(words[w:]), i) for w in range(len(words)) if words[w])
+        keys.sort()
+        self._keys = [k for k, _ in keys]
+        self._key_station = [i for _, i in keys]
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> StationIndex:
+        """Build from a frame with :data:`STATION_COLUMNS` (``id`` may be the index)."""
+        if "id" not in df.columns:
+            df = df.reset_index().rename(columns={"index": "id"})
+        df = df.dropna(subset=["latitude", "longitude"])
+        elevation = (
+            df["elevation"]
+            if "elevation" in df.columns
+            else pd.Series(np.nan, df.index)
+        )
+        country = df["country"] if "country" in df.columns else pd.Series("", df.index)
+        stations = [
+            Station(
+                id=str(sid),
+                name=str(name) if isinstance(name, str) else "",
+                country=str(cc) if isinstance(cc, str) else "",
+                lat=float(lat),
+                lon=float(lon),
+                elevation=None if pd.isna(elev) else float(elev),
+            )
+            for sid, name, cc, lat, lon, elev in zip(
+                df["id"],
+                df["name"],
+                country,
+                df["latitude"],
+                df["longitude"],
+                elevation,
+                strict=True,
+            )
+        ]
+        return cls(stations)
+
+    def _build(self, xyz: np.ndarray, order: np.ndarray, lo: int, hi: int) -> int:
+        node = len(self._lo)
+        self._lo.append(lo)
+        self._hi.append(hi)
+        self._dim.append(0)
+        self._val.append(0.0)
+        self._left.append(-1)
+        self._right.append(-1)
+        if hi - lo <= _LEAF_SIZE:
+            return node
+        pts = xyz[order[lo:hi]]
+        dim = int(np.argmax(pts.max(axis=0) - pts.min(axis=0)))
+        mid = (hi - lo) // 2
+        part = np.argpartition(pts[:, dim], mid)
+        order[lo:hi] = order[lo:hi][part]
+        self._dim[node] = dim
+        self._val[node] = float(xyz[order[lo + mid], dim])
+        self._left[node] = self._build(xyz, order, lo, lo + mid)
+        self._right[node] = self._build(xyz, order, lo + mid, hi)
+        return node
+
+    def __len__(self) -> int:
+        return len(self.stations)
+
+    def nearest(self, lat: float, lon: float) -> tuple[Station, float] | None:
+        """The station closest to (lat, lon) and its distance in km."""
+        if not self.stations:
+            return None
+        p, lam = math.radians(lat), math.radians(lon)
+        q = (math.cos(p) * math.cos(lam), math.cos(p) * math.sin(lam), math.sin(p))
+        best, best_pos = math.inf, -1
+        xyz = self._xyz
+        stack: list[tuple[int, float]] = [(0, 0.0)]
+        while stack:
+            node, bound = stack.pop()
+            if bound >= best:
+                continue
+            left = self._left[node]
+            if left < 0:
+                for pos in range(self._lo[node], self._hi[node]):
+                    x, y, z = xyz[pos]
+                    d = (x - q[0]) ** 2 + (y - q[1]) ** 2 + (z - q[2]) ** 2
+                    if d < best:
+                        best, best_pos = d, pos
+                continue
+            diff = q[self._dim[node]] - self._val[node]
+            near, far = (left, self._right[node])
+            if diff >= 0:
+                near, far = far, near
+            # Far side first so the near side is popped (and searched) first
+            stack.append((far, max(bound, diff * diff)))
+            stack.append((near, bound))
+        chord = math.sqrt(best)
+        km = 2 * EARTH_RADIUS_KM * math.asin(min(1.0, chord / 2))
+        return self.stations[self._order[best_pos]], km
+
+    def snap(
+        self, lat: float, lon: float, max_km: float = MAX_SNAP_KM
+    ) -> Station | None:
+        """The nearest station if it lies within ``max_km``, else None."""
+        hit = self.nearest(lat, lon)
+        if hit is None or hit[1] > max_km:
+            return None
+        return hit[0]
+
+    def search(self, prefix: str, limit: int = 10) -> list[Station]:
+        """
+        Stations whose name, or a word of it, starts with ``prefix``.
+
+        Case and accents are ignored. Exact names rank first, then names
+        starting with the prefix, then word matches; shorter names first.
+        """
+        key = _normalize(prefix)
+        if not key:
+            return []
+        ranked: dict[int, tuple[int, int, str]] = {}
+        i = bisect.bisect_left(self._keys, key)
+        while i < len(self._keys) and self._keys[i].startswith(key):
+            idx = self._key_station[i]
+            name = self._names[idx]
+            rank = 0 if name == key else 1 if name.startswith(key) else 2
+            prev = ranked.get(idx)
+            if prev is None or rank < prev[0]:
+                ranked[idx] = (rank, len(name), name)
+            i += 1
+        best = sorted(ranked, key=lambda idx: (*ranked[idx], idx))
+        return [self.stations[idx] for idx in best[:limit]]
+
+    def resolve(self, text: str) -> Station | None:
+        """A station for free text: "lat,lon" (within MAX_SNAP_KM) or a name."""
+        text = (text or "").strip()
+        if "," in text:
+            try:
+                lat_str, lon_str = (p.strip() for p in text.split(",", 1))
+                return self.snap(float(lat_str), float(lon_str))
+            except ValueError:
+                pass
+        matches = self.search(text, limit=1)
+        return matches[0] if matches else None
+
+
+def download_stations() -> pd.DataFrame:
+    """Meteostat's station list, restricted to stations with daily data."""
+    from meteostat import Stations
+
+    df = Stations().fetch()
+    if "daily_start" in df.columns:
+        df = df[df["daily_start"].notna()]
+    return df.reset_index()[list(STATION_COLUMNS)]
+
+
+def load_station_index(
+    path: str | PathLike[str], refresh: bool = False
+) -> StationIndex:
+    """
+    Index the stations CSV at ``path``.
+
+    The file is downloaded from Meteostat (and written to ``path``) when it
+    does not exist yet or ``refresh`` is set; afterwards the index builds
+    offline from the file.
+    """
+    path = Path(path)
+    if refresh or not path.exists():
+        df = download_stations()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        df.to_csv(tmp, index=False)
+        tmp.replace(path)
+    else:
+        df = pd.read_csv(path, dtype={"id": str, "country": str})
+    return StationIndex.from_frame(df)
+
+
+_default: StationIndex | None = None
+_default_loaded = False
+_default_lock = threading.Lock()
+
+
+def default_index() -> StationIndex | None:
+    """
+    The process-wide index from :data:`STATIONS_ENV_VAR`, loaded on first use.
+
+    None when the variable is unset or the list cannot be loaded (logged
+    once); callers then fall back to plain coordinates.
+    """
+    global _default, _default_loaded
+    if _default_loaded:
+        return _default
+    with _default_lock:
+        if not _default_loaded:
+            path = os.environ.get(STATIONS_ENV_VAR)
+            if path:
+                try:
+                    _default = load_station_index(path)
+                except Exception:
+                    logger.exception("Could not load the station list from %s", path)
+            _default_loaded = True
+    return _default
+
+
+def set_default_index(index: StationIndex | None) -> None:
+    """Install (or remove with ``None``) the process-wide station index."""
+    global _default, _default_loaded
+    with _default_lock:
+        _default, _default_loaded = index, True
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.stations",
+        description="Build the offline station list and look up stations.",
+    )
+    parser.add_argument("path", type=Path, help="stations CSV (downloaded if missing)")
+    parser.add_argument("query", nargs="*", help="place names or 'lat,lon' pairs")
+    parser.add_argument("--refresh", action="store_true", help="download again")
+    args = parser.parse_args(argv)
+
+    index = load_station_index(args.path, refresh=args.refresh)
+    print(f"{len(index)} stations in {args.path}", file=sys.stderr)
+    for text in args.query:
+        st = index.resolve(text)
+        if st is None:
+            print(f"{text}: no station")
+        else:
+            print(f"{text}: {st.id} {st.name}, {st.country} ({st.lat}, {st.lon})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
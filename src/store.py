@@ -0,0 +1,187 @@
+# src/store.py
+# Persistent on-disk cache of daily observations, partitioned by location.
+from __future__ import annotations
+
+import sqlite3
+import threading
+from datetime import date, datetime, timedelta
+from os import PathLike
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+DateLike = date | datetime
+
+# Meteostat daily columns persisted by the store (anything else is dropped)
+DAILY_COLUMNS: tuple[str, ...] = (
+    "tavg",
+    "tmin",
+    "tmax",
+    "prcp",
+    "snow",
+    "wdir",
+    "wspd",
+    "wpgt",
+    "pres",
+    "tsun",
+)
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS daily (
+    loc TEXT NOT NULL,
+    time TEXT NOT NULL,
+    {", ".join(f"{c} REAL" for c in DAILY_COLUMNS)},
+    PRIMARY KEY (loc, time)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS coverage (
+    loc TEXT NOT NULL,
+    start TEXT NOT NULL,
+    "end" TEXT NOT NULL,
+    PRIMARY KEY (loc, start)
+) WITHOUT ROWID;
+"""
+
+Interval = tuple[date, date]
+
+
+def location_key(lat: float, lon: float) -> str:
+    """Partition key for a location (~11 m precision, stable across float noise)."""
+    return f"{lat:.4f},{lon:.4f}"
+
+
+def _as_date(d: DateLike) -> date:
+    return d.date() if isinstance(d, datetime) else d
+
+
+def merge_intervals(intervals: list[Interval]) -> list[Interval]:
+    """Merge overlapping or day-adjacent inclusive date intervals."""
+    merged: list[Interval] = []
+    for s, e in sorted(intervals):
+        if merged and s <= merged[-1][1] + timedelta(days=1):
+            if e > merged[-1][1]:
+                merged[-1] = (merged[-1][0], e)
+        else:
+            merged.append((s, e))
+    return merged
+
+
+def missing_intervals(
+    covered: list[Interval], start: date, end: date
+) -> list[Interval]:
+    """Return the sub-ranges of [start, end] not covered by ``covered``."""
+    gaps: list[Interval] = []
+    cursor = start
+    for s, e in merge_intervals(covered):
+        if e < cursor:
+            continue
+        if s > end:
+            break
+        if s > cursor:
+            gaps.append((cursor, s - timedelta(days=1)))
+        cursor = max(cursor, e + timedelta(days=1))
+        if cursor > end:
+            return gaps
+    if cursor <= end:
+        gaps.append((cursor, end))
+    return gaps
+
+
+class RangeStore:
+    """SQLite-backed store of daily rows plus the date intervals already held.
+
+    Each location is a partition (``loc`` key) with its own coverage list, so
+    callers can ask which sub-ranges are missing, fetch only those upstream,
+    and serve the full window from disk.
+    """
+
+    def __init__(self, path: str | PathLike[str]):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def covered(self, loc: str) -> list[Interval]:
+        """Intervals (inclusive) already stored for ``loc``."""
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT start, "end" FROM coverage WHERE loc = ? ORDER BY start',
+                (loc,),
+            ).fetchall()
+        return [(date.fromisoformat(s), date.fromisoformat(e)) for s, e in rows]
+
+    def missing(self, loc: str, start: DateLike, end: DateLike) -> list[Interval]:
+        """Sub-ranges of [start, end] that still need fetching for ``loc``."""
+        return missing_intervals(self.covered(loc), _as_date(start), _as_date(end))
+
+    def put(
+        self,
+        loc: str,
+        df: pd.DataFrame | None,
+        start: DateLike | None = None,
+        end: DateLike | None = None,
+    ) -> None:
+        """Upsert ``df`` rows for ``loc`` and record [start, end] as covered.
+
+        Coverage is only recorded when both bounds are given and
+        ``start <= end``; rows are stored regardless.
+        """
+        rows = self._to_rows(loc, df) if df is not None else []
+        placeholders = ", ".join("?" for _ in range(len(DAILY_COLUMNS) + 2))
+        with self._lock, self._conn:
+            if rows:
+                self._conn.executemany(
+                    f"INSERT OR REPLACE INTO daily VALUES ({placeholders})", rows
+                )
+            if start is None or end is None or _as_date(start) > _as_date(end):
+                return
+            existing = self._conn.execute(
+                'SELECT start, "end" FROM coverage WHERE loc = ?', (loc,)
+            ).fetchall()
+            intervals = [
+                (date.fromisoformat(s), date.fromisoformat(e)) for s, e in existing
+            ]
+            merged = merge_intervals([*intervals, (_as_date(start), _as_date(end))])
+            self._conn.execute("DELETE FROM coverage WHERE loc = ?", (loc,))
+            self._conn.executemany(
+                "INSERT INTO coverage VALUES (?, ?, ?)",
+                [(loc, s.isoformat(), e.isoformat()) for s, e in merged],
+            )
+
+    def get(self, loc: str, start: DateLike, end: DateLike) -> pd.DataFrame:
+        """Stored rows for ``loc`` within [start, end], indexed by ``time``."""
+        with self._lock:
+            df = pd.read_sql_query(
+                f"SELECT time, {', '.join(DAILY_COLUMNS)} FROM daily "
+                "WHERE loc = ? AND time BETWEEN ? AND ? ORDER BY time",
+                self._conn,
+                params=(loc, _as_date(start).isoformat(), _as_date(end).isoformat()),
+            )
+        df["time"] = pd.to_datetime(df["time"])
+        df = df.set_index("time")
+        # All-NULL columns come back as object; keep the Meteostat float dtype
+        return df.astype("float64")
+
+    @staticmethod
+    def _to_rows(loc: str, df: pd.DataFrame) -> list[tuple]:
+        if "time" in df.columns:
+            times = pd.to_datetime(df["time"])
+        else:
+            times = pd.to_datetime(df.index.to_series())
+        days = times.dt.strftime("%Y-%m-%d").to_numpy()
+        values = np.full((len(df), len(DAILY_COLUMNS)), np.nan)
+        for i, c in enumerate(DAILY_COLUMNS):
+            if c in df.columns:
+                values[:, i] = pd.to_numeric(df[c], errors="coerce").to_numpy(
+                    dtype=float, na_value=np.nan
+                )
+        # SQLite stores NaN as NULL only when passed as None
+        cells = values.astype(object)
+        cells[np.isnan(values)] = None
+        return [(loc, d, *row) for d, row in zip(days, cells.tolist(), strict=True)]
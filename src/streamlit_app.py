@@ -2,20 +2,32 @@
 from __future__ import annotations
 
 from datetime import date, datetime, timedelta
+from typing import TYPE_CHECKING
 
-import pandas as pd
 import streamlit as st
 
-# --- Imports ---
+# Only light modules are imported before the page header and sidebar are on
+# screen; the data stack (pandas, numpy, fetch, ...) follows below them
 try:
-    from src.fetch import get_historical_weather
+    from src.locations import (
+        DEFAULT_LOCATION,
+        DEFAULT_WINDOW_DAYS,
+        PRESETS,
+        parse_location,
+        parse_locations,
+    )
 except Exception:
-    from fetch import get_historical_weather  # type: ignore
+    from locations import (  # type: ignore
+        DEFAULT_LOCATION,
+        DEFAULT_WINDOW_DAYS,
+        PRESETS,
+        parse_location,
+        parse_locations,
+    )
 
-try:
-    from src.formatters import COLUMN_MAP, build_user_view
-except Exception:
-    from formatters import COLUMN_MAP, build_user_view  # type: ignore
+if TYPE_CHECKING:
+    from src.compare import ComparisonCube
+    from src.normals import Normals
 
 st.set_page_config(page_title="Climate Compare – Weather History", layout="wide")
 st.title("Weather History")
@@ -31,46 +43,216 @@ def ui_toggle(
     return st.checkbox(label, value=value, key=key, help=help)
 
 
-# --- Location helpers ---
-PRESETS = {
-    "Edinburgh, UK": (55.9533, -3.1883),
-    "London, UK": (51.5074, -0.1278),
-    "Glasgow, UK": (55.8642, -4.2518),
-    "Belfast, UK": (54.5973, -5.9301),
-    "Manchester, UK": (53.4808, -2.2426),
+# Sidebar granularity label -> rollup granularity (None: daily rows)
+GRANULARITY_OPTIONS: dict[str, str | None] = {
+    "Daily": None,
+    "Weekly": "week",
+    "Monthly": "month",
+    "Seasonal": "season",
+    "Annual": "year",
 }
 
 
-def parse_location(text: str) -> tuple[float, float] | None:
-    text = (text or "").strip()
-    if text in PRESETS:
-        return PRESETS[text]
-    # Support "lat,lon"
-    if "," in text:
-        try:
-            lat_str, lon_str = (p.strip() for p in text.split(",", 1))
-            return float(lat_str), float(lon_str)
-        except Exception:
-            return None
-    # Fallback to preset Edinburgh
-    return PRESETS["Edinburgh, UK"]
-
-
 # --- Sidebar ---
 with st.sidebar:
     st.header("Filters")
     # Friendly location input with preset examples
     loc_hint = "e.g., 'Edinburgh, UK' or '55.95,-3.19'"
-    location_text = st.text_input("Location", value="Edinburgh, UK", help=loc_hint)
+    location_text = st.text_input("Location", value=DEFAULT_LOCATION, help=loc_hint)
     today = date.today()
-    default_start = today - timedelta(days=9)
+    default_start = today - timedelta(days=DEFAULT_WINDOW_DAYS)
     start_date = st.date_input("Start date", value=default_start)
     end_date = st.date_input("End date", value=today)
+    granularity = st.selectbox(
+        "Granularity",
+        list(GRANULARITY_OPTIONS),
+        help="Aggregate days into weeks, months, seasons or years",
+    )
     advanced_mode = ui_toggle("Show advanced meteorological table", value=False)
+    full_resolution = ui_toggle(
+        "Full-resolution charts",
+        value=False,
+        help="Plot every day instead of a shape-preserving subset of points",
+    )
+    show_normals = ui_toggle(
+        "Compare with 1991–2020 normals",
+        value=False,
+        help="Overlay the usual temperature and rainfall for each calendar day",
+    )
+    compare_mode = ui_toggle("Compare locations", value=False)
+    if compare_mode:
+        compare_presets = st.multiselect(
+            "Locations to compare", list(PRESETS), default=list(PRESETS)[:3]
+        )
+        compare_extra = st.text_area(
+            "Extra locations", value="", help="One 'lat,lon' pair per line"
+        )
     st.markdown("---")
     st.markdown("ℹ️ Enter a city from the presets or a pair of coordinates 'lat,lon'.")
 
 
+# --- Data stack ---
+# One fallback for the whole group: modules resolve either all as ``src.*``
+# or all top-level. ImportError only, so a real error inside a module is not
+# retried as a second full import under the other name.
+with st.spinner("Loading…"):
+    import pandas as pd
+
+    try:
+        from src.cache import frame_fingerprint
+        from src.downsample import CHART_WIDTH_PX, chart_frame
+        from src.fetch import (
+            freeze_frame,
+            get_historical_weather,
+            is_cached,
+            stream_historical_weather,
+        )
+        from src.formatters import COLUMN_MAP, build_user_view
+        from src.metrics import REGISTRY, configure_from_env
+        from src.paging import DEFAULT_PAGE_SIZE, PAGE_SIZES, RangeFilter, table_page
+        from src.service import start_from_env
+        from src.views import anomaly_view, chart_view, display_view, rollup_view
+        from src.warmup import Warmer, record_request, start_warmup
+    except ImportError:
+        from cache import frame_fingerprint  # type: ignore
+        from downsample import CHART_WIDTH_PX, chart_frame  # type: ignore
+        from fetch import (  # type: ignore
+            freeze_frame,
+            get_historical_weather,
+            is_cached,
+            stream_historical_weather,
+        )
+        from formatters import COLUMN_MAP, build_user_view  # type: ignore
+        from metrics import REGISTRY, configure_from_env  # type: ignore
+        from paging import (  # type: ignore
+            DEFAULT_PAGE_SIZE,
+            PAGE_SIZES,
+            RangeFilter,
+            table_page,
+        )
+        from service import start_from_env  # type: ignore
+        from views import (  # type: ignore
+            anomaly_view,
+            chart_view,
+            display_view,
+            rollup_view,
+        )
+        from warmup import Warmer, record_request, start_warmup  # type: ignore
+
+# Attach metrics sinks from CLIMATE_COMPARE_METRICS (no-op after the first run)
+metrics_sinks = configure_from_env()
+# Serve the cached frames to other tools when CLIMATE_COMPARE_SERVICE is set
+start_from_env()
+# Keep the presets and popular windows cached (CLIMATE_COMPARE_WARMUP=0 disables)
+warmer = start_warmup()
+
+
+def streamlit_column_config(meta: dict, df: pd.DataFrame) -> dict:
+    """Turn ``build_user_view`` column metadata into ``st.column_config`` objects."""
+    cfg: dict = {}
+    for name, m in meta.items():
+        if name not in df.columns:
+            continue
+        if pd.api.types.is_datetime64_any_dtype(df[name]):
+            cfg[name] = st.column_config.DateColumn(
+                name, help=m.get("help"), format=m.get("format")
+            )
+        elif pd.api.types.is_numeric_dtype(df[name]):
+            cfg[name] = st.column_config.NumberColumn(
+                name, help=m.get("help"), format=m.get("format")
+            )
+        else:
+            cfg[name] = st.column_config.TextColumn(name, help=m.get("help"))
+    return cfg
+
+
+def render_table(
+    df: pd.DataFrame,
+    fingerprint: str,
+    key: str,
+    meta: dict | None = None,
+    sort_by: str | None = None,
+    ascending: bool = True,
+) -> None:
+    """
+    Show one page of ``df`` with only the chosen columns.
+
+    Sorting and the range filter run here against the typed frame (the row
+    order is cached per fingerprint); the browser only receives the page.
+    """
+    columns = list(df.columns)
+    numeric = [c for c in columns if pd.api.types.is_numeric_dtype(df[c])]
+    with st.expander("Columns, sorting and filters"):
+        shown = st.multiselect("Columns", columns, default=columns, key=f"{key}_cols")
+        left, mid, right = st.columns(3)
+        sort_options = [None, *columns]
+        sort_by = left.selectbox(
+            "Sort by",
+            sort_options,
+            index=sort_options.index(sort_by) if sort_by in sort_options else 0,
+            format_func=lambda c: "(original order)" if c is None else c,
+            key=f"{key}_sort",
+        )
+        ascending = mid.radio(
+            "Order",
+            [True, False],
+            index=0 if ascending else 1,
+            format_func=lambda a: "Ascending" if a else "Descending",
+            horizontal=True,
+            key=f"{key}_asc",
+        )
+        filter_col = right.selectbox(
+            "Filter by",
+            [None, *numeric],
+            format_func=lambda c: c or "—",
+            key=f"{key}_f",
+        )
+        filters: list[RangeFilter] = []
+        if filter_col is not None:
+            lo, hi = df[filter_col].min(), df[filter_col].max()
+            if pd.notna(lo) and pd.notna(hi) and lo < hi:
+                low, high = st.slider(
+                    filter_col,
+                    float(lo),
+                    float(hi),
+                    (float(lo), float(hi)),
+                    key=f"{key}_range_{filter_col}",
+                )
+                if (low, high) != (float(lo), float(hi)):
+                    filters.append(RangeFilter(filter_col, low, high))
+
+    size_col, page_col, info_col = st.columns([1, 1, 3])
+    page_size = size_col.selectbox(
+        "Rows per page",
+        PAGE_SIZES,
+        index=PAGE_SIZES.index(DEFAULT_PAGE_SIZE),
+        key=f"{key}_size",
+    )
+    # Page numbers are 1-based in the widget; clamp before it is created so a
+    # narrower filter never leaves the stored page past the end
+    page_key = f"{key}_page"
+    page = st.session_state.get(page_key, 1) - 1
+    with REGISTRY.timer("render_prep_seconds", step=f"{key}_page"):
+        window = table_page(
+            df, page, page_size, shown, sort_by, ascending, filters, fingerprint
+        )
+    st.session_state[page_key] = window.page + 1
+    page_col.number_input(
+        "Page", min_value=1, max_value=window.pages, step=1, key=page_key
+    )
+    info_col.caption(
+        f"Rows {window.first_row + 1:,}–{window.last_row:,} of {window.total_rows:,}"
+        if window.total_rows
+        else "No rows match the filter."
+    )
+    st.dataframe(
+        window.frame,
+        use_container_width=True,
+        hide_index=True,
+        column_config=streamlit_column_config(meta or {}, window.frame),
+    )
+
+
 # --- Load data ---
 def _to_datetime(d) -> datetime:
     if isinstance(d, datetime):
@@ -80,43 +262,174 @@ def _to_datetime(d) -> datetime:
     return datetime.fromisoformat(str(d))
 
 
-@st.cache_data(show_spinner=True)
-def _load_data(location_text: str, start: date, end: date) -> pd.DataFrame:
+def _with_time_column(df: pd.DataFrame) -> pd.DataFrame:
+    # Ensure 'time' column exists (Meteostat returns DatetimeIndex). Built on a
+    # shallow copy so the cached measurement buffers are shared, not copied.
+    if "time" not in df.columns and isinstance(df.index, pd.DatetimeIndex):
+        out = df.copy(deep=False)
+        out.insert(0, "time", df.index)
+        out.index = pd.RangeIndex(len(out))
+        return out
+    return df
+
+
+def _resolve_window(
+    location_text: str, start: date, end: date
+) -> tuple[float, float, datetime, datetime] | None:
     latlon = parse_location(location_text)
     if not latlon:
-        return pd.DataFrame()
+        return None
     lat, lon = latlon
     start_dt = _to_datetime(start)
     end_dt = _to_datetime(end)
     if end_dt < start_dt:
         start_dt, end_dt = end_dt, start_dt
-    df = get_historical_weather(lat, lon, start_dt, end_dt)
+    return lat, lon, start_dt, end_dt
+
+
+# Not wrapped in st.cache_*: the fetch layer's cache is the single cache shared
+# by all sessions, and a hit there shares buffers instead of copying them
+def _load_data(location_text: str, start: date, end: date) -> pd.DataFrame:
+    window = _resolve_window(location_text, start, end)
+    if not window:
+        return pd.DataFrame()
+    # Count a window once per session, not on every rerun that redraws it
+    recorded = st.session_state.setdefault("recorded_windows", set())
+    if window not in recorded:
+        recorded.add(window)
+        record_request(*window)
+    df = get_historical_weather(*window)
     if df is None:
         return pd.DataFrame()
-    # Ensure 'time' column exists (Meteostat returns DatetimeIndex)
-    if "time" not in df.columns and isinstance(df.index, pd.DatetimeIndex):
-        df = df.reset_index()
-        # Meteostat usually returns the datetime index as a column named "time" after reset_index().
-        # If it's not named "time", rename the first datetime64 column to "time".
-        if "time" not in df.columns:
-            for c in df.columns:
-                if pd.api.types.is_datetime64_any_dtype(df[c]):
-                    df = df.rename(columns={c: "time"})
-                    break
-        # After reset_index, the datetime index column is named 'time' by meteostat already,
-        # but if it's named 'time', leave as-is; else, rename to 'time' explicitly.
-        if "time" not in df.columns:
-            # detect the datetime column
-            for c in df.columns:
-                if pd.api.types.is_datetime64_any_dtype(df[c]):
-                    df = df.rename(columns={c: "time"})
-                    break
-    return df
+    return freeze_frame(_with_time_column(df))
+
+
+def _show_cache_status(
+    window: tuple[float, float, datetime, datetime], warmer: Warmer | None
+) -> None:
+    """Sidebar warm/cold indicator for the selected window and the warm-up."""
+    warm = is_cached(*window)
+    REGISTRY.inc("interactive_cache_requests_total", result="warm" if warm else "cold")
+    st.sidebar.caption(
+        "🟢 Warm cache: this window loads instantly"
+        if warm
+        else "⚪ Cold cache: this window is fetched from Meteostat"
+    )
+    status = warmer.status if warmer is not None else None
+    if status is not None and status.finished is not None:
+        failed = f", {status.failed} failed" if status.failed else ""
+        st.sidebar.caption(
+            f"Warm-up at {status.finished:%H:%M}: "
+            f"{status.warm + status.fetched} of {status.total} windows cached{failed}"
+        )
+
+
+# Ranges longer than this are streamed year by year with a live preview
+STREAM_MIN_DAYS = 366
+TEMP_COLS = [
+    "Average Temperature (°C)",
+    "Lowest Temperature (°C)",
+    "Highest Temperature (°C)",
+]
+
 
+def _stream_preview(lat: float, lon: float, start: datetime, end: datetime) -> None:
+    """Render rows and a temperature chart as yearly chunks arrive.
+
+    The streamed window is primed into the fetch cache, so the regular
+    ``_load_data`` call that follows is served without another upstream call.
+    """
+    total_days = max((end - start).days, 1)
+    preview = st.empty()
+    with preview.container():
+        progress = st.progress(0.0, text="Loading weather data…")
+        table = chart = None
+        for part in stream_historical_weather(lat, lon, start, end, cache_result=True):
+            if part.empty:
+                continue
+            part = _with_time_column(part)
+            view, _ = build_user_view(part)
+            temps = part.rename(columns=COLUMN_MAP).set_index("Date")
+            temps = temps[[c for c in TEMP_COLS if c in temps.columns]]
+            if table is None or chart is None:
+                table = st.dataframe(view, use_container_width=True, hide_index=True)
+                chart = st.line_chart(temps)
+            else:
+                table.add_rows(view)
+                chart.add_rows(temps)
+            done = (part["time"].max() - start).days / total_days
+            progress.progress(min(max(done, 0.0), 1.0), text="Loading weather data…")
+    preview.empty()
+
+
+# --- Comparison mode -------------------------------------------------------
+def _load_comparison(
+    points: tuple[tuple[str, tuple[float, float]], ...], start: date, end: date
+) -> ComparisonCube:
+    try:
+        from src.compare import compare_locations
+    except ImportError:
+        from compare import compare_locations  # type: ignore
+
+    start_dt, end_dt = sorted((_to_datetime(start), _to_datetime(end)))
+    return compare_locations(dict(points), start_dt, end_dt)
+
+
+def _render_comparison(labels: list[str], start: date, end: date) -> None:
+    # Imported here: only comparison-mode reruns need it
+    try:
+        from src.compare import DEFAULT_VARIABLES
+    except ImportError:
+        from compare import DEFAULT_VARIABLES  # type: ignore
+
+    points = parse_locations(labels)
+    if len(points) < 2:
+        st.info("Pick at least two locations to compare.")
+        return
+    with st.spinner("Loading weather data…"):
+        cube = _load_comparison(tuple(points.items()), start, end)
+    for name, err in cube.errors.items():
+        st.warning(f"No data for {name}: {err}")
+
+    st.subheader("Comparison")
+    variable = st.selectbox(
+        "Variable", list(DEFAULT_VARIABLES), format_func=lambda v: COLUMN_MAP[v]
+    )
+    label = COLUMN_MAP[variable]
+    stats = cube.summary().xs(variable, level="variable")
+    st.dataframe(
+        stats.rename(columns=str.title), use_container_width=True, hide_index=False
+    )
+    st.line_chart(cube.wide(variable))
+
+    baseline = st.selectbox("Difference from", cube.locations)
+    st.caption(f"{label}: each location minus {baseline}")
+    st.line_chart(cube.differences(variable, baseline))
+
+    st.caption(f"Days each location had the highest {label.lower()}")
+    st.bar_chart((cube.ranks(variable) == 1).sum().rename("Days ranked first"))
+
+
+if compare_mode:
+    _render_comparison(
+        [*compare_presets, *compare_extra.splitlines()], start_date, end_date
+    )
+    st.stop()
+
+window = _resolve_window(location_text, start_date, end_date)
+if window:
+    _show_cache_status(window, warmer)
+if window and (window[3] - window[2]).days > STREAM_MIN_DAYS and not is_cached(*window):
+    try:
+        _stream_preview(*window)
+    except Exception as e:
+        st.error(f"Failed to load data: {e}")
+        st.stop()
 
 with st.spinner("Loading weather data…"):
     try:
-        raw_df = _load_data(location_text, start_date, end_date)
+        with REGISTRY.timer("load_data_seconds"):
+            raw_df = _load_data(location_text, start_date, end_date)
     except Exception as e:
         st.error(f"Failed to load data: {e}")
         st.stop()
@@ -125,83 +438,149 @@ if raw_df.empty:
     st.info("No data returned for the selected period.")
     st.stop()
 
-# Build the user-friendly table (this may contain '—' strings)
-user_df, col_cfg_meta = build_user_view(raw_df)
-
-# Prepare a *display* copy with consistent string types to avoid Arrow warnings
-display_df = user_df.copy()
-# For any column that still has mixed types (float + string), cast everything to string
-for col in display_df.columns:
-    if display_df[col].dtype == "O":  # object, likely mixed
-        display_df[col] = display_df[col].apply(
-            lambda v: (
-                "—"
-                if (
-                    v is None
-                    or (isinstance(v, float) and pd.isna(v))
-                    or (isinstance(v, str) and v.strip() == "")
-                )
-                else str(v)
-            )
-        )
+# Content fingerprint of the loaded data: derived tables and charts are
+# memoized under it, so reruns that only change view widgets reuse them
+with REGISTRY.timer("render_prep_seconds", step="fingerprint"):
+    raw_fp = frame_fingerprint(raw_df)
 
-# Sort newest first by Date for display
-if "Date" in display_df.columns:
-    tmp = pd.to_datetime(display_df["Date"], errors="coerce")
-    display_df = display_df.loc[tmp.sort_values(ascending=False).index]
-
-# Render table
-st.subheader("Daily summary")
-st.dataframe(
-    display_df,
-    use_container_width=True,
-    hide_index=True,
-)
-
-# --- Graph view (numeric only) --------------------------------------------
-st.subheader("Graphs")
-# Build a numeric chart DataFrame directly from raw_df
-chart_df = raw_df.copy()
-# Ensure time column
-if "time" not in chart_df.columns and isinstance(chart_df.index, pd.DatetimeIndex):
-    chart_df = chart_df.reset_index()
-# Rename for nice axis labels but keep numerics intact
-chart_df = chart_df.rename(columns=COLUMN_MAP)
-if "Date" not in chart_df.columns and "time" in chart_df.columns:
-    chart_df["Date"] = pd.to_datetime(chart_df["time"], errors="coerce")
-    chart_df = chart_df.drop(columns=["time"])
-
-if "Date" in chart_df.columns:
-    chart_df = chart_df.sort_values("Date")
-
-    # Temperature lines
-    temp_cols = [
-        c
-        for c in [
-            "Average Temperature (°C)",
-            "Lowest Temperature (°C)",
-            "Highest Temperature (°C)",
-        ]
-        if c in chart_df.columns
-    ]
-    if temp_cols:
-        st.line_chart(chart_df.set_index("Date")[temp_cols])
 
+RAIN_TOTAL_COLS = ["Cumulative Rainfall (mm)", "Normal Cumulative Rainfall (mm)"]
+
+
+def _load_normals(lat: float, lon: float) -> Normals | None:
+    # Imported here: only needed while the normals overlay is switched on
+    try:
+        from src.normals import get_normals
+    except ImportError:
+        from normals import get_normals  # type: ignore
+
+    with st.spinner("Computing 1991–2020 normals…"):
+        return get_normals(lat, lon)
+
+
+def _caption_anomalies(anomaly_df: pd.DataFrame) -> None:
+    """One-line summary of the window against the normals."""
+    parts = []
+    anom = anomaly_df["Temperature Anomaly (°C)"].mean()
+    if pd.notna(anom):
+        parts.append(f"average temperature {anom:+.1f} °C")
+    rain, normal = anomaly_df[RAIN_TOTAL_COLS].iloc[-1]
+    if normal > 0:
+        parts.append(f"rainfall {rain / normal:.0%} of normal")
+    if parts:
+        st.caption("Compared with 1991–2020: " + ", ".join(parts))
+
+
+def _render_rollups(
+    window: tuple[float, float, datetime, datetime], label: str, rollup_key: str
+) -> None:
+    """Aggregated table and charts, served from the materialized rollups."""
+    try:
+        from src.rollups import get_rollup
+    except ImportError:
+        from rollups import get_rollup  # type: ignore
+
+    with REGISTRY.timer("render_prep_seconds", step="rollup"):
+        rolled = get_rollup(*window, rollup_key)
+    if rolled is None or rolled.empty:
+        st.info("No data returned for the selected period.")
+        return
+    table, meta = rollup_view(rolled, rollup_key)
+    st.subheader(f"{label} summary")
+    st.dataframe(
+        table,
+        use_container_width=True,
+        hide_index=True,
+        column_config=streamlit_column_config(meta, table),
+    )
+    st.subheader("Graphs")
+    by_period = table.set_index("Period").sort_index()
+    temp_cols = [c for c in TEMP_COLS if c in by_period.columns]
+    if temp_cols:
+        st.line_chart(by_period[temp_cols])
     with st.expander("More charts"):
-        # Rainfall
-        if "Rainfall (mm)" in chart_df.columns:
-            st.bar_chart(chart_df.set_index("Date")[["Rainfall (mm)"]])
-        # Sunshine
-        if "Sunshine Duration (hours)" in chart_df.columns:
-            st.bar_chart(chart_df.set_index("Date")[["Sunshine Duration (hours)"]])
-        # Air Pressure
-        if "Air Pressure (hPa)" in chart_df.columns:
-            st.line_chart(chart_df.set_index("Date")[["Air Pressure (hPa)"]])
+        for col in ("Total Rainfall (mm)", "Total Sunshine (hours)"):
+            if col in by_period.columns:
+                st.bar_chart(by_period[[col]])
+
+
+rollup_key = GRANULARITY_OPTIONS[granularity]
+if window and rollup_key is not None:
+    _render_rollups(window, granularity, rollup_key)
+else:
+    # Build the typed display table (datetime Date, numeric columns with NA), sorted
+    # newest first; formatting and placeholders are left to the column config
+    with REGISTRY.timer("render_prep_seconds", step="display"):
+        display_df, col_cfg_meta = display_view(raw_df, raw_fp)
+
+    # Render one page of it, newest first unless re-sorted
+    st.subheader("Daily summary")
+    render_table(
+        display_df,
+        f"{raw_fp}/display",
+        "daily",
+        col_cfg_meta,
+        sort_by="Date",
+        ascending=False,
+    )
+
+    # --- Graph view (numeric only) ----------------------------------------
+    st.subheader("Graphs")
+    # Build a numeric chart DataFrame directly from raw_df, sorted by Date
+    with REGISTRY.timer("render_prep_seconds", step="chart"):
+        chart_df = chart_view(raw_df, raw_fp)
+    # Long series are downsampled to about the chart width (LTTB for lines,
+    # min/max for bars); results are cached per raw_df fingerprint
+    max_points = None if full_resolution else CHART_WIDTH_PX
+
+    def _series(columns: list[str], kind: str) -> pd.DataFrame:
+        return chart_frame(chart_df, "Date", columns, kind, max_points, raw_fp)
+
+    # Anomalies against the day-of-year normals, computed once per location
+    anomaly_df, anomaly_fp = None, raw_fp
+    if show_normals and window:
+        normals = _load_normals(window[0], window[1])
+        if normals is None:
+            st.warning("Climate normals are unavailable for this location.")
+        else:
+            with REGISTRY.timer("render_prep_seconds", step="anomaly"):
+                anomaly_df = anomaly_view(raw_df, normals, raw_fp)
+            anomaly_fp = f"{raw_fp}/{normals.key}"
+            _caption_anomalies(anomaly_df)
+
+    def _anomaly_series(columns: list[str], kind: str) -> pd.DataFrame:
+        return chart_frame(anomaly_df, "Date", columns, kind, max_points, anomaly_fp)
+
+    if "Date" in chart_df.columns:
+        # Temperature lines
+        temp_cols = [c for c in TEMP_COLS if c in chart_df.columns]
+        if temp_cols:
+            temps = _series(temp_cols, "line")
+            if anomaly_df is not None:
+                # The normal is smooth, so sampling it on the kept days is exact
+                normal = anomaly_df.set_index("Date")["Normal Average Temperature (°C)"]
+                temps = temps.join(normal)
+            st.line_chart(temps)
+            if anomaly_df is not None:
+                st.bar_chart(_anomaly_series(["Temperature Anomaly (°C)"], "bar"))
+
+        with st.expander("More charts"):
+            # Rainfall
+            if "Rainfall (mm)" in chart_df.columns:
+                st.bar_chart(_series(["Rainfall (mm)"], "bar"))
+                if anomaly_df is not None:
+                    st.line_chart(_anomaly_series(RAIN_TOTAL_COLS, "line"))
+            # Sunshine
+            if "Sunshine Duration (hours)" in chart_df.columns:
+                st.bar_chart(_series(["Sunshine Duration (hours)"], "bar"))
+            # Air Pressure
+            if "Air Pressure (hPa)" in chart_df.columns:
+                st.line_chart(_series(["Air Pressure (hPa)"], "line"))
 
 # --- Advanced table --------------------------------------------------------
 if advanced_mode:
     st.subheader("Advanced table (technical columns)")
-    st.dataframe(raw_df.reset_index(), use_container_width=True, hide_index=True)
+    render_table(raw_df, f"{raw_fp}/raw", "advanced")
     with st.expander("Column legend"):
         st.markdown(
             "- **time** — timestamp of observation\n"
@@ -214,3 +593,9 @@ if advanced_mode:
             "- **pres** — air pressure (hPa)\n"
             "- **tsun** — sunshine duration (hours)\n"
         )
+
+# --- Instrumentation -------------------------------------------------------
+REGISTRY.export()
+if "panel" in metrics_sinks:
+    with st.sidebar.expander("Performance metrics"):
+        st.dataframe(pd.DataFrame(REGISTRY.summary()), hide_index=True)
@@ -0,0 +1,118 @@
+# src/views.py
+# Memoized display/chart/rollup frames, reused across Streamlit reruns.
+from __future__ import annotations
+
+import threading
+from collections.abc import Callable, Hashable
+from typing import TYPE_CHECKING
+
+import pandas as pd
+
+try:
+    from src.cache import CacheKey, FrameCache, frame_fingerprint
+    from src.fetch import freeze_frame
+    from src.formatters import (
+        build_anomaly_chart_frame,
+        build_chart_frame,
+        build_display_frame,
+        build_rollup_frame,
+    )
+    from src.metrics import REGISTRY
+except Exception:
+    from cache import CacheKey, FrameCache, frame_fingerprint  # type: ignore
+    from fetch import freeze_frame  # type: ignore
+    from formatters import (  # type: ignore
+        build_anomaly_chart_frame,
+        build_chart_frame,
+        build_display_frame,
+        build_rollup_frame,
+    )
+    from metrics import REGISTRY  # type: ignore
+
+if TYPE_CHECKING:
+    from src.normals import Normals
+
+# Column-config metadata of the cached frames, dropped together with them
+_meta: dict[CacheKey, dict] = {}
+_meta_lock = threading.Lock()
+
+
+def _forget_meta(key: CacheKey, _reason: str) -> None:
+    with _meta_lock:
+        _meta.pop(key, None)
+
+
+# Few entries: one rerun needs a display and a chart frame per loaded window
+_view_cache = FrameCache(maxsize=16, on_evict=_forget_meta)
+
+
+def _memo(
+    view: str,
+    fingerprint: str,
+    build: Callable[[], tuple[pd.DataFrame, dict]],
+    **options: Hashable,
+) -> tuple[pd.DataFrame, dict]:
+    """Return ``build()``'s (frame, meta), reusing it for the same content."""
+    key: CacheKey = (view, fingerprint, *sorted(options.items()))
+    cached = _view_cache.get(key)
+    with _meta_lock:
+        meta = _meta.get(key)
+    if cached is not None and meta is not None:
+        REGISTRY.inc("view_cache_requests_total", view=view, result="hit")
+        return cached, meta
+    REGISTRY.inc("view_cache_requests_total", view=view, result="miss")
+    frame, meta = build()
+    frame = freeze_frame(frame)
+    with _meta_lock:
+        _meta[key] = meta
+    _view_cache.put(key, frame)
+    return frame, meta
+
+
+def display_view(
+    raw_df: pd.DataFrame, fingerprint: str | None = None
+) -> tuple[pd.DataFrame, dict]:
+    """Memoized :func:`build_display_frame` for ``raw_df``."""
+    fp = fingerprint or frame_fingerprint(raw_df)
+    return _memo("display", fp, lambda: build_display_frame(raw_df))
+
+
+def chart_view(raw_df: pd.DataFrame, fingerprint: str | None = None) -> pd.DataFrame:
+    """Memoized :func:`build_chart_frame` for ``raw_df``."""
+    fp = fingerprint or frame_fingerprint(raw_df)
+    frame, _ = _memo("chart", fp, lambda: (build_chart_frame(raw_df), {}))
+    return frame
+
+
+def rollup_view(
+    rollup_df: pd.DataFrame, granularity: str, fingerprint: str | None = None
+) -> tuple[pd.DataFrame, dict]:
+    """Memoized :func:`build_rollup_frame` for ``rollup_df``."""
+    fp = fingerprint or frame_fingerprint(rollup_df)
+    return _memo(
+        "rollup",
+        fp,
+        lambda: build_rollup_frame(rollup_df, granularity),
+        granularity=granularity,
+    )
+
+
+def anomaly_view(
+    raw_df: pd.DataFrame, normals: Normals, fingerprint: str | None = None
+) -> pd.DataFrame:
+    """Memoized :func:`build_anomaly_chart_frame` of ``raw_df`` vs ``normals``."""
+    fp = fingerprint or frame_fingerprint(raw_df)
+    frame, _ = _memo(
+        "anomaly",
+        fp,
+        lambda: (build_anomaly_chart_frame(normals.anomalies(raw_df)), {}),
+        baseline=normals.key,
+        period=normals.period,
+    )
+    return frame
+
+
+def clear_views() -> None:
+    _view_cache.clear()
+    with _meta_lock:
+        _meta.clear()
@@ -0,0 +1,361 @@
+# src/warmup.py
+# Background cache warm-up: keeps the presets and the most requested windows
+# in the fetch cache so interactive requests rarely wait on Meteostat.
+from __future__ import annotations
+
+import json
+import logging
+import os
+import random
+import threading
+import time
+from collections import Counter, deque
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from os import PathLike
+from pathlib import Path
+
+try:
+    from src.fetch import (
+        RECENT_DAYS,
+        RECENT_TTL_SECONDS,
+        DateLike,
+        warm_historical_weather,
+    )
+    from src.locations import DEFAULT_LOCATION, DEFAULT_WINDOW_DAYS, PRESETS
+    from src.metrics import REGISTRY
+except Exception:
+    from fetch import (  # type: ignore
+        RECENT_DAYS,
+        RECENT_TTL_SECONDS,
+        DateLike,
+        warm_historical_weather,
+    )
+    from locations import (  # type: ignore
+        DEFAULT_LOCATION,
+        DEFAULT_WINDOW_DAYS,
+        PRESETS,
+    )
+    from metrics import REGISTRY  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+# JSON-lines file of served (lat, lon, start, end) requests, kept across
+# restarts so a fresh deploy knows what to warm; in memory only if unset
+REQUEST_LOG_ENV_VAR = "CLIMATE_COMPARE_REQUEST_LOG"
+# "0"/"off" disables the app's warm-up; a number sets the interval in seconds
+WARMUP_ENV_VAR = "CLIMATE_COMPARE_WARMUP"
+# Recent windows expire after RECENT_TTL_SECONDS; warming several times per
+# TTL refreshes them ahead of expiry
+WARMUP_INTERVAL_SECONDS = RECENT_TTL_SECONDS / 3
+WARMUP_CONCURRENCY = 4
+# Each query starts after a random delay of up to this many seconds, and each
+# interval is stretched or shrunk by up to this fraction, so warm-ups of
+# several processes (and their fetches) do not hit Meteostat in lockstep
+WARMUP_JITTER_SECONDS = 5.0
+INTERVAL_JITTER = 0.1
+# Popular queries warmed per run, besides the presets
+MAX_POPULAR = 20
+_MAX_LOG_ENTRIES = 10_000
+
+
+@dataclass(frozen=True)
+class WarmQuery:
+    """A location and window to keep cached, keyed as the app requests it."""
+
+    lat: float
+    lon: float
+    start: datetime
+    end: datetime
+
+
+def _midnight(d: DateLike) -> datetime:
+    return d if isinstance(d, datetime) else datetime(d.year, d.month, d.day)
+
+
+def preset_queries(today: date | None = None) -> list[WarmQuery]:
+    """The app's default window for every preset, the default location first."""
+    today = today or date.today()
+    start = _midnight(today - timedelta(days=DEFAULT_WINDOW_DAYS))
+    names = [DEFAULT_LOCATION, *(n for n in PRESETS if n != DEFAULT_LOCATION)]
+    return [WarmQuery(*PRESETS[n], start, _midnight(today)) for n in names]
+
+
+class RequestLog:
+    """
+    Counts of served requests, optionally appended to a JSON-lines file.
+
+    Each entry is the requested location and window plus the day it was
+    served. With a ``path`` the last entries are read back at start, so the
+    popular windows survive a restart; once the file holds twice
+    ``max_entries`` lines it is rewritten with just the last ``max_entries``.
+    """
+
+    def __init__(
+        self,
+        path: str | PathLike[str] | None = None,
+        max_entries: int = _MAX_LOG_ENTRIES,
+    ):
+        self.path = Path(path) if path else None
+        self._lock = threading.Lock()
+        self._entries: deque[tuple[float, float, date, date, date]] = deque(
+            maxlen=max_entries
+        )
+        self._max_entries = max_entries
+        self._lines = 0  # lines in the file, kept entries or not
+        if self.path is not None and self.path.exists():
+            with self.path.open() as fh:
+                for line in fh:
+                    self._lines += 1
+                    try:
+                        e = json.loads(line)
+                        self._entries.append(
+                            (
+                                float(e["lat"]),
+                                float(e["lon"]),
+                                date.fromisoformat(e["start"]),
+                                date.fromisoformat(e["end"]),
+                                date.fromisoformat(e["day"]),
+                            )
+                        )
+                    except (ValueError, KeyError, TypeError):
+                        continue  # a torn or foreign line
+
+    def record(
+        self,
+        lat: float,
+        lon: float,
+        start: DateLike,
+        end: DateLike,
+        today: date | None = None,
+    ) -> None:
+        day = today or date.today()
+        entry = (lat, lon, _midnight(start).date(), _midnight(end).date(), day)
+        with self._lock:
+            self._entries.append(entry)
+            if self.path is None:
+                return
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                if self._lines >= 2 * self._max_entries:
+                    self._compact()
+                else:
+                    with self.path.open("a") as fh:
+                        fh.write(_log_line(entry))
+                    self._lines += 1
+            except OSError:
+                logger.warning("Could not append to request log %s", self.path)
+
+    def _compact(self) -> None:
+        """Rewrite the file with only the kept entries (lock held)."""
+        assert self.path is not None
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        with tmp.open("w") as fh:
+            fh.writelines(_log_line(e) for e in self._entries)
+        tmp.replace(self.path)
+        self._lines = len(self._entries)
+
+    def popular(
+        self, limit: int = MAX_POPULAR, today: date | None = None
+    ) -> list[WarmQuery]:
+        """
+        The ``limit`` most requested windows, most requested first.
+
+        A window ending within RECENT_DAYS of the day it was requested is a
+        rolling one ("the last 10 days"): it is counted and replayed relative
+        to ``today``. Older windows are fixed and replayed as they were.
+        """
+        today = today or date.today()
+        counts: Counter[WarmQuery] = Counter()
+        with self._lock:
+            entries = list(self._entries)
+        for lat, lon, start, end, day in entries:
+            if (day - end).days <= RECENT_DAYS:
+                shift = today - day
+                start, end = start + shift, end + shift
+            counts[WarmQuery(lat, lon, _midnight(start), _midnight(end))] += 1
+        return [q for q, _ in counts.most_common(limit)]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+def _log_line(entry: tuple[float, float, date, date, date]) -> str:
+    lat, lon, start, end, day = entry
+    record = {
+        "lat": lat,
+        "lon": lon,
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "day": day.isoformat(),
+    }
+    return json.dumps(record) + "\n"
+
+
+_log: RequestLog | None = None
+_log_lock = threading.Lock()
+
+
+def request_log() -> RequestLog:
+    """The process-wide log, backed by :data:`REQUEST_LOG_ENV_VAR` if set."""
+    global _log
+    with _log_lock:
+        if _log is None:
+            _log = RequestLog(os.environ.get(REQUEST_LOG_ENV_VAR) or None)
+        return _log
+
+
+def record_request(lat: float, lon: float, start: DateLike, end: DateLike) -> None:
+    """Count one interactive request towards the popular windows."""
+    request_log().record(lat, lon, start, end)
+
+
+@dataclass
+class WarmStatus:
+    """Outcome of the latest warm-up run."""
+
+    warm: int = 0  # already cached and fresh
+    fetched: int = 0  # fetched (or refreshed ahead of expiry)
+    failed: int = 0
+    finished: datetime | None = None
+    seconds: float = 0.0
+
+    @property
+    def total(self) -> int:
+        return self.warm + self.fetched + self.failed
+
+
+class Warmer:
+    """
+    Keeps a set of windows in the fetch cache on a background thread.
+
+    Every ``interval`` seconds (± INTERVAL_JITTER) it collects the queries
+    (presets, then the request log's popular windows), and warms them with at
+    most ``concurrency`` upstream fetches at a time, each after a random
+    delay of up to ``jitter`` seconds. Windows due to expire before the next
+    run are refreshed ahead of time, so they never go cold between runs.
+    """
+
+    def __init__(
+        self,
+        queries: Callable[[], Iterable[WarmQuery]] | None = None,
+        interval: float = WARMUP_INTERVAL_SECONDS,
+        concurrency: int = WARMUP_CONCURRENCY,
+        jitter: float = WARMUP_JITTER_SECONDS,
+        rng: random.Random | None = None,
+    ):
+        self.queries = queries or default_queries
+        self.interval = interval
+        self.concurrency = max(1, concurrency)
+        self.jitter = jitter
+        self.status = WarmStatus()
+        self._rng = rng or random.Random()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def _warm(self, q: WarmQuery, delay: float, refresh_within: float) -> str:
+        if delay > 0 and self._stop.wait(delay):
+            return "skipped"
+        try:
+            fetched = warm_historical_weather(
+                q.lat, q.lon, q.start, q.end, refresh_within=refresh_within
+            )
+        except Exception as e:
+            logger.warning("Warm-up of %s failed: %r", q, e)
+            return "failed"
+        return "fetched" if fetched else "warm"
+
+    def run_once(self) -> WarmStatus:
+        """Warm every query now; returns (and keeps) the run's status."""
+        t0 = time.perf_counter()
+        todo = list(dict.fromkeys(self.queries()))
+        # Refresh anything that would expire before the next run could
+        refresh_within = self.interval * (1 + INTERVAL_JITTER) + self.jitter
+        delays = [self._rng.uniform(0, self.jitter) for _ in todo]
+        with ThreadPoolExecutor(
+            max_workers=self.concurrency, thread_name_prefix="cache-warmup"
+        ) as pool:
+            results = list(
+                pool.map(self._warm, todo, delays, [refresh_within] * len(todo))
+            )
+        counts = Counter(results)
+        for result, n in counts.items():
+            REGISTRY.inc("warmup_queries_total", n, result=result)
+        status = WarmStatus(
+            warm=counts["warm"],
+            fetched=counts["fetched"],
+            failed=counts["failed"],
+            finished=datetime.now(),
+            seconds=time.perf_counter() - t0,
+        )
+        REGISTRY.observe("warmup_run_seconds", status.seconds)
+        self.status = status
+        return status
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception:
+                logger.exception("Cache warm-up run failed")
+            wait = self.interval * self._rng.uniform(
+                1 - INTERVAL_JITTER, 1 + INTERVAL_JITTER
+            )
+            self._stop.wait(wait)
+
+    def start(self) -> Warmer:
+        """Run now and then every interval on a daemon thread."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._loop, name="cache-warmup", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: float | None = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+
+def default_queries() -> list[WarmQuery]:
+    """Presets first, then the most requested windows of the request log."""
+    today = date.today()
+    return [*preset_queries(today), *request_log().popular(MAX_POPULAR, today)]
+
+
+_warmer: Warmer | None = None
+_warmer_lock = threading.Lock()
+
+
+def start_warmup() -> Warmer | None:
+    """
+    Start the process-wide warmer (once), unless :data:`WARMUP_ENV_VAR` is
+    "0" or "off"; a positive number there overrides the interval (anything
+    else is ignored with a warning).
+    """
+    global _warmer
+    spec = os.environ.get(WARMUP_ENV_VAR, "").strip().lower()
+    if spec in ("0", "off", "false", "no"):
+        return None
+    with _warmer_lock:
+        if _warmer is None:
+            try:
+                interval = float(spec) if spec else WARMUP_INTERVAL_SECONDS
+            except ValueError:
+                interval = float("nan")
+            # Not positive (or NaN) would make the loop spin
+            if not interval > 0:
+                logger.warning(
+                    "Ignoring %s=%r; using %gs",
+                    WARMUP_ENV_VAR,
+                    spec,
+                    WARMUP_INTERVAL_SECONDS,
+                )
+                interval = WARMUP_INTERVAL_SECONDS
+            _warmer = Warmer(interval=interval).start()
+        return _warmer
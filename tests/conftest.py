@@ -0,0 +1,14 @@
+# tests/conftest.py
+import pytest
+
+import src.fetch as fetch
+from src.resilience import RetryPolicy, Upstream
+
+
+@pytest.fixture(autouse=True)
+def _fresh_upstream():
+    """Give each test its own circuit breaker and no retries unless it asks."""
+    saved = fetch._upstream
+    fetch.set_upstream(Upstream(retry=RetryPolicy(attempts=1)))
+    yield
+    fetch.set_upstream(saved)
@@ -0,0 +1,59 @@
+# tests/test_benchmarks.py
+import json
+from datetime import datetime
+
+import pytest
+
+from benchmarks import importtime, run
+from benchmarks.fake_meteostat import synthetic_daily
+
+
+def test_synthetic_daily_is_consistent_across_overlapping_windows():
+    wide = synthetic_daily(1.0, 2.0, datetime(2020, 3, 1), datetime(2021, 2, 1))
+    narrow = synthetic_daily(1.0, 2.0, datetime(2020, 6, 1), datetime(2020, 7, 1))
+    assert len(wide) == 338
+    assert wide.index.name == "time"
+    assert wide.loc[narrow.index].equals(narrow)
+
+
+@pytest.mark.performance
+def test_benchmark_runner_writes_comparable_json(tmp_path, capsys):
+    out = tmp_path / "bench.json"
+    args = ["--quick", "--repeat", "1", "--latency", "0", "--out", str(out)]
+    assert run.main(args) == 0
+    report = json.loads(out.read_text())
+    names = {r["name"] for r in report["results"]}
+    assert {"fetch_cold", "fetch_warm", "fetch_overlap", "build_user_view"} <= names
+    assert {"display_frame", "chart_frame"} <= names
+
+    assert (
+        run.main([*args[:-1], str(tmp_path / "again.json"), "--compare", str(out)]) == 0
+    )
+    assert "ratio" in capsys.readouterr().out
+
+
+def test_parse_importtime_reads_nesting_and_flags_eager_imports():
+    text = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       100 |        100 |   asyncio\n"
+        "import time:        20 |         20 |     pandas.compat\n"
+        "import time:        50 |         70 |   pandas\n"
+        "import time:        10 |        180 | src.fetch\n"
+        "some unrelated warning\n"
+    )
+    trace = importtime.parse_importtime(text)
+    assert [(e.name, e.depth) for e in trace] == [
+        ("asyncio", 1),
+        ("pandas.compat", 2),
+        ("pandas", 1),
+        ("src.fetch", 0),
+    ]
+    assert trace[-1].cumulative_us == 180
+    assert importtime.violations("src.fetch", trace) == ["asyncio"]
+
+
+def test_fetch_import_defers_meteostat_and_asyncio():
+    trace = importtime.import_trace("src.fetch")
+    loaded = {e.name for e in importtime.subtree("src.fetch", trace)}
+    assert "pandas" in loaded
+    assert importtime.violations("src.fetch", trace) == []
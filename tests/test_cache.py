@@ -0,0 +1,71 @@
+# tests/test_cache.py
+import datetime as dt
+
+import numpy as np
+import pandas as pd
+
+from src.cache import FrameCache, frame_nbytes
+from src.fetch import RECENT_TTL_SECONDS, cache_ttl, freeze_frame
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _df(n):
+    return pd.DataFrame({"x": np.zeros(n)})
+
+
+def test_frame_cache_ttl_expiry_and_eviction_reasons():
+    clock = _Clock()
+    evicted = []
+    cache = FrameCache(
+        maxsize=10, clock=clock, on_evict=lambda k, r: evicted.append((k, r))
+    )
+    cache.put(("recent",), _df(1), ttl=60)
+    cache.put(("final",), _df(1))
+
+    clock.now = 59
+    assert cache.get(("recent",)) is not None
+    clock.now = 60
+    assert cache.peek(("recent",)) is None
+    assert cache.get(("recent",)) is None
+    assert cache.get(("final",)) is not None
+    assert evicted == [(("recent",), "expired")]
+    assert cache.info().hits == 2 and cache.info().misses == 1
+
+
+def test_frame_cache_byte_budget_evicts_lru():
+    size = frame_nbytes(_df(100))
+    evicted = []
+    cache = FrameCache(
+        maxsize=100, max_bytes=2 * size, on_evict=lambda k, r: evicted.append((k, r))
+    )
+    cache.put(("a",), _df(100))
+    cache.put(("b",), _df(100))
+    cache.get(("a",))  # b is now least recently used
+    cache.put(("c",), _df(100))
+    assert evicted == [(("b",), "size")]
+    assert [k for k, _ in cache.items()] == [("a",), ("c",)]
+    assert cache.nbytes == 2 * size
+
+    # Replacing a key does not double count its bytes
+    cache.put(("a",), _df(100))
+    assert cache.nbytes == 2 * size and len(cache) == 2
+
+
+def test_cache_ttl_only_for_windows_reaching_recent_days():
+    today = dt.date(2024, 6, 30)
+    assert cache_ttl(dt.date(2024, 6, 30), today) == RECENT_TTL_SECONDS
+    assert cache_ttl(dt.datetime(2024, 6, 24), today) == RECENT_TTL_SECONDS
+    assert cache_ttl(dt.date(2024, 6, 23), today) is None
+    assert cache_ttl(dt.datetime(2020, 1, 1), today) is None
+
+
+def test_frame_nbytes_handles_frozen_object_columns():
+    df = pd.DataFrame({"x": np.arange(3.0), "label": ["a", "bb", "ccc"]})
+    assert frame_nbytes(freeze_frame(df)) == frame_nbytes(df)
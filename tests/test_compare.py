@@ -0,0 +1,83 @@
+# tests/test_compare.py
+import datetime as dt
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import src.fetch as fetch
+from src.compare import build_cube, compare_locations
+
+
+def _frame(start, values, **extra):
+    idx = pd.date_range(start, periods=len(values), name="time")
+    return pd.DataFrame({"tavg": values, **extra}, index=idx)
+
+
+def test_build_cube_aligns_on_shared_daily_index():
+    frames = {
+        "A": _frame("2023-01-01", [1.0, 2.0, 3.0], prcp=[0.0, 1.0, 2.0]),
+        "B": _frame("2023-01-02", [5.0, np.nan, 0.0]),
+        "C": None,  # failed fetch
+    }
+    cube = build_cube(frames, variables=["tavg", "prcp"])
+
+    assert cube.values.shape == (3, 4, 2)
+    assert list(cube.dates) == list(pd.date_range("2023-01-01", "2023-01-04"))
+    wide = cube.wide("tavg")
+    assert wide["A"].tolist()[:3] == [1.0, 2.0, 3.0] and np.isnan(
+        wide.loc["2023-01-04", "A"]
+    )
+    assert np.isnan(wide.loc["2023-01-01", "B"]) and wide.loc["2023-01-02", "B"] == 5.0
+    assert wide["C"].isna().all()
+    with pytest.raises(ValueError):
+        cube.values[0, 0, 0] = 9.0
+
+    diff = cube.differences("tavg", "A")
+    assert diff.loc["2023-01-02", "B"] == 3.0
+    assert (diff["A"].dropna() == 0).all()
+
+    ranks = cube.ranks("tavg")
+    assert ranks.loc["2023-01-02"].tolist()[:2] == [2.0, 1.0]
+    assert ranks.loc["2023-01-03", "A"] == 1.0
+    assert np.isnan(ranks.loc["2023-01-03", "B"])
+    assert np.isnan(ranks.loc["2023-01-01", "C"])
+
+    summary = cube.summary()
+    assert summary.loc[("A", "tavg"), "mean"] == 2.0
+    assert summary.loc[("B", "tavg"), "count"] == 2
+    assert summary.loc[("B", "tavg"), "max"] == 5.0
+    assert np.isnan(summary.loc[("C", "tavg"), "mean"])
+    assert cube.totals("prcp")["A"] == 3.0
+
+
+def test_compare_locations_fetches_concurrently_and_reports_errors(monkeypatch):
+    class _Point:
+        def __init__(self, lat, lon):
+            self.lat = lat
+
+    class _Daily:
+        def __init__(self, loc, start, end):
+            self.lat, self.start, self.end = loc.lat, start, end
+
+        def fetch(self):
+            if self.lat < 0:
+                raise RuntimeError("no station")
+            idx = pd.date_range(self.start, self.end, name="time")
+            return pd.DataFrame({"tavg": self.lat}, index=idx)
+
+    monkeypatch.setattr(fetch, "Point", _Point)
+    monkeypatch.setattr(fetch, "Daily", _Daily)
+    fetch.get_historical_weather.cache_clear()
+
+    cube = compare_locations(
+        {"North": (60.0, 0.0), "South": (50.0, 0.0), "Nowhere": (-1.0, 0.0)},
+        dt.date(2023, 1, 1),
+        dt.date(2023, 1, 31),
+    )
+    assert cube.locations == ["North", "South", "Nowhere"]
+    assert len(cube.dates) == 31
+    assert (cube.wide("tavg")["North"] == 60.0).all()
+    assert (cube.differences("tavg", "South")["North"] == 10.0).all()
+    assert set(cube.errors) == {"Nowhere"}
+    fetch.get_historical_weather.cache_clear()
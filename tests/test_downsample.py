@@ -0,0 +1,66 @@
+# tests/test_downsample.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.fake_meteostat import synthetic_rows
+from src.downsample import chart_frame, downsample, lttb_indices, minmax_indices
+from src.formatters import build_chart_frame
+from src.metrics import REGISTRY
+
+
+def test_lttb_keeps_endpoints_budget_and_spikes():
+    x = np.arange(10_000, dtype=float)
+    y = np.sin(x / 500)
+    y[4321] = 50.0  # a single-day outlier must survive
+    idx = lttb_indices(x, y, 500)
+    assert len(idx) == 500
+    assert idx[0] == 0 and idx[-1] == len(x) - 1
+    assert np.all(np.diff(idx) > 0)
+    assert 4321 in idx
+    # Nothing to do when the budget covers every point
+    assert list(lttb_indices(x[:10], y[:10], 20)) == list(range(10))
+
+
+def test_minmax_indices_match_bucket_extremes():
+    rng = np.random.default_rng(1)
+    y = rng.gamma(0.6, 4, 5000)
+    y[rng.random(5000) < 0.1] = np.nan
+    idx = minmax_indices(y, 100)
+
+    valid = np.flatnonzero(~np.isnan(y))
+    bucket_of = np.arange(len(valid)) * 100 // len(valid)
+    for b in range(100):
+        members = valid[bucket_of == b]
+        assert members[np.argmin(y[members])] in idx
+        assert members[np.argmax(y[members])] in idx
+    assert len(idx) <= 200 and not np.isnan(y[idx]).any()
+
+
+def test_downsample_frame_unions_series_and_keeps_dates():
+    chart = build_chart_frame(synthetic_rows(12_000, na_rate=0.05))
+    cols = ["Average Temperature (°C)", "Highest Temperature (°C)"]
+    out = downsample(chart, "Date", cols, "line", max_points=800)
+    assert out.index.name == "Date" and list(out.columns) == cols
+    assert 800 <= len(out) <= 1600
+    assert out.index.is_monotonic_increasing
+    rain = downsample(chart, "Date", ["Rainfall (mm)"], "bar", max_points=800)
+    assert rain["Rainfall (mm)"].max() == chart["Rainfall (mm)"].max()
+    with pytest.raises(ValueError):
+        downsample(chart, "Date", cols, "pie")
+
+
+def test_chart_frame_caches_by_fingerprint_and_full_resolution():
+    chart = build_chart_frame(synthetic_rows(3000))
+    cols = ["Air Pressure (hPa)"]
+    hits = REGISTRY.counter("chart_cache_requests_total", result="hit")
+
+    first = chart_frame(chart, "Date", cols, "line", 500)
+    again = chart_frame(chart.copy(), "Date", cols, "line", 500)
+    assert again is first
+    assert REGISTRY.counter("chart_cache_requests_total", result="hit") == hits + 1
+    with pytest.raises(ValueError):
+        first.iloc[0, 0] = 0.0  # shared cache entries are read-only
+
+    full = chart_frame(chart, "Date", cols, "line", None)
+    pd.testing.assert_frame_equal(full, chart.set_index("Date")[cols])
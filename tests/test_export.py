@@ -0,0 +1,127 @@
+# tests/test_export.py
+import datetime as dt
+import json
+import shutil
+
+import pandas as pd
+import pytest
+
+import src.fetch as fetch
+from benchmarks.fake_meteostat import patched_meteostat
+from src.export import ExportLocation, export, main, read_locations
+from src.resilience import CircuitBreaker, RetryPolicy, Upstream
+
+START, END = dt.date(2022, 1, 1), dt.date(2022, 3, 31)
+
+
+def _locations_csv(tmp_path, rows):
+    path = tmp_path / "locations.csv"
+    path.write_text("\n".join(rows) + "\n")
+    return path
+
+
+def test_read_locations_accepts_coordinates_presets_and_dedups(tmp_path):
+    path = _locations_csv(
+        tmp_path,
+        ["name,lat,lon,location", "Site A,1.5,2.5,", ",,,London, UK", "Site A,3,4,"],
+    )
+    # Quoted "London, UK" keeps its comma
+    path.write_text(path.read_text().replace("London, UK", '"London, UK"'))
+    locs = read_locations(path)
+    assert [loc.slug for loc in locs] == ["Site_A", "London_UK", "Site_A_2"]
+    assert locs[1].lat == pytest.approx(51.5074)
+
+    # A renamed duplicate never collides with a later row, and keeps its name
+    clash = read_locations(
+        _locations_csv(tmp_path, ["name,lat,lon", "a,1,1", "a,2,2", "a_2,3,3"])
+    )
+    assert [loc.slug for loc in clash] == ["a", "a_2", "a_2_2"]
+    assert [loc.name for loc in clash] == ["a", "a", "a_2"]
+
+    bad = _locations_csv(tmp_path, ["location", "Atlantis"])
+    with pytest.raises(ValueError, match="Atlantis"):
+        read_locations(bad)
+
+
+def test_export_writes_partitions_manifest_and_resumes(tmp_path):
+    locs = [ExportLocation(f"p{i}", 50.0 + i, -1.0) for i in range(5)]
+    out = tmp_path / "out"
+    reports = []
+
+    # The third fetch fails upstream; the rest are written
+    with patched_meteostat(faults=["ok", "ok", "error"]) as daily:
+        totals = export(
+            locs,
+            START,
+            END,
+            out,
+            view="user",
+            processes=0,
+            max_in_flight=1,
+            progress=lambda p: reports.append(p.done),
+        )
+        assert (totals.ok, totals.failed, totals.rows) == (4, 1, 4 * 90)
+        assert reports == [1, 2, 3, 4, 5]
+
+        part = pd.read_csv(out / "location=p0" / "part.csv")
+        assert list(part.columns[:4]) == ["location", "lat", "lon", "Date"]
+        assert len(part) == 90 and (part["location"] == "p0").all()
+        assert not list(out.rglob("*.tmp"))
+        # Exported frames are not kept in the process-wide fetch cache
+        assert not fetch.is_cached(50.0, -1.0, START, END)
+
+        # Resume (from a moved output directory) only retries the failed location
+        moved = tmp_path / "moved"
+        shutil.move(out, moved)
+        out = moved
+        daily.calls.clear()
+        again = export(locs, START, END, out, view="user", processes=0, resume=True)
+        assert (again.skipped, again.ok, again.failed) == (4, 1, 0)
+        assert len(daily.calls) == 1
+
+        # A different window is not the same export: nothing is skipped
+        shorter = dt.date(2022, 2, 28)
+        other = export(locs, START, shorter, out, processes=0, resume=True)
+        assert (other.skipped, other.ok) == (0, 5)
+
+    records = [json.loads(line) for line in (out / "_manifest.jsonl").open()]
+    assert [r["status"] for r in records].count("failed") == 1
+    assert records[0]["path"] == "location=p0/part.csv"
+    assert (records[0]["start"], records[0]["format"]) == ("2022-01-01", "csv")
+    assert sorted(p.parent.name for p in out.rglob("part.csv")) == [
+        f"location=p{i}" for i in range(5)
+    ]
+
+
+def test_export_waits_out_an_open_circuit_breaker(tmp_path):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.01)
+    fetch.set_upstream(Upstream(retry=RetryPolicy(attempts=1), breaker=breaker))
+    locs = [ExportLocation(f"p{i}", 50.0 + i, -1.0) for i in range(3)]
+    # The first error opens the circuit; the location is retried after it resets
+    with patched_meteostat(faults=["error"]) as daily:
+        totals = export(locs, START, END, tmp_path, processes=0, max_in_flight=1)
+    assert (totals.ok, totals.failed) == (3, 0)
+    assert len(daily.calls) == 4
+
+
+def test_cli_uses_worker_processes(tmp_path, capsys):
+    path = _locations_csv(tmp_path, ["lat,lon", "10,20", "11,21"])
+    out = tmp_path / "cli"
+    with patched_meteostat():
+        code = main(
+            [
+                str(path),
+                "--start",
+                "2022-03-31",
+                "--end",
+                "2022-01-01",
+                "--out",
+                str(out),
+                "--processes",
+                "1",
+            ]
+        )
+    assert code == 0
+    assert "[2/2] ok=2" in capsys.readouterr().err
+    raw = pd.read_csv(out / "location=10.0000_20.0000" / "part.csv")
+    assert raw["time"].iloc[0] == "2022-01-01" and len(raw) == 90
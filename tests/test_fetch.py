@@ -1,7 +1,9 @@
 from datetime import datetime
 from unittest.mock import ANY, patch
 
+import numpy as np
 import pandas as pd
+import pytest
 
 from src.fetch import get_historical_weather
 
@@ -30,3 +32,86 @@ def test_get_historical_weather_returns_dataframe():
         pd.testing.assert_frame_equal(df, mock_df)
         mock_daily.return_value.fetch.assert_called_once_with()
         mock_daily.assert_called_once_with(ANY, start, end)  # Match Point
+
+
+def test_get_historical_weather_hits_are_read_only_and_isolated():
+    get_historical_weather.cache_clear()
+    idx = pd.date_range("2023-02-01", periods=3, name="time")
+    mock_df = pd.DataFrame({"tavg": [1.0, 2.0, 3.0]}, index=idx)
+    args = (1.0, 2.0, datetime(2023, 2, 1), datetime(2023, 2, 3))
+
+    with patch("src.fetch.Daily") as mock_daily:
+        mock_daily.return_value.fetch.return_value = mock_df
+        first = get_historical_weather(*args)
+        second = get_historical_weather(*args)
+        mock_daily.return_value.fetch.assert_called_once_with()
+
+    # Hits share the cached buffers rather than copying them
+    assert np.shares_memory(first["tavg"].to_numpy(), second["tavg"].to_numpy())
+
+    # In-place writes are rejected instead of corrupting the cache
+    with pytest.raises(ValueError):
+        first.iloc[0, 0] = 99.0
+
+    # Structural changes stay on the caller's frame
+    first["extra"] = 1
+    third = get_historical_weather(*args)
+    assert list(third.columns) == ["tavg"]
+    assert third["tavg"].tolist() == [1.0, 2.0, 3.0]
+    get_historical_weather.cache_clear()
+
+
+def test_compact_mode_downcasts_and_reports_saving():
+    from src.fetch import cache_memory_report
+
+    get_historical_weather.cache_clear()
+    idx = pd.date_range("2023-03-01", periods=400, name="time")
+    mock_df = pd.DataFrame(
+        {
+            "tavg": np.linspace(-5, 25, 400),
+            "prcp": np.nan,
+            "wdir": np.where(np.arange(400) % 7 == 0, np.nan, 359.6),
+        },
+        index=idx,
+    )
+    args = (5.0, 6.0, datetime(2023, 3, 1), datetime(2024, 4, 3))
+
+    with patch("src.fetch.Daily") as mock_daily:
+        mock_daily.return_value.fetch.return_value = mock_df
+        small = get_historical_weather(*args, compact=True)
+        full = get_historical_weather(*args)
+
+    assert full["tavg"].dtype == np.float64
+    assert small["tavg"].dtype == np.float32
+    assert str(small["wdir"].dtype) == "Int16"
+    assert small["wdir"].isna().sum() == full["wdir"].isna().sum()
+    assert small["wdir"].dropna().eq(360).all()
+    with pytest.raises(ValueError):
+        small.iloc[1, 2] = 1
+
+    report = cache_memory_report().set_index("compact")
+    assert report.loc[True, "rows"] == 400
+    assert report.loc[True, "bytes"] < report.loc[False, "bytes"]
+    assert report.loc[True, "saving"] > 0.3
+    get_historical_weather.cache_clear()
+
+
+def test_compact_request_derives_from_a_cached_full_frame():
+    from src.fetch import cache_memory_report
+
+    get_historical_weather.cache_clear()
+    idx = pd.date_range("2023-03-01", periods=10, name="time")
+    mock_df = pd.DataFrame({"tavg": np.linspace(0, 9, 10)}, index=idx)
+    args = (7.0, 8.0, datetime(2023, 3, 1), datetime(2023, 3, 10))
+
+    with patch("src.fetch.Daily") as mock_daily:
+        mock_daily.return_value.fetch.return_value = mock_df
+        full = get_historical_weather(*args)
+        small = get_historical_weather(*args, compact=True)
+        mock_daily.return_value.fetch.assert_called_once_with()
+
+    assert small["tavg"].dtype == np.float32
+    np.testing.assert_allclose(small["tavg"], full["tavg"])
+    # Only the full-precision entry is kept
+    assert cache_memory_report()["compact"].tolist() == [False]
+    get_historical_weather.cache_clear()
@@ -0,0 +1,110 @@
+# tests/test_fetch_async.py
+import asyncio
+import datetime as dt
+import threading
+
+import pandas as pd
+
+import src.fetch as fetch
+
+START, END = dt.date(2023, 1, 1), dt.date(2023, 1, 3)
+
+
+def _fake_meteostat(monkeypatch, delays=None, fail=()):
+    """Fake Daily keyed by latitude; returns (calls, peak concurrency)."""
+    calls, active, peak = [], [0], [0]
+    lock = threading.Lock()
+
+    class _Daily:
+        def __init__(self, loc, start, end):
+            self.lat, self.start, self.end = loc._lat, start, end
+
+        def fetch(self):
+            with lock:
+                calls.append(self.lat)
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            try:
+                threading.Event().wait((delays or {}).get(self.lat, 0.01))
+                if self.lat in fail:
+                    raise ValueError("bad point")
+                idx = pd.date_range(self.start, self.end, name="time")
+                return pd.DataFrame({"tavg": self.lat}, index=idx)
+            finally:
+                with lock:
+                    active[0] -= 1
+
+    class _Point:
+        def __init__(self, lat, lon):
+            self._lat = lat
+
+    monkeypatch.setattr(fetch, "Daily", _Daily)
+    monkeypatch.setattr(fetch, "Point", _Point)
+    return calls, peak
+
+
+def test_aget_historical_weather_shares_the_sync_cache(monkeypatch):
+    fetch.get_historical_weather.cache_clear()
+    calls, _ = _fake_meteostat(monkeypatch)
+
+    df = asyncio.run(fetch.aget_historical_weather(1.0, 2.0, START, END))
+    assert len(df) == 3 and calls == [1.0]
+
+    # Same cache both ways: the sync call is a hit
+    assert fetch.get_historical_weather(1.0, 2.0, START, END).equals(df)
+    assert calls == [1.0]
+    fetch.get_historical_weather.cache_clear()
+
+
+def test_aget_historical_weather_timeout_and_errors_return_none(monkeypatch, caplog):
+    fetch.get_historical_weather.cache_clear()
+    _fake_meteostat(monkeypatch, delays={1.0: 0.5}, fail={2.0})
+
+    slow = asyncio.run(
+        fetch.aget_historical_weather(1.0, 0.0, START, END, timeout=0.05)
+    )
+    bad = asyncio.run(fetch.aget_historical_weather(2.0, 0.0, START, END))
+
+    assert slow is None and bad is None
+    assert "Timeout while fetching" in caplog.text
+    assert "Unexpected error fetching" in caplog.text
+    fetch.get_historical_weather.cache_clear()
+
+
+def test_aget_historical_weather_many_bounds_concurrency(monkeypatch):
+    fetch.get_historical_weather.cache_clear()
+    calls, peak = _fake_meteostat(monkeypatch, delays={9.0: 0.5}, fail={3.0})
+    points = [(float(i), 0.0) for i in range(10)] + [(4.0, 0.0)]
+
+    results = asyncio.run(
+        fetch.aget_historical_weather_many(
+            points, START, END, max_concurrency=3, timeout=0.2
+        )
+    )
+
+    assert [(r.lat, r.lon) for r in results] == points
+    assert peak[0] <= 3
+    assert sorted(set(calls)) == [float(i) for i in range(10)]
+    assert isinstance(results[3].error, ValueError)
+    assert isinstance(results[9].error, TimeoutError)
+    assert results[4].data.equals(results[10].data)
+    assert all(r.ok for i, r in enumerate(results) if i not in (3, 9))
+    fetch.get_historical_weather.cache_clear()
+
+
+def test_aget_historical_weather_propagates_cancellation(monkeypatch):
+    fetch.get_historical_weather.cache_clear()
+    _fake_meteostat(monkeypatch, delays={1.0: 0.3})
+
+    async def main():
+        task = asyncio.create_task(fetch.aget_historical_weather(1.0, 0.0, START, END))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            return "cancelled"
+        return "finished"
+
+    assert asyncio.run(main()) == "cancelled"
+    fetch.get_historical_weather.cache_clear()
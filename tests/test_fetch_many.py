@@ -0,0 +1,233 @@
+# tests/test_fetch_many.py
+import datetime as dt
+import threading
+import time
+
+import pandas as pd
+
+import src.fetch as fetch
+from src.metrics import REGISTRY
+
+
+def test_get_historical_weather_many_order_errors_and_dedup(monkeypatch):
+    fetch.get_historical_weather.cache_clear()
+    calls = []
+    lock = threading.Lock()
+
+    class _Daily:
+        def __init__(self, loc, start, end):
+            self.lat = loc._lat
+
+        def fetch(self):
+            with lock:
+                calls.append(self.lat)
+            if self.lat == 0.0:
+                raise TimeoutError("simulated timeout")
+            return pd.DataFrame({"tavg": [self.lat]})
+
+    class _Point:
+        def __init__(self, lat, lon):
+            self._lat = lat
+
+    monkeypatch.setattr(fetch, "Daily", _Daily)
+    monkeypatch.setattr(fetch, "Point", _Point)
+
+    points = [(3.0, 1.0), (0.0, 1.0), (1.0, 1.0), (3.0, 1.0), (2.0, 1.0)]
+    results = fetch.get_historical_weather_many(
+        points, dt.date(2023, 1, 1), dt.date(2023, 1, 2), max_workers=3
+    )
+
+    assert [(r.lat, r.lon) for r in results] == points
+    assert [r.ok for r in results] == [True, False, True, True, True]
+    assert isinstance(results[1].error, TimeoutError)
+    assert results[0].data.equals(results[3].data)
+    assert results[4].data["tavg"].iloc[0] == 2.0
+    # The duplicate point was only fetched once
+    assert sorted(calls) == [0.0, 1.0, 2.0, 3.0]
+
+    # Successful points are now served from the shared cache; errors are retried
+    calls.clear()
+    again = fetch.get_historical_weather(
+        3.0, 1.0, dt.date(2023, 1, 1), dt.date(2023, 1, 2)
+    )
+    assert again.equals(results[0].data)
+    assert calls == []
+    fetch.get_historical_weather.cache_clear()
+
+
+def test_stream_historical_weather_yields_chunks_in_order(monkeypatch):
+    fetch.get_historical_weather.cache_clear()
+    calls = []
+
+    class _Daily:
+        def __init__(self, _loc, start, end):
+            calls.append((start, end))
+            self.start, self.end = start, end
+
+        def fetch(self):
+            idx = pd.date_range(self.start, self.end, name="time")
+            return pd.DataFrame({"tavg": 1.0}, index=idx)
+
+    monkeypatch.setattr(fetch, "Daily", _Daily)
+    start, end = dt.datetime(2020, 11, 15), dt.datetime(2023, 2, 10)
+    REGISTRY.reset()
+
+    chunks = list(
+        fetch.stream_historical_weather(55.9, -3.2, start, end, cache_result=True)
+    )
+
+    assert [(c.index[0], c.index[-1]) for c in chunks] == [
+        (pd.Timestamp("2020-11-15"), pd.Timestamp("2020-12-31")),
+        (pd.Timestamp("2021-01-01"), pd.Timestamp("2021-12-31")),
+        (pd.Timestamp("2022-01-01"), pd.Timestamp("2022-12-31")),
+        (pd.Timestamp("2023-01-01"), pd.Timestamp("2023-02-10")),
+    ]
+    assert len(calls) == 4
+    assert fetch.is_cached(55.9, -3.2, start, end)
+    # Stored through the same path as regular fetches, so it is accounted for
+    gauges = {r["metric"]: r for r in REGISTRY.summary() if r["type"] == "gauge"}
+    assert gauges["fetch_cache_entries"]["value"] == 1
+
+    # The primed window is served from cache, both whole and streamed by month
+    calls.clear()
+    assert len(fetch.get_historical_weather(55.9, -3.2, start, end)) == 818
+    months = list(
+        fetch.stream_historical_weather(55.9, -3.2, start, end, chunk="month")
+    )
+    assert len(months) == 28 and sum(map(len, months)) == 818
+    assert calls == []
+    fetch.get_historical_weather.cache_clear()
+
+
+def test_stream_keeps_chunks_of_an_interrupted_stream(monkeypatch):
+    fetch.get_historical_weather.cache_clear()
+    calls = []
+
+    class _Daily:
+        def __init__(self, _loc, start, end):
+            calls.append((start, end))
+            self.start, self.end = start, end
+
+        def fetch(self):
+            idx = pd.date_range(self.start, self.end, name="time")
+            return pd.DataFrame({"tavg": 1.0}, index=idx)
+
+    monkeypatch.setattr(fetch, "Daily", _Daily)
+    start, end = dt.datetime(2020, 11, 15), dt.datetime(2023, 2, 10)
+
+    stream = fetch.stream_historical_weather(
+        55.9, -3.2, start, end, prefetch=1, cache_result=True
+    )
+    first = [next(stream), next(stream)]
+    stream.close()
+    assert not fetch.is_cached(55.9, -3.2, start, end)
+
+    # Resuming does not ask upstream again for the chunks already delivered
+    again = list(
+        fetch.stream_historical_weather(
+            55.9, -3.2, start, end, prefetch=1, cache_result=True
+        )
+    )
+    assert [len(c) for c in again] == [47, 365, 365, 41]
+    assert [len(c) for c in first] == [47, 365]
+    assert calls.count((dt.datetime(2020, 11, 15), dt.datetime(2020, 12, 31))) == 1
+    assert calls.count((dt.datetime(2021, 1, 1), dt.datetime(2021, 12, 31))) == 1
+    # Once drained, the chunk entries make way for the whole window
+    assert fetch.is_cached(55.9, -3.2, start, end)
+    assert len(fetch._frame_cache) == 1
+    fetch.get_historical_weather.cache_clear()
+
+
+def _gated_daily(calls, gate):
+    """Fake Daily whose fetch blocks until ``gate`` is set."""
+
+    class _Daily:
+        def __init__(self, _loc, start, end):
+            calls.append((start, end))
+            self.start, self.end = start, end
+
+        def fetch(self):
+            gate.wait(5)
+            if self.start.year == 1900:
+                raise RuntimeError("upstream down")
+            idx = pd.date_range(self.start, self.end, name="time")
+            return pd.DataFrame({"tavg": idx.day.astype(float)}, index=idx)
+
+    return _Daily
+
+
+def _run_concurrently(fn, args_list):
+    out = [None] * len(args_list)
+
+    def run(i, args):
+        try:
+            out[i] = fn(*args)
+        except Exception as e:  # noqa: BLE001 - collected for assertions
+            out[i] = e
+
+    threads = [
+        threading.Thread(target=run, args=(i, a)) for i, a in enumerate(args_list)
+    ]
+    for t in threads:
+        t.start()
+    return threads, out
+
+
+def _wait_for(cond, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not cond():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.001)
+
+
+def _coalesced():
+    return REGISTRY.counter("fetch_coalesced_total")
+
+
+def test_concurrent_identical_and_overlapping_fetches_coalesce(monkeypatch):
+    fetch.get_historical_weather.cache_clear()
+    calls, gate = [], threading.Event()
+    monkeypatch.setattr(fetch, "Daily", _gated_daily(calls, gate))
+    start, end = dt.datetime(2022, 1, 1), dt.datetime(2022, 12, 31)
+
+    joined = _coalesced()
+    leader, _ = _run_concurrently(fetch._fetch_cached, [(51.5, -0.1, start, end)])
+    _wait_for(lambda: calls)
+    threads, out = _run_concurrently(
+        fetch.get_historical_weather,
+        [(51.5, -0.1, start, end)] * 4
+        + [(51.5, -0.1, dt.datetime(2022, 3, 1), dt.datetime(2022, 3, 31))]
+        + [(51.5, -0.1, dt.datetime(2022, 12, 1), dt.datetime(2023, 1, 10))],
+    )
+    # Every follower joined the in-flight year before it was released
+    _wait_for(lambda: _coalesced() - joined == 6)
+    gate.set()
+    for t in leader + threads:
+        t.join()
+
+    # One call for the year plus one for the days past its end
+    assert calls == [(start, end), (dt.datetime(2023, 1, 1), dt.datetime(2023, 1, 10))]
+    assert all(len(df) == 365 for df in out[:4])
+    assert out[4].index[0] == pd.Timestamp("2022-03-01") and len(out[4]) == 31
+    assert out[5].index[0] == pd.Timestamp("2022-12-01") and len(out[5]) == 41
+    assert not out[5].index.has_duplicates
+    assert fetch._inflight == {}
+    fetch.get_historical_weather.cache_clear()
+
+
+def test_coalesced_waiters_share_the_upstream_error(monkeypatch):
+    fetch.get_historical_weather.cache_clear()
+    calls, gate = [], threading.Event()
+    monkeypatch.setattr(fetch, "Daily", _gated_daily(calls, gate))
+    window = (51.5, -0.1, dt.datetime(1900, 1, 1), dt.datetime(1900, 1, 31))
+
+    joined = _coalesced()
+    threads, out = _run_concurrently(fetch._fetch_cached, [window] * 3)
+    _wait_for(lambda: _coalesced() - joined == 2)
+    gate.set()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert all(isinstance(e, RuntimeError) for e in out)
+    assert fetch._inflight == {}
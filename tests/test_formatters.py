@@ -1,13 +1,57 @@
+import numpy as np
 import pandas as pd
 
 from src.formatters import (
     COLUMN_MAP,
+    COMPASS,
     build_user_view,
+    compass_labels,
     deg_to_compass,
     to_kmh,
 )
 
 
+def _rowwise_user_view(df: pd.DataFrame) -> pd.DataFrame:
+    """Reference per-row implementation that build_user_view must reproduce."""
+    out = df.copy()
+    out["time"] = pd.to_datetime(out["time"], errors="coerce").dt.strftime("%b %d, %Y")
+    for c in ["tavg", "tmin", "tmax", "prcp", "snow", "pres", "tsun"]:
+        out[c] = pd.to_numeric(out[c], errors="coerce").round(1)
+    for c in ["wspd", "wpgt"]:
+        out[c] = pd.to_numeric(out[c].apply(to_kmh), errors="coerce").round(1)
+    out["Wind"] = out.apply(
+        lambda r: (
+            f'{deg_to_compass(r.get("wdir"))} • '
+            f'avg {("—" if pd.isna(r.get("wspd")) else r.get("wspd"))} km/h • '
+            f'gust {("—" if pd.isna(r.get("wpgt")) else r.get("wpgt"))} km/h'
+        ),
+        axis=1,
+    )
+    out = out.where(~out.isna(), other="—").rename(columns=COLUMN_MAP)
+    return out.drop(
+        columns=[COLUMN_MAP["wdir"], COLUMN_MAP["wspd"], COLUMN_MAP["wpgt"]]
+    )
+
+
+def _random_raw_frame(rng: np.random.Generator, n: int, na_rate: float):
+    cols = {
+        "tavg": rng.normal(10, 8, n),
+        "tmin": rng.normal(5, 8, n),
+        "tmax": rng.normal(15, 8, n),
+        "prcp": rng.gamma(0.8, 4, n),
+        "snow": rng.gamma(0.3, 10, n),
+        "wdir": rng.uniform(-720, 1080, n),
+        "wspd": rng.gamma(2, 6, n),
+        "wpgt": rng.gamma(3, 10, n),
+        "pres": rng.normal(1013, 12, n),
+        "tsun": rng.uniform(0, 900, n),
+    }
+    df = pd.DataFrame(cols)
+    df = df.mask(rng.random(df.shape) < na_rate)
+    df.insert(0, "time", pd.date_range("1980-01-01", periods=n, freq="D"))
+    return df
+
+
 def test_deg_to_compass_basic():
     assert deg_to_compass(0) == "N"
     assert deg_to_compass(359) == "N"  # wrap-around
@@ -109,3 +153,73 @@ def test_column_map_is_consistent():
         "tsun",
     }
     assert keys.issubset(set(COLUMN_MAP.keys()))
+
+
+def test_compass_labels_matches_scalar():
+    deg = pd.Series([0, 11.24, 11.25, 359, 360, -22.5, 725.0, None, float("nan")])
+    assert compass_labels(deg).tolist() == [deg_to_compass(d) for d in deg]
+
+
+def test_build_user_view_matches_rowwise_on_random_frames():
+    rng = np.random.default_rng(1234)
+    for n, na_rate in [(1, 0.0), (17, 0.1), (500, 0.3), (2000, 0.9)]:
+        df = _random_raw_frame(rng, n, na_rate)
+        user_df, _ = build_user_view(df)
+        pd.testing.assert_frame_equal(user_df, _rowwise_user_view(df))
+
+
+def test_build_user_view_accepts_read_only_frames():
+    from src.fetch import freeze_frame
+
+    raw = _random_raw_frame(np.random.default_rng(7), 50, 0.2)
+    frozen = freeze_frame(raw)
+    user_df, _ = build_user_view(frozen)
+    pd.testing.assert_frame_equal(user_df, _rowwise_user_view(raw))
+    pd.testing.assert_frame_equal(frozen, raw)
+
+
+def test_build_user_view_compact_keeps_typed_columns():
+    raw = _random_raw_frame(np.random.default_rng(3), 200, 0.2)
+    full, _ = build_user_view(raw)
+    small, col_cfg = build_user_view(raw, compact=True)
+
+    assert "Wind" not in small.columns
+    assert small["Average Temperature (°C)"].dtype == np.float32
+    assert small["Wind Speed (km/h)"].dtype == np.float32
+    wind_dir = small["Wind Direction"]
+    assert list(wind_dir.cat.categories) == COMPASS
+    assert wind_dir.cat.codes.dtype == np.int8
+    # Same labels as the summary string, NA where the summary shows "—"
+    expected = full["Wind"].str.split(" • ").str[0]
+    assert wind_dir.astype(object).fillna("—").tolist() == expected.tolist()
+    assert small["Date"].tolist() == full["Date"].tolist()
+    assert {"Wind Direction", "Wind Speed (km/h)"} <= set(col_cfg)
+
+
+def test_build_display_frame_is_typed_and_sorted_newest_first():
+    from src.formatters import build_display_frame
+
+    raw = _random_raw_frame(np.random.default_rng(11), 300, 0.2)
+    raw = raw.sample(frac=1, random_state=0)  # shuffled input order
+    display_df, col_cfg = build_display_frame(raw)
+    user_df, _ = build_user_view(raw)
+
+    assert pd.api.types.is_datetime64_any_dtype(display_df["Date"])
+    assert display_df["Date"].is_monotonic_decreasing
+    assert display_df["Average Temperature (°C)"].dtype == np.float64
+    assert display_df["Rainfall (mm)"].isna().any()
+    # Same rows and values as the string view, only typed
+    expected = user_df.loc[display_df.index]
+    assert (
+        display_df["Date"].dt.strftime("%b %d, %Y").tolist()
+        == expected["Date"].tolist()
+    )
+    assert display_df["Wind"].tolist() == expected["Wind"].tolist()
+    assert (
+        display_df["Rainfall (mm)"]
+        .astype(object)
+        .where(display_df["Rainfall (mm)"].notna(), "—")
+        .tolist()
+        == expected["Rainfall (mm)"].tolist()
+    )
+    assert col_cfg["Date"]["format"] == "MMM DD, YYYY"
@@ -0,0 +1,182 @@
+# tests/test_hourly.py
+import datetime as dt
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import src.fetch as fetch
+from src.hourly_store import HOURLY_COLUMNS, HourlyStore, daily_from_hourly
+from src.metrics import REGISTRY
+
+
+def _hourly(start: str, end: str) -> pd.DataFrame:
+    idx = pd.date_range(start, end, freq="h", name="time")
+    hours = np.arange(len(idx), dtype=float)
+    return pd.DataFrame(
+        {
+            "temp": (hours % 24) / 2,
+            "prcp": np.where(idx.hour == 12, 1.5, 0.0),
+            "wdir": np.where(idx.hour < 12, 350.0, 10.0),
+            "wspd": 4.0,
+            "pres": 1013.0,
+        },
+        index=idx,
+    )
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = HourlyStore(tmp_path)
+    fetch.set_hourly_store(store)
+    yield store
+    fetch.set_hourly_store(None)
+
+
+def test_store_reads_are_zero_copy_slices(store):
+    store.put(
+        "1.0,2.0",
+        _hourly("2023-01-01", "2023-01-03 23:00"),
+        dt.date(2023, 1, 1),
+        dt.date(2023, 1, 3),
+    )
+    day = store.get("1.0,2.0", dt.date(2023, 1, 2), dt.date(2023, 1, 2))
+    assert len(day) == 24
+    assert day.index[0] == pd.Timestamp("2023-01-02")
+    temp = day["temp"].to_numpy()
+    assert isinstance(temp.base, np.memmap) or isinstance(temp, np.memmap)
+    assert not temp.flags.writeable
+    assert list(day.columns) == list(HOURLY_COLUMNS)
+
+
+def test_store_grows_in_both_directions_and_tracks_coverage(store):
+    loc = "1.0,2.0"
+    store.put(
+        loc,
+        _hourly("2023-01-05", "2023-01-05 23:00"),
+        dt.date(2023, 1, 5),
+        dt.date(2023, 1, 5),
+    )
+    before = store.get(loc, dt.date(2023, 1, 5), dt.date(2023, 1, 5))
+    store.put(
+        loc,
+        _hourly("2023-01-01", "2023-01-01 23:00"),
+        dt.date(2023, 1, 1),
+        dt.date(2023, 1, 1),
+    )
+    store.put(
+        loc,
+        _hourly("2023-01-09", "2023-01-09 23:00"),
+        dt.date(2023, 1, 9),
+        dt.date(2023, 1, 9),
+    )
+    assert store.missing(loc, dt.date(2023, 1, 1), dt.date(2023, 1, 9)) == [
+        (dt.date(2023, 1, 2), dt.date(2023, 1, 4)),
+        (dt.date(2023, 1, 6), dt.date(2023, 1, 8)),
+    ]
+    after = store.get(loc, dt.date(2023, 1, 5), dt.date(2023, 1, 5))
+    pd.testing.assert_frame_equal(before, after)
+    gap = store.get(loc, dt.date(2023, 1, 3), dt.date(2023, 1, 3))
+    assert len(gap) == 24 and gap["temp"].isna().all()
+    # Slices taken before a rewrite stay readable
+    assert before["temp"].iloc[5] == 2.5
+    assert len(list(store.root.glob("*/temp.v*.npy"))) == 1
+
+
+def test_store_writes_inside_the_grid_leave_held_frames_unchanged(store):
+    loc = "1.0,2.0"
+    for day in ("2023-01-01", "2023-01-05"):
+        store.put(loc, _hourly(day, f"{day} 23:00"), dt.date.fromisoformat(day), None)
+    gap = store.get(loc, dt.date(2023, 1, 3), dt.date(2023, 1, 3))
+    assert gap["temp"].isna().all()
+    store.put(
+        loc,
+        _hourly("2023-01-03", "2023-01-03 23:00"),
+        dt.date(2023, 1, 3),
+        dt.date(2023, 1, 3),
+    )
+    # The held frame is a snapshot; the new version has the written hours
+    assert gap["temp"].isna().all()
+    filled = store.get(loc, dt.date(2023, 1, 3), dt.date(2023, 1, 3))
+    assert filled["temp"].iloc[5] == 2.5
+    assert (
+        store.get(loc, dt.date(2023, 1, 1), dt.date(2023, 1, 1))["temp"].iloc[5] == 2.5
+    )
+    assert store.covered(loc) == [(dt.date(2023, 1, 3), dt.date(2023, 1, 3))]
+    assert len(list(store.root.glob("*/temp.v*.npy"))) == 1
+
+
+def test_daily_from_hourly_matches_meteostat_definitions():
+    daily = daily_from_hourly(_hourly("2023-01-01", "2023-01-02 23:00"))
+    assert list(daily.index) == list(
+        pd.date_range("2023-01-01", periods=2, name="time")
+    )
+    first = daily.iloc[0]
+    assert first["tavg"] == pytest.approx(5.8)
+    assert (first["tmin"], first["tmax"]) == (0.0, 11.5)
+    assert first["prcp"] == 1.5
+    assert first["wdir"] == 0.0  # 350° and 10° average to north, not 180°
+    assert np.isnan(first["tsun"])
+
+
+def test_hourly_fetch_fills_gaps_once_and_derives_daily(store, monkeypatch):
+    calls = []
+
+    class _Hourly:
+        def __init__(self, loc, start, end):
+            calls.append((start, end))
+            self.start, self.end = start, end
+
+        def fetch(self):
+            return _hourly(str(self.start), str(self.end))
+
+    monkeypatch.setattr(fetch, "Hourly", _Hourly)
+    monkeypatch.setattr(fetch, "Point", lambda lat, lon: (lat, lon))
+    before = REGISTRY.counter("hourly_store_requests_total", result="hit")
+
+    first = fetch.get_hourly_weather(1.0, 2.0, dt.date(2023, 1, 1), dt.date(2023, 1, 2))
+    wider = fetch.get_hourly_weather(1.0, 2.0, dt.date(2023, 1, 1), dt.date(2023, 1, 4))
+    daily = fetch.get_daily_from_hourly(
+        1.0, 2.0, dt.date(2023, 1, 2), dt.date(2023, 1, 3)
+    )
+    assert calls == [
+        (dt.datetime(2023, 1, 1), dt.datetime(2023, 1, 2, 23)),
+        (dt.datetime(2023, 1, 3), dt.datetime(2023, 1, 4, 23)),
+    ]
+    assert len(first) == 48 and len(wider) == 96
+    assert len(daily) == 2 and daily["prcp"].tolist() == [1.5, 1.5]
+    assert REGISTRY.counter("hourly_store_requests_total", result="hit") == before + 1
+
+
+def test_empty_hourly_answers_are_fetched_again(store, monkeypatch):
+    calls = []
+
+    class _Hourly:
+        def __init__(self, loc, start, end):
+            calls.append(start)
+
+        def fetch(self):
+            return pd.DataFrame()
+
+    monkeypatch.setattr(fetch, "Hourly", _Hourly)
+    monkeypatch.setattr(fetch, "Point", lambda lat, lon: (lat, lon))
+    for _ in range(2):
+        fetch.get_hourly_weather(1.0, 2.0, dt.date(2023, 1, 1), dt.date(2023, 1, 2))
+    assert len(calls) == 2
+
+
+def test_hourly_fetch_errors_return_none(store, monkeypatch):
+    class _Boom:
+        def __init__(self, *a, **k):
+            pass
+
+        def fetch(self):
+            raise RuntimeError("kaboom")
+
+    monkeypatch.setattr(fetch, "Hourly", _Boom)
+    monkeypatch.setattr(fetch, "Point", lambda lat, lon: (lat, lon))
+    assert (
+        fetch.get_hourly_weather(3.0, 4.0, dt.date(2023, 1, 1), dt.date(2023, 1, 1))
+        is None
+    )
+    assert store.covered("3.0000,4.0000") == []
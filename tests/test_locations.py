@@ -0,0 +1,14 @@
+# tests/test_locations.py
+from src.locations import PRESETS, parse_location, parse_locations
+
+
+def test_parse_location_presets_coordinates_and_fallback():
+    assert parse_location("London, UK") == PRESETS["London, UK"]
+    assert parse_location(" 55.95 , -3.19 ") == (55.95, -3.19)
+    assert parse_location("not,a number") is None
+    assert parse_location("") == PRESETS["Edinburgh, UK"]
+
+
+def test_parse_locations_skips_unknown_names():
+    out = parse_locations(["London, UK", "", "Atlantis", "10,20", "x,y"])
+    assert out == {"London, UK": PRESETS["London, UK"], "10,20": (10.0, 20.0)}
@@ -0,0 +1,82 @@
+# tests/test_metrics.py
+import datetime as dt
+import urllib.request
+
+import pandas as pd
+
+import src.fetch as fetch
+from src.formatters import build_user_view
+from src.metrics import (
+    REGISTRY,
+    Histogram,
+    Metrics,
+    PrometheusFileSink,
+    PrometheusHTTPSink,
+)
+
+
+def test_histogram_quantile_and_prometheus_text(tmp_path):
+    h = Histogram(buckets=(0.1, 1.0))
+    for v in (0.05, 0.05, 0.5, 5.0):
+        h.observe(v)
+    assert h.counts == [2, 1, 1]
+    assert 0.0 < h.quantile(0.5) <= 0.1
+
+    m = Metrics()
+    m.inc("hits_total", result="hit")
+    m.inc("hits_total", 2, result="hit")
+    m.observe("latency_seconds", 0.02, outcome="ok")
+    text = m.render_prometheus()
+    assert 'climate_compare_hits_total{result="hit"} 3' in text
+    assert 'climate_compare_latency_seconds_bucket{outcome="ok",le="+Inf"} 1' in text
+    assert 'climate_compare_latency_seconds_count{outcome="ok"} 1' in text
+
+    sink = PrometheusFileSink(tmp_path / "metrics.prom")
+    m.add_sink(sink)
+    m.export()
+    assert (tmp_path / "metrics.prom").read_text() == text
+
+
+def test_http_sink_serves_metrics():
+    m = Metrics()
+    m.set("cache_entries", 4)
+    sink = PrometheusHTTPSink(m, port=0)
+    try:
+        url = f"http://127.0.0.1:{sink.port}/metrics"
+        with urllib.request.urlopen(url, timeout=5) as resp:
+            body = resp.read().decode()
+        assert "climate_compare_cache_entries 4" in body
+    finally:
+        sink.close()
+
+
+def test_fetch_and_formatter_record_metrics(monkeypatch):
+    class _Daily:
+        def __init__(self, _loc, start, end):
+            self.start, self.end = start, end
+
+        def fetch(self):
+            idx = pd.date_range(self.start, self.end, name="time")
+            return pd.DataFrame({"tavg": 1.0, "wdir": 90.0, "wspd": 3.0}, index=idx)
+
+    monkeypatch.setattr(fetch, "Daily", _Daily)
+    monkeypatch.setattr(fetch._frame_cache, "maxsize", 1)
+    fetch.get_historical_weather.cache_clear()
+    REGISTRY.reset()
+
+    a = (1.0, 1.0, dt.date(2023, 1, 1), dt.date(2023, 1, 10))
+    b = (2.0, 2.0, dt.date(2023, 1, 1), dt.date(2023, 1, 5))
+    df = fetch.get_historical_weather(*a)
+    fetch.get_historical_weather(*a)
+    fetch.get_historical_weather(*b)  # evicts a
+
+    assert REGISTRY.counter("fetch_cache_requests_total", result="miss") == 2
+    assert REGISTRY.counter("fetch_cache_requests_total", result="hit") == 1
+    assert REGISTRY.counter("fetch_cache_evictions_total", reason="size") == 1
+    assert REGISTRY.counter("fetch_rows_total") == 15
+    assert REGISTRY.histogram("fetch_upstream_seconds", outcome="ok").count == 2
+
+    build_user_view(df.reset_index())
+    for stage in ("date", "numeric", "wind_units", "wind_summary", "na_fill"):
+        assert REGISTRY.histogram("format_stage_seconds", stage=stage).count == 1
+    fetch.get_historical_weather.cache_clear()
@@ -0,0 +1,111 @@
+# tests/test_normals.py
+import datetime as dt
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import src.normals as normals
+from benchmarks.fake_meteostat import patched_meteostat, synthetic_daily
+from src.formatters import build_anomaly_chart_frame
+from src.normals import (
+    STATS,
+    compute_normals,
+    day_of_year,
+    get_normals,
+    percentile_rank,
+)
+
+PERIOD = (dt.date(2011, 1, 1), dt.date(2020, 12, 31))
+
+
+@pytest.fixture
+def baseline_df():
+    return synthetic_daily(
+        55.0, -3.0, dt.datetime(2011, 1, 1), dt.datetime(2020, 12, 31)
+    )
+
+
+def test_day_of_year_uses_a_leap_calendar():
+    days = pd.DatetimeIndex(["2021-01-01", "2020-02-29", "2021-03-01", "2020-03-01"])
+    assert day_of_year(days).tolist() == [0, 59, 60, 60]
+    assert day_of_year(pd.DatetimeIndex(["2021-12-31"])).tolist() == [365]
+
+
+def test_percentile_rank_interpolates_and_splits_ties():
+    pcts = np.array([0.0, 50.0, 100.0])
+    q = np.array([[0.0, 10.0, 20.0]] * 4 + [[0.0, 0.0, 4.0]])
+    values = np.array([5.0, -1.0, 25.0, np.nan, 0.0])
+    assert percentile_rank(values, q, pcts).tolist()[:3] == [25.0, 0.0, 100.0]
+    assert np.isnan(percentile_rank(values, q, pcts)[3])
+    # 0 ties the 0th and 50th percentiles: ranked in the middle of them
+    assert percentile_rank(values, q, pcts)[4] == 25.0
+
+
+def test_compute_normals_matches_a_pooled_reference(baseline_df):
+    n = compute_normals(baseline_df, "k", PERIOD)
+    assert n.values.shape == (5, len(STATS), 366)
+    assert n.values.dtype == np.float32
+    assert not n.values.flags.writeable
+
+    # 10 June pools 3–17 June of every year
+    days = baseline_df.index
+    window = baseline_df[(days.month == 6) & (days.day >= 3) & (days.day <= 17)]
+    frame = n.frame()
+    june10 = day_of_year(pd.DatetimeIndex(["2021-06-10"]))[0]
+    assert frame.loc[june10, "tavg_mean"] == pytest.approx(
+        window["tavg"].mean(), rel=1e-5
+    )
+    assert frame.loc[june10, "tmax_p90"] == pytest.approx(
+        np.percentile(window["tmax"].dropna(), 90), rel=1e-5
+    )
+    # New Year pools across the turn of the year; 29 Feb is not "missing"
+    assert not np.isnan(frame.loc[0, "tavg_mean"])
+    assert not np.isnan(frame.loc[59, "tavg_mean"])
+
+
+def test_sparse_days_have_no_baseline(baseline_df):
+    sparse = baseline_df.copy()
+    sparse.loc[sparse.index.month == 7, "tavg"] = np.nan
+    frame = compute_normals(sparse, "k", PERIOD).frame()
+    july15 = day_of_year(pd.DatetimeIndex(["2021-07-15"]))[0]
+    assert np.isnan(frame.loc[july15, "tavg_mean"])
+    assert not np.isnan(frame.loc[july15, "tmax_mean"])
+
+
+def test_anomalies_and_overlay_frame(baseline_df):
+    n = compute_normals(baseline_df, "k", PERIOD)
+    recent = synthetic_daily(
+        55.0, -3.0, dt.datetime(2023, 1, 1), dt.datetime(2023, 3, 31)
+    )
+    anom = n.anomalies(recent)
+    assert len(anom) == len(recent)
+    expected = recent["tavg"].to_numpy() - anom["tavg_normal"].to_numpy()
+    np.testing.assert_allclose(anom["tavg_anom"], expected)
+    pct = anom["tavg_pct"].dropna()
+    assert pct.between(0, 100).all()
+
+    chart = build_anomaly_chart_frame(anom)
+    assert list(chart.columns[:3]) == [
+        "Date",
+        "Average Temperature (°C)",
+        "Normal Average Temperature (°C)",
+    ]
+    rain = chart["Cumulative Rainfall (mm)"]
+    assert rain.iloc[-1] == pytest.approx(recent["prcp"].sum())
+    assert rain.is_monotonic_increasing
+
+
+def test_get_normals_computes_once_and_stores(tmp_path, monkeypatch):
+    monkeypatch.setenv(normals.NORMALS_ENV_VAR, str(tmp_path))
+    normals.clear_normals()
+    with patched_meteostat(latency=0.0) as daily:
+        first = get_normals(1.0, 2.0, PERIOD)
+        assert get_normals(1.0, 2.0, PERIOD) is first
+        assert len(daily.calls) == 1
+        normals.clear_normals()
+        stored = get_normals(1.0, 2.0, PERIOD)
+        assert len(daily.calls) == 1  # read back from disk
+    np.testing.assert_array_equal(stored.values, first.values)
+    assert len(list(tmp_path.glob("*.npz"))) == 1
+    normals.clear_normals()
@@ -0,0 +1,66 @@
+# tests/test_paging.py
+import numpy as np
+import pandas as pd
+
+from src.metrics import REGISTRY
+from src.paging import (
+    RangeFilter,
+    cached_row_order,
+    clear_orders,
+    page_count,
+    row_order,
+    table_page,
+)
+
+
+def _frame():
+    return pd.DataFrame(
+        {
+            "Date": pd.date_range("2023-01-01", periods=6),
+            "Rain": [1.0, np.nan, 3.0, 1.0, 0.0, 5.0],
+            "Wind": ["N", "S", "E", "W", "N", "S"],
+        }
+    )
+
+
+def test_row_order_sorts_stably_with_missing_last():
+    df = _frame()
+    assert row_order(df, "Rain").tolist() == [4, 0, 3, 2, 5, 1]
+    # Ties keep their original order in both directions
+    assert row_order(df, "Rain", ascending=False).tolist() == [5, 2, 0, 3, 4, 1]
+    assert row_order(df, "Date", ascending=False).tolist() == [5, 4, 3, 2, 1, 0]
+    assert row_order(df).tolist() == list(range(6))
+
+
+def test_range_filters_drop_missing_and_combine():
+    df = _frame()
+    filters = [RangeFilter("Rain", low=1.0), RangeFilter("Rain", high=3.0)]
+    assert row_order(df, "Rain", filters=filters).tolist() == [0, 3, 2]
+    since = RangeFilter("Date", low=pd.Timestamp("2023-01-04"))
+    assert row_order(df, filters=[since]).tolist() == [3, 4, 5]
+
+
+def test_table_page_projects_columns_and_clamps_the_page():
+    df = _frame()
+    page = table_page(df, 1, 4, ["Wind", "Rain"], "Date", fingerprint="t")
+    assert (page.page, page.pages, page.total_rows) == (1, 2, 6)
+    assert (page.first_row, page.last_row) == (4, 6)
+    assert list(page.frame.columns) == ["Wind", "Rain"]
+    assert page.frame["Wind"].tolist() == ["N", "S"]
+    # Past the end: the last page
+    assert table_page(df, 9, 4, fingerprint="t").page == 1
+    assert page_count(0, 50) == 1
+    empty = table_page(df, 0, 4, filters=[RangeFilter("Rain", low=99.0)])
+    assert (empty.total_rows, len(empty.frame), empty.pages) == (0, 0, 1)
+
+
+def test_row_orders_are_cached_per_fingerprint():
+    clear_orders()
+    REGISTRY.reset()
+    df = _frame()
+    first = cached_row_order(df, "Rain", fingerprint="fp")
+    again = cached_row_order(df, "Rain", fingerprint="fp")
+    assert again is first
+    assert not first.flags.writeable
+    assert REGISTRY.counter("table_order_cache_requests_total", result="hit") == 1
+    clear_orders()
@@ -0,0 +1,142 @@
+# tests/test_resilience.py
+import datetime as dt
+import random
+
+import pytest
+
+import src.fetch as fetch
+from benchmarks.fake_meteostat import FakePoint, make_daily, patched_meteostat
+from src.metrics import REGISTRY
+from src.resilience import CircuitBreaker, CircuitOpenError, RetryPolicy, Upstream
+
+START, END = dt.date(2023, 1, 1), dt.date(2023, 1, 31)
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_retries_with_jittered_backoff_then_succeed():
+    delays = []
+    upstream = Upstream(
+        retry=RetryPolicy(attempts=3, base_delay=0.1, max_delay=0.15),
+        sleep=delays.append,
+        rng=random.Random(0),
+    )
+    outcomes = iter([ConnectionError("down"), TimeoutError("slow"), "ok"])
+
+    def flaky():
+        out = next(outcomes)
+        if isinstance(out, Exception):
+            raise out
+        return out
+
+    assert upstream.call(flaky) == "ok"
+    assert len(delays) == 2
+    assert 0 <= delays[0] <= 0.1 and 0 <= delays[1] <= 0.15
+    assert upstream.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_non_retryable_errors_and_deadline_stop_retries():
+    calls = []
+    upstream = Upstream(retry=RetryPolicy(attempts=5), sleep=lambda _s: None)
+
+    def broken():
+        calls.append(1)
+        raise ValueError("bad request")
+
+    with pytest.raises(ValueError):
+        upstream.call(broken)
+    assert len(calls) == 1
+
+    # Errors upstream answered with never open the circuit
+    strict = Upstream(breaker=CircuitBreaker(failure_threshold=2))
+    for _ in range(3):
+        with pytest.raises(ValueError):
+            strict.call(broken)
+    assert strict.breaker.state == CircuitBreaker.CLOSED
+
+    # An attempt still running at the deadline is abandoned with TimeoutError
+    daily = make_daily(faults=["slow"], slow_latency=0.5)
+    slow = Upstream(retry=RetryPolicy(attempts=3, deadline=0.1))
+    with pytest.raises(TimeoutError, match="deadline"):
+        slow.call(lambda: daily(FakePoint(1, 2), START, END).fetch())
+
+
+def test_circuit_breaker_opens_probes_and_closes():
+    clock = _Clock()
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=clock)
+    upstream = Upstream(retry=RetryPolicy(attempts=1), breaker=breaker)
+
+    def down():
+        raise ConnectionError("down")
+
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            upstream.call(down)
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        upstream.call(lambda: "never called")
+
+    clock.now = 10
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    with pytest.raises(ConnectionError):
+        upstream.call(down)  # failed probe re-opens immediately
+    assert breaker.state == CircuitBreaker.OPEN
+
+    clock.now = 20
+    assert upstream.call(lambda: "ok") == "ok"
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_hedged_request_wins_over_a_slow_attempt():
+    events = []
+    upstream = Upstream(hedge_quantile=0.9, hedge_min_samples=5, on_event=events.append)
+    for _ in range(5):
+        upstream.call(lambda: "warm")
+    # First attempt is slow, the hedge (second call) answers at normal speed
+    daily = make_daily(faults=["slow", "ok"], slow_latency=1.0)
+
+    t0 = dt.datetime.now()
+    df = upstream.call(lambda: daily(FakePoint(1, 2), START, END).fetch())
+    elapsed = (dt.datetime.now() - t0).total_seconds()
+
+    assert len(df) == 31
+    assert events == ["hedge", "hedge_won"]
+    assert elapsed < 0.9
+
+
+def test_open_circuit_serves_stale_cache_entry():
+    clock = _Clock()
+    fetch._frame_cache._clock = clock
+    try:
+        today = dt.date.today()
+        window = (1.0, 2.0, today - dt.timedelta(days=3), today)
+        with patched_meteostat(faults=["ok", "error", "error"]):
+            fresh = fetch.get_historical_weather(*window)
+            assert fresh is not None
+
+            # Recent windows expire quickly; upstream is now down
+            clock.now = fetch.RECENT_TTL_SECONDS + 1
+            fetch.set_upstream(
+                Upstream(
+                    retry=RetryPolicy(attempts=1),
+                    breaker=CircuitBreaker(failure_threshold=2),
+                )
+            )
+            before = REGISTRY.counter("fetch_cache_requests_total", result="stale")
+            for _ in range(3):  # two failures open the breaker, then rejected
+                stale = fetch.get_historical_weather(*window)
+                assert stale is not None and stale.equals(fresh)
+            assert fetch._upstream.breaker.state == CircuitBreaker.OPEN
+            after = REGISTRY.counter("fetch_cache_requests_total", result="stale")
+            assert after - before == 3
+
+            # Without a stale copy the refusal surfaces as the usual None
+            assert fetch.get_historical_weather(3.0, 4.0, START, END) is None
+    finally:
+        fetch._frame_cache._clock = fetch.time.monotonic
@@ -0,0 +1,91 @@
+# tests/test_rollups.py
+import datetime as dt
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import src.rollups as rollups
+from benchmarks.fake_meteostat import patched_meteostat, synthetic_daily
+from src.formatters import build_rollup_frame
+from src.rollups import GRANULARITIES, RollupTable, period_start, rollup
+
+FULL = synthetic_daily(1.0, 2.0, dt.datetime(2019, 11, 13), dt.datetime(2023, 3, 9))
+
+
+def _resample_reference(df, granularity):
+    """Per-period aggregates via a plain Python loop over groups."""
+    rows = {}
+    for key, part in df.groupby(period_start(df.index, granularity)):
+        rows[key] = {
+            "tavg": part["tavg"].mean(),
+            "tmin": part["tmin"].min(),
+            "tmax": part["tmax"].max(),
+            "prcp": part["prcp"].sum() if part["prcp"].notna().any() else np.nan,
+            "tsun": part["tsun"].sum() if part["tsun"].notna().any() else np.nan,
+            "days": len(part),
+        }
+    return pd.DataFrame.from_dict(rows, orient="index")
+
+
+def test_period_start_weeks_and_meteorological_seasons():
+    days = pd.DatetimeIndex(["2023-12-05", "2024-02-29", "2024-03-01", "2024-11-30"])
+    assert list(period_start(days, "season").strftime("%Y-%m-%d")) == [
+        "2023-12-01",
+        "2023-12-01",
+        "2024-03-01",
+        "2024-09-01",
+    ]
+    # 2024-02-29 is a Thursday
+    assert period_start(days[1:2], "week")[0] == pd.Timestamp("2024-02-26")
+    with pytest.raises(ValueError):
+        period_start(days, "fortnight")
+
+
+@pytest.mark.parametrize("granularity", GRANULARITIES)
+def test_rollup_matches_groupwise_reference(granularity):
+    got = rollup(FULL, granularity)
+    want = _resample_reference(FULL, granularity)
+    np.testing.assert_allclose(got.to_numpy(float), want.to_numpy(float))
+    assert list(got.index) == list(want.index)
+
+
+def test_incremental_update_recomputes_only_changed_periods():
+    table = RollupTable()
+    assert len(table.update(FULL.loc[:"2021-06-17"])) == len(FULL.loc[:"2021-06-17"])
+    # Overlapping days that did not change are not reprocessed
+    assert len(table.update(FULL.loc["2021-01-01":])) == len(FULL.loc["2021-06-18":])
+    assert table.update(FULL).empty
+
+    revised = FULL.loc["2022-02-01":"2022-02-03"].copy()
+    revised["prcp"] = 99.0
+    assert len(table.update(revised)) == 3
+    expected = FULL.copy()
+    expected.loc[revised.index, "prcp"] = 99.0
+
+    for g in GRANULARITIES:
+        pd.testing.assert_frame_equal(table.get(g), rollup(expected, g))
+        # Partially covered edge periods only aggregate days inside the window
+        s, e = dt.date(2020, 2, 10), dt.date(2022, 8, 20)
+        pd.testing.assert_frame_equal(table.get(g, s, e), rollup(expected.loc[s:e], g))
+
+
+def test_get_rollup_reads_cached_daily_and_formats_seasons():
+    rollups.clear_rollups()
+    with patched_meteostat(latency=0.0) as daily:
+        start, end = dt.date(2020, 12, 1), dt.date(2021, 11, 30)
+        seasons = rollups.get_rollup(1.0, 2.0, start, end, "season")
+        again = rollups.get_rollup(1.0, 2.0, start, end, "month")
+        assert len(daily.calls) == 1
+    assert list(seasons["days"]) == [90, 92, 92, 91]
+    assert len(again) == 12
+
+    table, meta = build_rollup_frame(seasons, "season")
+    assert list(table["Season"]) == [
+        "Autumn 2021",
+        "Summer 2021",
+        "Spring 2021",
+        "Winter 2020/21",
+    ]
+    assert meta["Period"]["format"] == "MMM YYYY"
+    rollups.clear_rollups()
@@ -0,0 +1,164 @@
+# tests/test_service.py
+import io
+import json
+import urllib.error
+import urllib.request
+from urllib.parse import parse_qs
+
+import pandas as pd
+import pytest
+
+from benchmarks.fake_meteostat import patched_meteostat
+from src.rollups import clear_rollups
+from src.service import (
+    DataService,
+    QueryError,
+    output_columns,
+    parse_query,
+    response_frame,
+    source_frame,
+)
+from src.views import clear_views
+
+WINDOW = "location=55.95,-3.19&start=2023-01-01&end=2023-03-31"
+
+
+@pytest.fixture
+def service():
+    clear_rollups()
+    clear_views()
+    with patched_meteostat(latency=0.0) as daily:
+        svc = DataService(port=0)
+        svc.daily = daily
+        yield svc
+        svc.close()
+    clear_rollups()
+    clear_views()
+
+
+def _get(svc, query, **headers):
+    req = urllib.request.Request(f"{svc.url}/weather?{query}", headers=headers)
+    try:
+        with urllib.request.urlopen(req) as resp:
+            return resp.status, dict(resp.headers), resp.read()
+    except urllib.error.HTTPError as e:
+        return e.code, dict(e.headers), e.read()
+
+
+def test_parse_query_validates_parameters():
+    q = parse_query(
+        {
+            "lat": ["55.9"],
+            "lon": ["-3.2"],
+            "start": ["2023-01-01"],
+            "end": ["2023-01-31"],
+            "columns": ["tavg, prcp,tavg"],
+        }
+    )
+    assert (q.lat, q.lon, q.columns, q.granularity, q.view) == (
+        55.9,
+        -3.2,
+        ("tavg", "prcp"),
+        "day",
+        "raw",
+    )
+    base = {"location": ["London, UK"], "start": ["2023-01-01"], "end": ["2023-01-31"]}
+    for bad in (
+        {"location": ["Nowhere"]},
+        {"end": ["2022-12-31"]},
+        {"start": ["01/01/2023"]},
+        {"granularity": ["hour"]},
+        {"granularity": ["month"], "columns": ["wspd"]},
+        {"format": ["xml"]},
+    ):
+        with pytest.raises(QueryError):
+            parse_query({**base, **bad})
+
+
+def test_json_and_csv_with_columns_and_granularity(service):
+    status, headers, body = _get(service, WINDOW + "&columns=tavg,prcp&format=json")
+    assert status == 200
+    assert headers["Content-Type"] == "application/json"
+    rows = json.loads(body)
+    assert len(rows) == 90
+    assert set(rows[0]) == {"time", "tavg", "prcp"}
+
+    status, headers, body = _get(
+        service, WINDOW + "&granularity=month", Accept="text/csv"
+    )
+    assert status == 200
+    assert headers["Content-Type"].startswith("text/csv")
+    monthly = pd.read_csv(io.BytesIO(body))
+    assert list(monthly.columns) == [
+        "period",
+        "tavg",
+        "tmin",
+        "tmax",
+        "prcp",
+        "tsun",
+        "days",
+    ]
+    assert monthly["days"].tolist() == [31, 28, 31]
+
+    status, _, body = _get(service, WINDOW + "&view=user&format=json")
+    assert status == 200
+    assert "Average Temperature (°C)" in json.loads(body)[0]
+    # Views of a column subset are not mixed up with the full view
+    _, _, body = _get(service, WINDOW + "&view=user&columns=prcp&format=json")
+    assert "Average Temperature (°C)" not in json.loads(body)[0]
+    _, _, body = _get(service, WINDOW + "&granularity=month&columns=tavg&format=json")
+    assert set(json.loads(body)[0]) == {"period", "tavg", "days"}
+    assert len(service.daily.calls) == 1  # every request served from the cache
+
+
+def test_raw_projection_serves_the_cached_frame(service):
+    params = parse_qs(WINDOW + "&columns=tavg,wdir")
+    query = parse_query(params)
+    daily = source_frame(query)
+    assert response_frame(query, daily, "fp") is daily
+    assert output_columns(query) == ("tavg", "wdir")
+    assert output_columns(parse_query({**params, "view": ["user"]})) is None
+
+
+def test_join_returns_once_the_service_is_closed():
+    svc = DataService(port=0)
+    svc.join(timeout=0.01)  # still serving
+    svc.close()
+    svc.join(timeout=5)
+    assert not svc._thread.is_alive()
+
+
+def test_unchanged_range_revalidates_with_304(service):
+    status, headers, body = _get(service, WINDOW + "&format=json")
+    assert status == 200
+    tag = headers["ETag"]
+    assert "max-age" in headers["Cache-Control"]
+
+    status, headers, body = _get(
+        service, WINDOW + "&format=json", **{"If-None-Match": tag}
+    )
+    assert (status, body) == (304, b"")
+    assert headers["ETag"] == tag
+    # Another shape of the same data is another representation
+    status, headers, _ = _get(service, WINDOW + "&format=csv", **{"If-None-Match": tag})
+    assert status == 200
+    assert headers["ETag"] != tag
+
+
+def test_errors_are_json(service):
+    status, _, body = _get(service, "location=55.95,-3.19&start=2023-01-01")
+    assert status == 400
+    assert "end" in json.loads(body)["error"]
+    with pytest.raises(urllib.error.HTTPError) as e:
+        urllib.request.urlopen(f"{service.url}/nope")
+    assert e.value.code == 404
+
+
+def test_arrow_stream_round_trips(service):
+    pa = pytest.importorskip("pyarrow")
+    status, headers, body = _get(service, WINDOW + "&columns=tavg,wdir&format=arrow")
+    assert status == 200
+    assert headers["Content-Type"] == "application/vnd.apache.arrow.stream"
+    table = pa.ipc.open_stream(body).read_all()
+    assert table.column_names == ["time", "tavg", "wdir"]
+    assert table.num_rows == 90
@@ -0,0 +1,145 @@
+# tests/test_stations.py
+import datetime as dt
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import src.fetch as fetch
+from src import stations
+from src.locations import parse_location, parse_locations
+from src.stations import Station, StationIndex, haversine_km, load_station_index
+
+
+def _random_index(n: int, seed: int = 0) -> StationIndex:
+    rng = np.random.default_rng(seed)
+    lat = np.degrees(np.arcsin(rng.uniform(-1, 1, n)))
+    lon = rng.uniform(-180, 180, n)
+    return StationIndex(
+        [
+            Station(f"S{i:05d}", f"Station {i}", "XX", float(a), float(o))
+            for i, (a, o) in enumerate(zip(lat, lon, strict=True))
+        ]
+    )
+
+
+UK = [
+    Station("03166", "Edinburgh / Gogarbank", "GB", 55.9281, -3.3450),
+    Station("03772", "London Heathrow Airport", "GB", 51.4780, -0.4614),
+    Station("03779", "London Weather Centre", "GB", 51.5167, -0.1167),
+    Station("03134", "Glasgow / Bishopton", "GB", 55.9072, -4.5329),
+    Station("07149", "Orly", "FR", 48.7167, 2.3833),
+    Station("10389", "Berlin-Tempelhof", "DE", 52.4667, 13.4000),
+    Station("76679", "México", "MX", 19.4333, -99.1333),
+    Station("91765", "Pago Pago", "AS", -14.3310, -170.7130),
+]
+
+
+@pytest.fixture
+def uk_index():
+    index = StationIndex(UK)
+    stations.set_default_index(index)
+    yield index
+    stations.set_default_index(None)
+
+
+def test_nearest_matches_brute_force_haversine():
+    index = _random_index(3000)
+    rng = np.random.default_rng(1)
+    queries = [(90.0, 0.0), (-90.0, 45.0), (0.0, 179.99), (0.0, -179.99)]
+    queries += list(zip(rng.uniform(-90, 90, 200), rng.uniform(-180, 180, 200)))
+    for lat, lon in queries:
+        station, km = index.nearest(lat, lon)
+        dists = [haversine_km(lat, lon, s.lat, s.lon) for s in index.stations]
+        assert km == pytest.approx(min(dists), abs=1e-6)
+        assert haversine_km(lat, lon, station.lat, station.lon) == pytest.approx(km)
+
+
+def test_snap_respects_the_radius_and_wraps_the_antimeridian():
+    index = StationIndex(UK)
+    assert index.snap(55.95, -3.19).id == "03166"
+    assert index.snap(40.0, -30.0) is None
+    # Longitudes past ±180° and across the antimeridian are the same place
+    assert index.snap(-14.331, 189.287).id == "91765"
+    fiji = StationIndex([Station("F", "Fiji", "FJ", -16.8, 179.9), *UK])
+    station, km = fiji.nearest(-16.8, -179.9)
+    assert station.id == "F"
+    assert km == pytest.approx(haversine_km(-16.8, 179.9, -16.8, 180.1))
+    assert StationIndex([]).nearest(0.0, 0.0) is None
+
+
+def test_search_ranks_exact_then_name_prefix_then_word_prefix():
+    index = StationIndex(UK)
+    assert [s.id for s in index.search("london")] == ["03779", "03772"]
+    assert [s.id for s in index.search("heathrow")] == ["03772"]
+    assert [s.id for s in index.search("ORLY")] == ["07149"]
+    assert [s.id for s in index.search("mexico")] == ["76679"]
+    assert [s.id for s in index.search("tempel")] == ["10389"]
+    assert index.search("") == []
+    assert index.search("zz") == []
+    assert index.resolve("Glasgow").id == "03134"
+    assert index.resolve("51.47,-0.45").id == "03772"
+
+
+def test_load_station_index_reads_the_cached_csv(tmp_path):
+    path = tmp_path / "stations.csv"
+    pd.DataFrame(
+        {
+            "id": ["03166", "07149"],
+            "name": ["Edinburgh / Gogarbank", "Orly"],
+            "country": ["GB", "FR"],
+            "latitude": [55.9281, 48.7167],
+            "longitude": [-3.3450, 2.3833],
+            "elevation": [57.0, None],
+        }
+    ).to_csv(path, index=False)
+    index = load_station_index(path)
+    assert len(index) == 2
+    assert index.stations[0] == Station(
+        "03166", "Edinburgh / Gogarbank", "GB", 55.9281, -3.3450, 57.0
+    )
+    assert index.stations[1].elevation is None
+
+
+def test_place_names_resolve_through_the_default_index(uk_index):
+    assert parse_location("Heathrow") == (51.4780, -0.4614)
+    assert parse_locations(["Orly", "Nowhere", "London, UK"]) == {
+        "Orly": (48.7167, 2.3833),
+        "London, UK": (51.5074, -0.1278),
+    }
+    # Names with a comma are not mistaken for unparseable coordinates
+    assert parse_location("Berlin-Tempelhof, Germany") == (52.4667, 13.4000)
+    assert parse_location("Orly, FR") == (48.7167, 2.3833)
+    assert parse_locations(["Heathrow, England"]) == {
+        "Heathrow, England": (51.4780, -0.4614)
+    }
+    assert parse_location("not,a number") is None
+
+
+def test_nearby_points_share_one_station_fetch(uk_index, monkeypatch):
+    fetch.get_historical_weather.cache_clear()
+    calls = []
+
+    class _Daily:
+        def __init__(self, loc, start, end):
+            calls.append(loc)
+
+        def fetch(self):
+            idx = pd.DatetimeIndex([pd.Timestamp("2023-01-01")], name="time")
+            return pd.DataFrame({"tavg": [4.0]}, index=idx)
+
+    monkeypatch.setattr(fetch, "Daily", _Daily)
+    snaps = []
+    snap = uk_index.snap
+    monkeypatch.setattr(
+        uk_index, "snap", lambda lat, lon: snaps.append(1) or snap(lat, lon)
+    )
+    start, end = dt.date(2023, 1, 1), dt.date(2023, 1, 1)
+    a = fetch.get_historical_weather(55.95, -3.19, start, end)
+    b = fetch.get_historical_weather(55.90, -3.30, start, end)
+    assert calls == ["03166"]
+    # One index lookup per request, upstream fetch included
+    assert len(snaps) == 2
+    assert a.equals(b)
+    assert fetch.is_cached(55.93, -3.25, start, end)
+    fetch.get_historical_weather.cache_clear()
@@ -0,0 +1,103 @@
+# tests/test_store.py
+from datetime import date, datetime
+
+import pandas as pd
+
+import src.fetch as fetch
+from src.store import RangeStore, location_key, missing_intervals
+
+
+def _daily_frame(start: datetime, end: datetime) -> pd.DataFrame:
+    idx = pd.date_range(start, end, freq="D", name="time")
+    return pd.DataFrame({"tavg": range(len(idx)), "prcp": 0.5}, index=idx).astype(float)
+
+
+def test_missing_intervals_gaps_only():
+    covered = [
+        (date(2023, 1, 5), date(2023, 1, 10)),
+        (date(2023, 1, 11), date(2023, 1, 12)),
+    ]
+    assert missing_intervals(covered, date(2023, 1, 1), date(2023, 1, 20)) == [
+        (date(2023, 1, 1), date(2023, 1, 4)),
+        (date(2023, 1, 13), date(2023, 1, 20)),
+    ]
+    assert missing_intervals(covered, date(2023, 1, 6), date(2023, 1, 12)) == []
+
+
+def test_range_store_roundtrip_and_coverage(tmp_path):
+    store = RangeStore(tmp_path / "cache.sqlite")
+    loc = location_key(55.95, -3.19)
+    store.put(
+        loc,
+        _daily_frame(datetime(2023, 1, 1), datetime(2023, 1, 10)),
+        date(2023, 1, 1),
+        date(2023, 1, 10),
+    )
+    store.close()
+
+    # Coverage and rows survive a reopen
+    store = RangeStore(tmp_path / "cache.sqlite")
+    assert store.missing(loc, date(2023, 1, 5), date(2023, 1, 15)) == [
+        (date(2023, 1, 11), date(2023, 1, 15))
+    ]
+    df = store.get(loc, date(2023, 1, 3), date(2023, 1, 4))
+    assert list(df["tavg"]) == [2.0, 3.0]
+    assert df["snow"].isna().all()
+    assert df.index.name == "time"
+    store.close()
+
+
+def test_get_historical_weather_refetches_only_gap(tmp_path, monkeypatch):
+    calls = []
+
+    class _Daily:
+        def __init__(self, _loc, start, end):
+            calls.append((start, end))
+            self.start, self.end = start, end
+
+        def fetch(self):
+            return _daily_frame(self.start, self.end)
+
+    monkeypatch.setattr(fetch, "Daily", _Daily)
+    fetch.set_range_store(RangeStore(tmp_path / "cache.sqlite"))
+    try:
+        fetch.get_historical_weather(55.95, -3.19, date(2023, 1, 1), date(2023, 1, 10))
+        df = fetch.get_historical_weather(
+            55.95, -3.19, date(2023, 1, 2), date(2023, 1, 11)
+        )
+    finally:
+        fetch.set_range_store(None)
+
+    assert calls == [
+        (datetime(2023, 1, 1), datetime(2023, 1, 10)),
+        (datetime(2023, 1, 11), datetime(2023, 1, 11)),
+    ]
+    assert len(df) == 10
+    assert df.index[0] == pd.Timestamp("2023-01-02")
+
+
+def test_empty_upstream_answers_are_not_marked_covered(tmp_path, monkeypatch):
+    calls = []
+
+    class _Daily:
+        def __init__(self, _loc, start, end):
+            calls.append((start, end))
+
+        def fetch(self):
+            return pd.DataFrame()  # what Meteostat returns on a failed download
+
+    monkeypatch.setattr(fetch, "Daily", _Daily)
+    store = RangeStore(tmp_path / "cache.sqlite")
+    fetch.set_range_store(store)
+    try:
+        for _ in range(2):
+            fetch.get_historical_weather.cache_clear()
+            fetch.get_historical_weather(
+                55.95, -3.19, date(2023, 1, 1), date(2023, 1, 10)
+            )
+    finally:
+        fetch.set_range_store(None)
+
+    assert len(calls) == 2
+    key = location_key(55.95, -3.19)
+    assert store.missing(key, date(2023, 1, 1), date(2023, 1, 10))
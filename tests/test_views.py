@@ -0,0 +1,65 @@
+# tests/test_views.py
+import datetime as dt
+
+import pytest
+
+import src.views as views
+from benchmarks.fake_meteostat import synthetic_daily, synthetic_rows
+from src.formatters import build_display_frame
+from src.rollups import rollup
+
+
+@pytest.fixture(autouse=True)
+def _clear_views():
+    views.clear_views()
+    yield
+    views.clear_views()
+
+
+def test_display_view_is_built_once_per_content(monkeypatch):
+    calls = []
+
+    def counting(df):
+        calls.append(len(df))
+        return build_display_frame(df)
+
+    monkeypatch.setattr(views, "build_display_frame", counting)
+    raw = synthetic_rows(500)
+
+    first, meta = views.display_view(raw)
+    # A rerun hands over a new frame object with the same content
+    again, meta_again = views.display_view(raw.copy())
+    assert again is first and meta_again is meta
+    assert calls == [500]
+    with pytest.raises(ValueError):
+        first.iloc[0, 1] = 0.0
+
+    changed = raw.copy()
+    changed.loc[0, "tavg"] = 99.0
+    views.display_view(changed)
+    assert calls == [500, 500]
+
+
+def test_views_keyed_by_options_and_kind():
+    raw = synthetic_rows(200)
+    chart = views.chart_view(raw)
+    display, _ = views.display_view(raw)
+    assert chart is not display and "Date" in chart.columns
+
+    rolled = rollup(
+        synthetic_daily(1.0, 2.0, dt.datetime(2020, 1, 1), dt.datetime(2020, 12, 31)),
+        "season",
+    )
+    fp = "same-fingerprint"
+    seasons, season_meta = views.rollup_view(rolled, "season", fp)
+    years, year_meta = views.rollup_view(rolled, "year", fp)
+    assert "Season" in seasons.columns and "Season" not in years.columns
+    assert season_meta["Period"]["format"] != year_meta["Period"]["format"]
+
+
+def test_evicted_views_drop_their_metadata(monkeypatch):
+    monkeypatch.setattr(views._view_cache, "maxsize", 2)
+    for seed in range(3):
+        views.display_view(synthetic_rows(50, seed=seed))
+    assert len(views._view_cache) == 2
+    assert len(views._meta) == 2
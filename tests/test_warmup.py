@@ -0,0 +1,123 @@
+# tests/test_warmup.py
+import datetime as dt
+import threading
+import time
+
+import src.warmup as warmup
+from benchmarks.fake_meteostat import patched_meteostat
+from src.fetch import is_cached, warm_historical_weather
+from src.locations import DEFAULT_LOCATION, PRESETS
+from src.warmup import RequestLog, Warmer, WarmQuery, preset_queries
+
+TODAY = dt.date(2024, 6, 20)
+
+
+def test_presets_are_warmed_for_the_default_window_first():
+    queries = preset_queries(TODAY)
+    assert len(queries) == len(PRESETS)
+    assert (queries[0].lat, queries[0].lon) == PRESETS[DEFAULT_LOCATION]
+    assert queries[0].start == dt.datetime(2024, 6, 11)
+    assert queries[0].end == dt.datetime(2024, 6, 20)
+
+
+def test_request_log_ranks_windows_and_replays_rolling_ones(tmp_path):
+    path = tmp_path / "requests.jsonl"
+    log = RequestLog(path)
+    fixed = (dt.date(1991, 1, 1), dt.date(2020, 12, 31))
+    for _ in range(3):
+        log.record(55.9, -3.2, *fixed, today=TODAY)
+    # "The last 10 days", asked on two different days, is one rolling window
+    log.record(
+        51.5,
+        -0.1,
+        dt.date(2024, 6, 1),
+        dt.date(2024, 6, 10),
+        today=dt.date(2024, 6, 10),
+    )
+    log.record(
+        51.5,
+        -0.1,
+        dt.date(2024, 6, 5),
+        dt.date(2024, 6, 14),
+        today=dt.date(2024, 6, 14),
+    )
+
+    reloaded = RequestLog(path)
+    assert len(reloaded) == 5
+    assert reloaded.popular(today=TODAY) == [
+        WarmQuery(55.9, -3.2, dt.datetime(1991, 1, 1), dt.datetime(2020, 12, 31)),
+        WarmQuery(51.5, -0.1, dt.datetime(2024, 6, 11), dt.datetime(2024, 6, 20)),
+    ]
+    assert reloaded.popular(limit=1, today=TODAY)[0].lat == 55.9
+
+
+def test_request_log_file_is_compacted_to_the_kept_entries(tmp_path):
+    path = tmp_path / "requests.jsonl"
+    log = RequestLog(path, max_entries=3)
+    for i in range(7):
+        log.record(float(i), 0.0, dt.date(2023, 1, 1), dt.date(2023, 1, 2), TODAY)
+    # Appended up to twice the cap, then rewritten with the last three
+    assert len(path.read_text().splitlines()) == 3
+    reloaded = RequestLog(path, max_entries=3)
+    assert [q.lat for q in reloaded.popular(today=TODAY)] == [4.0, 5.0, 6.0]
+
+
+def test_start_warmup_rejects_non_positive_intervals(monkeypatch, caplog):
+    monkeypatch.setattr(warmup, "_warmer", None)
+    monkeypatch.setattr(Warmer, "start", lambda self: self)
+    monkeypatch.setenv(warmup.WARMUP_ENV_VAR, "-5")
+    w = warmup.start_warmup()
+    assert w is not None and w.interval == warmup.WARMUP_INTERVAL_SECONDS
+    assert "Ignoring" in caplog.text
+
+
+def test_warmer_fetches_cold_windows_once():
+    queries = [
+        WarmQuery(55.9, -3.2, dt.datetime(2023, 1, 1), dt.datetime(2023, 1, 31)),
+        WarmQuery(51.5, -0.1, dt.datetime(2023, 1, 1), dt.datetime(2023, 1, 31)),
+    ]
+    with patched_meteostat(latency=0.0) as daily:
+        w = Warmer(lambda: queries + queries[:1], jitter=0.0)
+        first = w.run_once()
+        assert (first.fetched, first.warm, first.failed) == (2, 0, 0)
+        assert len(daily.calls) == 2
+        # Dates and the app's midnight datetimes share one cache entry
+        assert is_cached(55.9, -3.2, dt.date(2023, 1, 1), dt.date(2023, 1, 31))
+        second = w.run_once()
+        assert (second.fetched, second.warm) == (0, 2)
+        assert len(daily.calls) == 2
+
+
+def test_recent_windows_are_refreshed_ahead_of_expiry():
+    end = dt.datetime.combine(dt.date.today(), dt.time())
+    start = end - dt.timedelta(days=9)
+    with patched_meteostat(latency=0.0) as daily:
+        assert warm_historical_weather(55.9, -3.2, start, end)
+        assert not warm_historical_weather(55.9, -3.2, start, end, refresh_within=60)
+        # Expires within the hour: fetched again now rather than going cold
+        assert warm_historical_weather(55.9, -3.2, start, end, refresh_within=3600)
+        assert len(daily.calls) == 2
+
+
+def test_concurrency_is_bounded_and_failures_counted(monkeypatch):
+    active, peak = 0, 0
+    lock = threading.Lock()
+
+    def fake_warm(lat, lon, start, end, refresh_within=0.0):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.02)
+        with lock:
+            active -= 1
+        if lat < 0:
+            raise TimeoutError("upstream")
+        return True
+
+    monkeypatch.setattr(warmup, "warm_historical_weather", fake_warm)
+    day = dt.datetime(2023, 1, 1)
+    queries = [WarmQuery(float(i) - 1, 0.0, day, day) for i in range(8)]
+    status = Warmer(lambda: queries, concurrency=3, jitter=0.0).run_once()
+    assert peak == 3
+    assert (status.fetched, status.failed, status.total) == (7, 1, 8)